@@ -1,48 +1,202 @@
+import os
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from utils.driver_factory import create_driver
+from utils.driver_pool import DriverPool
+from utils import driver_resolver
+from utils import browser_profiles
+from utils import wait_engine
+from utils import healing_cache
+from utils import command_profiler
+from utils.self_healing_driver import SelfHealingDriver
+from utils.session_cache import SessionCache
+from pages.state import seed_cart
+
+pytest_plugins = ["utils.duration_scheduling", "utils.sleep_guard", "utils.network_policy", "utils.local_app", "utils.perf_trace", "utils.command_budget", "utils.stream_report", "utils.failure_artifacts", "utils.test_impact", "utils.browser_contexts", "utils.scenario"]
 
 def pytest_addoption(parser):
     parser.addoption(
         "--driver-browser", action="store", default="chrome", help="Browser to run tests on: chrome, firefox, edge"
     )
+    parser.addoption(
+        "--driver-profile", action="store", default=browser_profiles.DEFAULT_PROFILE,
+        choices=sorted(browser_profiles.PROFILES),
+        help="Browser launch preset: default (headed, maximized) or fast (headless, no images, eager loads)"
+    )
+    parser.addoption(
+        "--driver-reuse", action="store_true", default=False,
+        help="Reuse warm browsers across tests instead of starting one per test"
+    )
+    parser.addoption(
+        "--driver-pool-size", action="store", type=int, default=1,
+        help="Number of idle browsers kept warm per worker when --driver-reuse is set"
+    )
+    parser.addoption(
+        "--driver-max-uses", action="store", type=int, default=50,
+        help="Number of tests a reused browser serves before it is replaced"
+    )
+    parser.addoption(
+        "--driver-cache-dir", action="store", default=driver_resolver.DEFAULT_CACHE_DIR,
+        help="Directory holding downloaded driver binaries and the resolution manifest"
+    )
+    parser.addoption(
+        "--driver-path", action="store", default=None,
+        help="Pre-provisioned driver binary used when the driver cannot be downloaded"
+    )
+    parser.addoption(
+        "--wait-engine", action="store", default="observer", choices=sorted(wait_engine.ENGINES),
+        help="How page objects wait for elements: observer (in-browser) or polling"
+    )
+    parser.addoption(
+        "--healing-cache", action="store", default=healing_cache.DEFAULT_PATH,
+        help="JSON file remembering healed locators across workers and runs"
+    )
+    parser.addoption(
+        "--heal-mode", action="store", default=SelfHealingDriver.HEAL_MODE, choices=SelfHealingDriver.HEAL_MODES,
+        help="How broken locators are healed: script (one round trip), ranked (scored) or sequential"
+    )
+
+def pytest_configure(config):
+    wait_engine.configure(config.getoption("--wait-engine"))
+    SelfHealingDriver.HEAL_MODE = config.getoption("--heal-mode")
+    healing_cache.configure(os.path.join(str(config.rootpath), config.getoption("--healing-cache")))
+    browser = config.getoption("--driver-browser")
+    offline_path = config.getoption("--driver-path")
+    driver_resolver.configure(
+        cache_dir=config.getoption("--driver-cache-dir"),
+        offline_paths={browser: offline_path} if offline_path else None,
+    )
+    _record_environment(config)
+
+def _record_environment(config):
+    """
+    Record browser and launch profile in the pytest-html metadata and the Allure environment,
+    so timings from different profiles are never compared.
+    """
+    environment = {
+        "Browser": config.getoption("--driver-browser"),
+        "Driver profile": config.getoption("--driver-profile"),
+    }
+    try:
+        from pytest_metadata.plugin import metadata_key
+        config.stash[metadata_key].update(environment)
+    except (ImportError, KeyError):
+        pass
+    alluredir = config.getoption("--alluredir", default=None)
+    if alluredir and not hasattr(config, "workerinput"):
+        os.makedirs(alluredir, exist_ok=True)
+        with open(os.path.join(alluredir, "environment.properties"), "w") as f:
+            for name, value in environment.items():
+                f.write(f"{name.replace(' ', '.')}={value}\n")
+
+def pytest_report_header(config):
+    profile = config.getoption("--driver-profile")
+    return f"driver: {config.getoption('--driver-browser')}, profile: {profile} ({browser_profiles.PROFILES[profile]})"
+
+def pytest_terminal_summary(terminalreporter):
+    timings = driver_resolver.get_resolver().timings
+    if timings:
+        terminalreporter.section("driver resolution")
+        for browser, timing in timings.items():
+            terminalreporter.write_line(f"{browser}: {timing['source']} in {timing['seconds']:.3f}s")
+    stats = healing_cache.get_cache().stats()
+    if stats["hits"] or stats["misses"] or stats["evictions"]:
+        terminalreporter.section("self-healing cache")
+        terminalreporter.write_line(", ".join(f"{name}: {count}" for name, count in stats.items()))
+
+def _driver_factory(config, network=None):
+    """
+    Return a callable starting browsers configured from the command line.
+    network: prepare the browsers for network policies (performance log, Firefox proxy);
+    default: when any test of the run has a policy, for browsers shared between tests.
+    """
+    # Imported lazily: the module is also a plugin (see pytest_plugins) and must be registered first.
+    from utils import network_policy
+    browser = config.getoption("--driver-browser")
+    profile = config.getoption("--driver-profile")
+    if network is None:
+        network = network_policy.is_active(config)
+    # Firefox has no CDP, so network policies are enforced by a local proxy.
+    proxy = network_policy.proxy_address() if network and browser == "firefox" else None
+    return lambda: create_driver(browser, profile, proxy=proxy, performance_log=network)
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    pool = DriverPool(
+        _driver_factory(request.config),
+        size=request.config.getoption("--driver-pool-size"),
+        max_uses=request.config.getoption("--driver-max-uses"),
+    )
+    yield pool
+    pool.close()
 
 @pytest.fixture(scope="function")
 def driver(request):
-    browser = request.config.getoption("--driver-browser")
-    
-    if browser == "chrome":
-        service = ChromeService(ChromeDriverManager().install())
-        options = webdriver.ChromeOptions()
-        # Disable password saving and bubbles
-        prefs = {
-            "credentials_enable_service": False,
-            "profile.password_manager_enabled": False,
-            "profile.default_content_setting_values.notifications": 2
-        }
-        options.add_experimental_option("prefs", prefs)
-        options.add_argument("--disable-save-password-bubble")
-        options.add_argument("--disable-infobars")
-        options.add_argument("--disable-notifications")
-        options.add_argument("--disable-popup-blocking")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        driver = webdriver.Chrome(service=service, options=options)
-    elif browser == "firefox":
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service)
-    elif browser == "edge":
-        service = EdgeService(EdgeChromiumDriverManager().install())
-        driver = webdriver.Edge(service=service)
+    # Imported lazily: the modules are also plugins (see pytest_plugins) and must be registered first.
+    from utils import browser_contexts, network_policy
+    contexts = browser_contexts.is_active(request.config)
+    if contexts:
+        driver = browser_contexts.acquire(request.config)
+    elif request.config.getoption("--driver-reuse"):
+        pool = request.getfixturevalue("driver_pool")
+        driver = pool.acquire()
     else:
-        raise ValueError(f"Unsupported browser: {browser}")
+        driver = _driver_factory(request.config, network_policy.has_policy(request.node))()
+    command_profiler.instrument(driver)
+    policy = network_policy.attach(driver, request.node)
+    yield driver
+    if policy:
+        network_policy.detach(policy, request.node)
+    if contexts:
+        browser_contexts.release(driver, request.node)
+    elif request.config.getoption("--driver-reuse"):
+        pool.release(driver)
+    else:
+        driver.quit()
 
-    driver.maximize_window()
+@pytest.fixture(scope="class")
+def class_driver(request):
+    """
+    One browser shared by all tests of a class, for read-only checks of a single page.
+    Network policies are per test and are not applied to it, nor are browser contexts.
+    """
+    if request.config.getoption("--driver-reuse"):
+        pool = request.getfixturevalue("driver_pool")
+        driver = pool.acquire()
+    else:
+        driver = _driver_factory(request.config, network=False)()
+    command_profiler.instrument(driver)
     yield driver
-    driver.quit()
+    if request.config.getoption("--driver-reuse"):
+        pool.release(driver)
+    else:
+        driver.quit()
+
+@pytest.fixture(scope="session")
+def session_cache():
+    """Per-worker cache of logged-in browser states, keyed by user."""
+    return SessionCache()
+
+@pytest.fixture
+def logged_in_inventory(driver, session_cache):
+    """
+    Return a callable that opens the inventory page already logged in as the given user.
+    Usage: inventory_page = logged_in_inventory("standard_user")
+    """
+    def _open(username="standard_user", password=None):
+        return session_cache.open_inventory(driver, username, password)
+    return _open
+
+@pytest.fixture
+def seeded_cart(driver, session_cache):
+    """
+    Return a callable that opens a page with the cart already filled, without any UI clicks.
+    Usage: cart_page = seeded_cart(["sauce-labs-backpack"], target="checkout-step-one")
+    """
+    def _seed(items, target="cart", username="standard_user"):
+        return seed_cart(driver, items, target, session_cache, username)
+    return _seed
+
+@pytest.fixture(scope="class")
+def class_inventory(class_driver, session_cache):
+    """InventoryPage logged in as standard_user once for the whole class, on the class_driver."""
+    return session_cache.open_inventory(class_driver, "standard_user")
@@ -0,0 +1,429 @@
+/*
+ * Local stand-in for www.saucedemo.com (see utils/local_app.py).
+ *
+ * Every route is served the same shell and rendered here from location.pathname.
+ * Ids, classes and data-test attributes, the "session-username" cookie and the
+ * "cart-contents" localStorage entry match the real site, so the page objects,
+ * the session cache and the self-healing driver work unchanged against it.
+ */
+(function () {
+    'use strict';
+
+    var PASSWORD = 'secret_sauce';
+    var USERS = ['standard_user', 'locked_out_user', 'problem_user', 'performance_glitch_user', 'error_user', 'visual_user'];
+    var LOCKED_OUT = ['locked_out_user'];
+    var SESSION_COOKIE = 'session-username';
+    var SESSION_MINUTES = 10;
+    var CART_KEY = 'cart-contents';
+    var TAX_RATE = 0.08;
+
+    var PRODUCTS = [
+        {id: 4, name: 'Sauce Labs Backpack', price: 29.99,
+         desc: 'carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection.'},
+        {id: 0, name: 'Sauce Labs Bike Light', price: 9.99,
+         desc: "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included."},
+        {id: 1, name: 'Sauce Labs Bolt T-Shirt', price: 15.99,
+         desc: 'Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt.'},
+        {id: 5, name: 'Sauce Labs Fleece Jacket', price: 49.99,
+         desc: "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office."},
+        {id: 2, name: 'Sauce Labs Onesie', price: 7.99,
+         desc: "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."},
+        {id: 3, name: 'Test.allTheThings() T-Shirt (Red)', price: 15.99,
+         desc: 'This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton.'}
+    ];
+
+    var SORTS = {
+        az: ['Name (A to Z)', function (a, b) { return a.name < b.name ? -1 : 1; }],
+        za: ['Name (Z to A)', function (a, b) { return a.name < b.name ? 1 : -1; }],
+        lohi: ['Price (low to high)', function (a, b) { return a.price - b.price || (a.name < b.name ? -1 : 1); }],
+        hilo: ['Price (high to low)', function (a, b) { return b.price - a.price || (a.name < b.name ? -1 : 1); }]
+    };
+
+    var root = document.getElementById('root');
+
+    // --- state -------------------------------------------------------------------------
+
+    function readCookie(name) {
+        var match = document.cookie.match(new RegExp('(?:^|; )' + name + '=([^;]*)'));
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function currentUser() {
+        return readCookie(SESSION_COOKIE);
+    }
+
+    function startSession(username) {
+        var expires = new Date(Date.now() + SESSION_MINUTES * 60 * 1000).toUTCString();
+        document.cookie = SESSION_COOKIE + '=' + encodeURIComponent(username) + '; path=/; expires=' + expires;
+    }
+
+    function endSession() {
+        document.cookie = SESSION_COOKIE + '=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT';
+    }
+
+    function readCart() {
+        try {
+            return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function writeCart(ids) {
+        if (ids.length) {
+            window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            window.localStorage.removeItem(CART_KEY);
+        }
+        renderBadge();
+    }
+
+    function inCart(id) {
+        return readCart().indexOf(id) !== -1;
+    }
+
+    function addToCart(id) {
+        var ids = readCart();
+        if (ids.indexOf(id) === -1) { ids.push(id); }
+        writeCart(ids);
+    }
+
+    function removeFromCart(id) {
+        writeCart(readCart().filter(function (other) { return other !== id; }));
+    }
+
+    function product(id) {
+        return PRODUCTS.filter(function (p) { return p.id === id; })[0];
+    }
+
+    function cartProducts() {
+        return readCart().map(product).filter(Boolean);
+    }
+
+    // --- helpers -----------------------------------------------------------------------
+
+    function slug(name) {
+        return name.toLowerCase().replace(/ /g, '-');
+    }
+
+    function money(value) {
+        return '$' + value.toFixed(2);
+    }
+
+    function go(path) {
+        window.location.href = path;
+    }
+
+    function el(selector) {
+        return root.querySelector(selector);
+    }
+
+    function on(selector, event, handler) {
+        var node = el(selector);
+        if (node) { node.addEventListener(event, handler); }
+    }
+
+    function showError(container, message, inputs) {
+        container.innerHTML = '<h3 data-test="error">' + message +
+            '<button class="error-button" data-test="error-button" type="button">&times;</button></h3>';
+        inputs.forEach(function (input) { input.classList.add('error'); });
+        container.querySelector('.error-button').addEventListener('click', function () {
+            container.innerHTML = '';
+            inputs.forEach(function (input) { input.classList.remove('error'); });
+        });
+    }
+
+    // --- layout ------------------------------------------------------------------------
+
+    function layout(title, secondary, contents) {
+        root.innerHTML =
+            '<div id="page_wrapper" class="page_wrapper">' +
+            '<div id="header_container" class="header_container">' +
+            '<div class="primary_header" data-test="primary-header">' +
+            '<div class="bm-burger-button"><button id="react-burger-menu-btn" type="button">Open Menu</button></div>' +
+            '<div class="bm-menu-wrap" aria-hidden="true" hidden>' +
+            '<nav class="bm-item-list">' +
+            '<a id="inventory_sidebar_link" class="bm-item menu-item" href="/inventory.html" data-test="inventory-sidebar-link">All Items</a>' +
+            '<a id="about_sidebar_link" class="bm-item menu-item" href="https://saucelabs.com/" data-test="about-sidebar-link">About</a>' +
+            '<a id="logout_sidebar_link" class="bm-item menu-item" href="#" data-test="logout-sidebar-link">Logout</a>' +
+            '<a id="reset_sidebar_link" class="bm-item menu-item" href="#" data-test="reset-sidebar-link">Reset App State</a>' +
+            '</nav>' +
+            '<div class="bm-cross-button"><button id="react-burger-cross-btn" type="button">Close Menu</button></div>' +
+            '</div>' +
+            '<div class="header_label"><div class="app_logo">Swag Labs</div></div>' +
+            '<div id="shopping_cart_container" class="shopping_cart_container">' +
+            '<a class="shopping_cart_link" data-test="shopping-cart-link" href="/cart.html"></a></div>' +
+            '</div>' +
+            '<div class="header_secondary_container" data-test="secondary-header">' +
+            '<span class="title" data-test="title">' + title + '</span>' + (secondary || '') + '</div>' +
+            '</div>' +
+            '<div id="contents_wrapper">' + contents + '</div>' +
+            '<footer class="footer" data-test="footer">&copy; Sauce Labs replica for local test runs</footer>' +
+            '</div>';
+        renderBadge();
+
+        var menu = el('.bm-menu-wrap');
+        function setMenu(open) {
+            menu.hidden = !open;
+            menu.setAttribute('aria-hidden', open ? 'false' : 'true');
+        }
+        on('#react-burger-menu-btn', 'click', function () { setMenu(true); });
+        on('#react-burger-cross-btn', 'click', function () { setMenu(false); });
+        on('#logout_sidebar_link', 'click', function (event) {
+            event.preventDefault();
+            endSession();
+            go('/');
+        });
+        on('#reset_sidebar_link', 'click', function (event) {
+            event.preventDefault();
+            writeCart([]);
+            root.querySelectorAll('[data-product-id]').forEach(renderCartButton);
+        });
+    }
+
+    function renderBadge() {
+        var link = el('.shopping_cart_link');
+        if (!link) { return; }
+        var count = readCart().length;
+        link.innerHTML = count ? '<span class="shopping_cart_badge" data-test="shopping-cart-badge">' + count + '</span>' : '';
+    }
+
+    // A button whose data-product-id names a product toggles it in the cart.
+    // detail: the item page uses plain "add-to-cart" / "remove" ids.
+    function renderCartButton(button) {
+        var id = Number(button.getAttribute('data-product-id'));
+        var detail = button.hasAttribute('data-detail');
+        var action = inCart(id) ? 'remove' : 'add-to-cart';
+        var name = detail ? action : action + '-' + slug(product(id).name);
+        button.id = name;
+        button.name = name;
+        button.setAttribute('data-test', name);
+        button.className = 'btn btn_small btn_inventory ' + (action === 'remove' ? 'btn_secondary' : 'btn_primary');
+        button.textContent = action === 'remove' ? 'Remove' : 'Add to cart';
+    }
+
+    function bindCartButtons() {
+        root.querySelectorAll('[data-product-id]').forEach(function (button) {
+            renderCartButton(button);
+            button.addEventListener('click', function () {
+                var id = Number(button.getAttribute('data-product-id'));
+                if (inCart(id)) { removeFromCart(id); } else { addToCart(id); }
+                renderCartButton(button);
+            });
+        });
+    }
+
+    function cartItem(p, removable) {
+        return '<div class="cart_item" data-test="inventory-item">' +
+            '<div class="cart_quantity" data-test="item-quantity">1</div>' +
+            '<div class="cart_item_label">' +
+            '<a href="/inventory-item.html?id=' + p.id + '" id="item_' + p.id + '_title_link" data-test="item-' + p.id + '-title-link">' +
+            '<div class="inventory_item_name" data-test="inventory-item-name">' + p.name + '</div></a>' +
+            '<div class="inventory_item_desc" data-test="inventory-item-desc">' + p.desc + '</div>' +
+            '<div class="item_pricebar"><div class="inventory_item_price" data-test="inventory-item-price">' + money(p.price) + '</div>' +
+            (removable ? '<button type="button" class="btn btn_secondary btn_small cart_button" data-test="remove-' + slug(p.name) +
+                '" id="remove-' + slug(p.name) + '" name="remove-' + slug(p.name) + '" data-remove-id="' + p.id + '">Remove</button>' : '') +
+            '</div></div></div>';
+    }
+
+    // --- pages -------------------------------------------------------------------------
+
+    function loginPage(message) {
+        root.innerHTML =
+            '<div class="login_container">' +
+            '<div class="login_logo">Swag Labs</div>' +
+            '<div class="login_wrapper"><form id="login-form" novalidate>' +
+            '<div class="form_group"><input class="input_error form_input" placeholder="Username" type="text" data-test="username"' +
+            ' id="user-name" name="user-name" autocorrect="off" autocapitalize="none"></div>' +
+            '<div class="form_group"><input class="input_error form_input" placeholder="Password" type="password" data-test="password"' +
+            ' id="password" name="password" autocorrect="off" autocapitalize="none"></div>' +
+            '<div class="error-message-container"></div>' +
+            '<input type="submit" class="submit-button" data-test="login-button" id="login-button" name="login-button" value="Login">' +
+            '</form></div></div>';
+        var username = el('#user-name'), password = el('#password'), errors = el('.error-message-container');
+        if (message) { showError(errors, message, [username, password]); }
+        on('#login-form', 'submit', function (event) {
+            event.preventDefault();
+            var user = username.value, secret = password.value;
+            if (!user) { return showError(errors, 'Epic sadface: Username is required', [username, password]); }
+            if (!secret) { return showError(errors, 'Epic sadface: Password is required', [username, password]); }
+            if (USERS.indexOf(user) === -1 || secret !== PASSWORD) {
+                return showError(errors, 'Epic sadface: Username and password do not match any user in this service', [username, password]);
+            }
+            if (LOCKED_OUT.indexOf(user) !== -1) {
+                return showError(errors, 'Epic sadface: Sorry, this user has been locked out.', [username, password]);
+            }
+            startSession(user);
+            go('/inventory.html');
+        });
+    }
+
+    function inventoryPage() {
+        var options = Object.keys(SORTS).map(function (key) {
+            return '<option value="' + key + '">' + SORTS[key][0] + '</option>';
+        }).join('');
+        layout('Products',
+            '<div class="right_component"><span class="select_container">' +
+            '<span class="active_option" data-test="active-option">' + SORTS.az[0] + '</span>' +
+            '<select class="product_sort_container" data-test="product-sort-container">' + options + '</select></span></div>',
+            '<div id="inventory_container" class="inventory_container">' +
+            '<div class="inventory_list" data-test="inventory-list"></div></div>');
+
+        function renderList(sort) {
+            el('.inventory_list').innerHTML = PRODUCTS.slice().sort(SORTS[sort][1]).map(function (p) {
+                var link = '/inventory-item.html?id=' + p.id;
+                return '<div class="inventory_item" data-test="inventory-item">' +
+                    '<div class="inventory_item_img"><a href="' + link + '" id="item_' + p.id + '_img_link" data-test="item-' + p.id + '-img-link">' +
+                    '<img alt="' + p.name + '" class="inventory_item_img" src="/static/media/item.svg" data-test="inventory-item-' + slug(p.name) + '-img"></a></div>' +
+                    '<div class="inventory_item_description" data-test="inventory-item-description">' +
+                    '<div class="inventory_item_label"><a href="' + link + '" id="item_' + p.id + '_title_link" data-test="item-' + p.id + '-title-link">' +
+                    '<div class="inventory_item_name" data-test="inventory-item-name">' + p.name + '</div></a>' +
+                    '<div class="inventory_item_desc" data-test="inventory-item-desc">' + p.desc + '</div></div>' +
+                    '<div class="pricebar"><div class="inventory_item_price" data-test="inventory-item-price">' + money(p.price) + '</div>' +
+                    '<button type="button" data-product-id="' + p.id + '"></button></div>' +
+                    '</div></div>';
+            }).join('');
+            el('.active_option').textContent = SORTS[sort][0];
+            bindCartButtons();
+        }
+
+        on('.product_sort_container', 'change', function (event) { renderList(event.target.value); });
+        renderList('az');
+    }
+
+    function itemPage() {
+        var id = Number(new URLSearchParams(window.location.search).get('id'));
+        var p = product(id);
+        var back = '<button type="button" class="btn inventory_details_back_button" id="back-to-products" data-test="back-to-products">Back to products</button>';
+        if (!p) {
+            layout('', back, '<div class="inventory_details"><div class="inventory_details_name large_size" data-test="inventory-item-name">ITEM NOT FOUND</div></div>');
+        } else {
+            layout('', back,
+                '<div class="inventory_details" data-test="inventory-container"><div class="inventory_details_container">' +
+                '<img alt="' + p.name + '" class="inventory_details_img" src="/static/media/item.svg" data-test="item-' + slug(p.name) + '-img">' +
+                '<div class="inventory_details_desc_container">' +
+                '<div class="inventory_details_name large_size" data-test="inventory-item-name">' + p.name + '</div>' +
+                '<div class="inventory_details_desc large_size" data-test="inventory-item-desc">' + p.desc + '</div>' +
+                '<div class="inventory_details_price" data-test="inventory-item-price">' + money(p.price) + '</div>' +
+                '<button type="button" data-product-id="' + p.id + '" data-detail></button>' +
+                '</div></div></div>');
+            bindCartButtons();
+        }
+        on('#back-to-products', 'click', function () { go('/inventory.html'); });
+    }
+
+    function cartPage() {
+        layout('Your Cart', '',
+            '<div id="cart_contents_container" class="cart_contents_container">' +
+            '<div class="cart_list" data-test="cart-list">' +
+            '<div class="cart_quantity_label" data-test="cart-quantity-label">QTY</div>' +
+            '<div class="cart_desc_label" data-test="cart-desc-label">Description</div>' +
+            cartProducts().map(function (p) { return cartItem(p, true); }).join('') +
+            '</div>' +
+            '<div class="cart_footer">' +
+            '<button type="button" class="btn btn_secondary back btn_medium" id="continue-shopping" data-test="continue-shopping" name="continue-shopping">Continue Shopping</button>' +
+            '<button type="button" class="btn btn_action btn_medium checkout_button" id="checkout" data-test="checkout" name="checkout">Checkout</button>' +
+            '</div></div>');
+        root.querySelectorAll('[data-remove-id]').forEach(function (button) {
+            button.addEventListener('click', function () {
+                removeFromCart(Number(button.getAttribute('data-remove-id')));
+                var item = button.closest('.cart_item');
+                item.parentNode.removeChild(item);
+            });
+        });
+        on('#continue-shopping', 'click', function () { go('/inventory.html'); });
+        on('#checkout', 'click', function () { go('/checkout-step-one.html'); });
+    }
+
+    function checkoutInformationPage() {
+        function field(id, test, placeholder) {
+            return '<div class="form_group"><input class="input_error form_input" placeholder="' + placeholder + '" type="text"' +
+                ' data-test="' + test + '" id="' + id + '" name="' + test + '" autocorrect="off" autocapitalize="none"></div>';
+        }
+        layout('Checkout: Your Information', '',
+            '<div id="checkout_info_container" class="checkout_info_container"><form id="checkout-form" novalidate>' +
+            '<div class="checkout_info">' +
+            field('first-name', 'firstName', 'First Name') +
+            field('last-name', 'lastName', 'Last Name') +
+            field('postal-code', 'postalCode', 'Zip/Postal Code') +
+            '<div class="error-message-container"></div></div>' +
+            '<div class="checkout_buttons">' +
+            '<button type="button" class="btn btn_secondary back btn_medium cart_cancel_link" id="cancel" data-test="cancel" name="cancel">Cancel</button>' +
+            '<input type="submit" class="submit-button btn btn_primary cart_button btn_action" data-test="continue" id="continue" name="continue" value="Continue">' +
+            '</div></form></div>');
+        var inputs = [el('#first-name'), el('#last-name'), el('#postal-code')];
+        var labels = ['First Name', 'Last Name', 'Postal Code'];
+        on('#checkout-form', 'submit', function (event) {
+            event.preventDefault();
+            for (var i = 0; i < inputs.length; i++) {
+                if (!inputs[i].value) {
+                    return showError(el('.error-message-container'), 'Error: ' + labels[i] + ' is required', inputs);
+                }
+            }
+            go('/checkout-step-two.html');
+        });
+        on('#cancel', 'click', function () { go('/cart.html'); });
+    }
+
+    function checkoutOverviewPage() {
+        var items = cartProducts();
+        var subtotal = items.reduce(function (sum, p) { return sum + p.price; }, 0);
+        var tax = Math.round(subtotal * TAX_RATE * 100) / 100;
+        layout('Checkout: Overview', '',
+            '<div id="checkout_summary_container" class="checkout_summary_container">' +
+            '<div class="cart_list" data-test="cart-list">' +
+            '<div class="cart_quantity_label" data-test="cart-quantity-label">QTY</div>' +
+            '<div class="cart_desc_label" data-test="cart-desc-label">Description</div>' +
+            items.map(function (p) { return cartItem(p, false); }).join('') +
+            '</div>' +
+            '<div class="summary_info" data-test="summary-info">' +
+            '<div class="summary_info_label" data-test="payment-info-label">Payment Information:</div>' +
+            '<div class="summary_value_label" data-test="payment-info-value">SauceCard #31337</div>' +
+            '<div class="summary_info_label" data-test="shipping-info-label">Shipping Information:</div>' +
+            '<div class="summary_value_label" data-test="shipping-info-value">Free Pony Express Delivery!</div>' +
+            '<div class="summary_info_label" data-test="total-info-label">Price Total</div>' +
+            '<div class="summary_subtotal_label" data-test="subtotal-label">Item total: ' + money(subtotal) + '</div>' +
+            '<div class="summary_tax_label" data-test="tax-label">Tax: ' + money(tax) + '</div>' +
+            '<div class="summary_total_label" data-test="total-label">Total: ' + money(subtotal + tax) + '</div>' +
+            '<div class="cart_footer">' +
+            '<button type="button" class="btn btn_secondary back btn_medium cart_cancel_link" id="cancel" data-test="cancel" name="cancel">Cancel</button>' +
+            '<button type="button" class="btn btn_action btn_medium cart_button" id="finish" data-test="finish" name="finish">Finish</button>' +
+            '</div></div></div>');
+        on('#cancel', 'click', function () { go('/inventory.html'); });
+        on('#finish', 'click', function () {
+            writeCart([]);
+            go('/checkout-complete.html');
+        });
+    }
+
+    function checkoutCompletePage() {
+        layout('Checkout: Complete!', '',
+            '<div id="checkout_complete_container" class="checkout_complete_container">' +
+            '<h2 class="complete-header" data-test="complete-header">Thank you for your order!</h2>' +
+            '<div class="complete-text" data-test="complete-text">Your order has been dispatched, and will arrive just as fast as the pony can get there!</div>' +
+            '<button type="button" class="btn btn_primary btn_small" id="back-to-products" data-test="back-to-products" name="back-to-products">Back Home</button>' +
+            '</div>');
+        on('#back-to-products', 'click', function () { go('/inventory.html'); });
+    }
+
+    var PAGES = {
+        '/inventory.html': inventoryPage,
+        '/inventory-item.html': itemPage,
+        '/cart.html': cartPage,
+        '/checkout-step-one.html': checkoutInformationPage,
+        '/checkout-step-two.html': checkoutOverviewPage,
+        '/checkout-complete.html': checkoutCompletePage
+    };
+
+    var path = window.location.pathname;
+    var page = PAGES[path];
+    if (!page) {
+        loginPage();
+    } else if (!currentUser()) {
+        // Like the real site: protected pages send anonymous visitors back to the login form.
+        window.history.replaceState(null, '', '/');
+        loginPage("Epic sadface: You can only access '" + path + "' when you are logged in.");
+    } else {
+        page();
+    }
+})();
@@ -0,0 +1,120 @@
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from utils.async_webdriver import AsyncWebDriver
+from utils.wait_engine import ObserverWaitEngine
+from pages.base_page import BasePage as SyncBasePage
+
+class BasePage:
+    """
+    Async counterpart of pages.base_page.BasePage for AsyncWebDriver sessions.
+    Every wait is a single in-browser script (the observer wait engine's), so a waiting
+    page costs no polling traffic while other sessions on the event loop keep running.
+    Locators are the ones of the synchronous page objects.
+    """
+
+    TIMEOUT = SyncBasePage.TIMEOUT
+    ELEMENT_SCRIPT = ObserverWaitEngine.ELEMENT_SCRIPT
+    READ_ALL_SCRIPT = SyncBasePage.READ_ALL_SCRIPT
+    FILL_FORM_SCRIPT = SyncBasePage.FILL_FORM_SCRIPT
+    FORM_MODES = SyncBasePage.FORM_MODES
+    FORM_MODE = SyncBasePage.FORM_MODE
+    # Keep each async script well below the driver's default 30 s script timeout.
+    MAX_SCRIPT_WAIT = ObserverWaitEngine.MAX_SCRIPT_WAIT
+
+    def __init__(self, driver: AsyncWebDriver):
+        """Initialize the page with an AsyncWebDriver session."""
+        self.driver = driver
+
+    async def navigate(self, url: str):
+        """Navigate to the specified URL."""
+        await self.driver.get(url)
+
+    async def get_title(self) -> str:
+        """Return the current page title."""
+        return await self.driver.title()
+
+    async def get_url(self) -> str:
+        """Return the current page URL."""
+        return await self.driver.current_url()
+
+    async def find_element(self, locator: tuple):
+        """Find a single element."""
+        return await self.driver.find_element(*locator)
+
+    async def _wait(self, locator: tuple, condition: str, timeout: float = None):
+        """Wait in the browser until the first match is visible, clickable or gone; return it."""
+        deadline = time.monotonic() + (self.TIMEOUT if timeout is None else timeout)
+        by, value = locator
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(f"Element not {condition}: {locator}")
+            chunk_ms = int(min(remaining, self.MAX_SCRIPT_WAIT) * 1000)
+            try:
+                result = await self.driver.execute_async_script(self.ELEMENT_SCRIPT, by, value, condition, chunk_ms)
+            except JavascriptException as e:
+                if "unload" not in str(e).lower():
+                    raise
+                # The page navigated away mid-wait; wait again on the new document.
+                continue
+            except TimeoutException:
+                continue
+            if result:
+                return result
+
+    async def wait_for_element(self, locator: tuple, timeout: float = None):
+        """Wait for an element to be visible and return it."""
+        return await self._wait(locator, "visible", timeout)
+
+    async def wait_for_invisibility(self, locator: tuple, timeout: float = None):
+        """Wait until an element is hidden or removed from the page."""
+        await self._wait(locator, "invisible", timeout)
+
+    async def click(self, locator: tuple):
+        """Wait for an element to be clickable and click it."""
+        element = await self._wait(locator, "clickable")
+        await element.click()
+
+    async def enter_text(self, locator: tuple, text: str):
+        """Wait for an element to be visible, clear it, and enter text."""
+        element = await self.wait_for_element(locator)
+        await element.clear()
+        await element.send_keys(text)
+
+    async def fill_form(self, fields: dict, mode: str = None):
+        """
+        Enter a value into every field of a form (see BasePage.fill_form).
+        The faithful mode types into the fields one element command at a time.
+        """
+        mode = mode or self.FORM_MODE
+        if mode not in self.FORM_MODES:
+            raise ValueError(f"Unknown form mode: {mode}")
+        locators = list(fields)
+        rows = [[by, value, str(fields[(by, value)])] for by, value in locators]
+        for _ in range(len(locators) + 1):
+            result = await self.driver.execute_script(self.FILL_FORM_SCRIPT, rows, mode == "faithful")
+            if not isinstance(result, int):
+                break
+            await self.wait_for_element(locators[result])
+        else:
+            raise TimeoutException(f"Form fields did not stay visible: {locators}")
+        if mode == "faithful":
+            for element, (_, _, text) in zip(result, rows):
+                await element.send_keys(text)
+
+    async def get_text(self, locator: tuple) -> str:
+        """Wait for an element to be visible and return its text."""
+        element = await self.wait_for_element(locator)
+        return await element.text()
+
+    async def read_all(self, locator: tuple, props=("text",), wait: bool = True) -> list:
+        """Read properties of every element matching the locator in a single round trip (see BasePage.read_all)."""
+        if wait:
+            await self.wait_for_element(locator)
+        by, value = locator
+        return await self.driver.execute_script(self.READ_ALL_SCRIPT, by, value, list(props))
+
+    async def read_texts(self, locator: tuple, wait: bool = True) -> list:
+        """Return the visible text of every element matching the locator in a single round trip."""
+        return [row["text"] for row in await self.read_all(locator, ("text",), wait)]
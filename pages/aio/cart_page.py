@@ -0,0 +1,66 @@
+from selenium.webdriver.common.by import By
+from pages.cart_page import CartPage as SyncCartPage
+from .base_page import BasePage
+
+class CartPage(BasePage):
+    """
+    Async counterpart of pages.cart_page.CartPage.
+    """
+
+    # Locators
+    CHECKOUT_BUTTON = SyncCartPage.CHECKOUT_BUTTON
+    FIRST_NAME_INPUT = SyncCartPage.FIRST_NAME_INPUT
+    LAST_NAME_INPUT = SyncCartPage.LAST_NAME_INPUT
+    POSTAL_CODE_INPUT = SyncCartPage.POSTAL_CODE_INPUT
+    CONTINUE_BUTTON = SyncCartPage.CONTINUE_BUTTON
+    FINISH_BUTTON = SyncCartPage.FINISH_BUTTON
+    CONTINUE_SHOPPING_BUTTON = SyncCartPage.CONTINUE_SHOPPING_BUTTON
+    COMPLETE_HEADER = SyncCartPage.COMPLETE_HEADER
+    ERROR_MESSAGE = SyncCartPage.ERROR_MESSAGE
+    ITEM_NAME = SyncCartPage.ITEM_NAME
+    ITEM_PRICE = SyncCartPage.ITEM_PRICE
+
+    async def get_item_name(self):
+        """Return the name of the first item in the cart."""
+        return await self.get_text(self.ITEM_NAME)
+
+    async def get_item_price(self):
+        """Return the price of the first item in the cart."""
+        return await self.get_text(self.ITEM_PRICE)
+
+    async def checkout(self, first_name, last_name, zip_code, mode=None):
+        """
+        Perform the checkout flow:
+        1. Click Checkout
+        2. Fill user details (mode: see BasePage.fill_form)
+        3. Click Continue
+        """
+        await self.click(self.CHECKOUT_BUTTON)
+        await self.fill_form({
+            self.FIRST_NAME_INPUT: first_name,
+            self.LAST_NAME_INPUT: last_name,
+            self.POSTAL_CODE_INPUT: zip_code,
+        }, mode)
+        await self.click(self.CONTINUE_BUTTON)
+        # The Finish button only exists on checkout-step-two.html.
+        await self.wait_for_element(self.FINISH_BUTTON)
+
+    async def finish_checkout(self):
+        """Complete the order by clicking the Finish button."""
+        await self.click(self.FINISH_BUTTON)
+
+    async def get_complete_header(self):
+        """Return the success message header after checkout."""
+        return await self.get_text(self.COMPLETE_HEADER)
+
+    async def remove_item(self, item_name_kebab_case):
+        """Remove a specific item from the cart."""
+        await self.click((By.CSS_SELECTOR, f"[data-test='remove-{item_name_kebab_case}']"))
+
+    async def continue_shopping(self):
+        """Navigate back to the inventory to continue shopping."""
+        await self.click(self.CONTINUE_SHOPPING_BUTTON)
+
+    async def get_checkout_error(self):
+        """Return the error message displayed on the checkout page."""
+        return await self.get_text(self.ERROR_MESSAGE)
@@ -0,0 +1,69 @@
+from selenium.webdriver.common.by import By
+from pages.inventory_page import InventoryPage as SyncInventoryPage
+from .base_page import BasePage
+
+class InventoryPage(BasePage):
+    """
+    Async counterpart of pages.inventory_page.InventoryPage.
+    """
+
+    # Locators
+    INVENTORY_LIST = SyncInventoryPage.INVENTORY_LIST
+    ITEM_NAME = SyncInventoryPage.ITEM_NAME
+    ITEM_PRICE = SyncInventoryPage.ITEM_PRICE
+    CART_BADGE = SyncInventoryPage.CART_BADGE
+    CART_LINK = SyncInventoryPage.CART_LINK
+    SORT_CONTAINER = SyncInventoryPage.SORT_CONTAINER
+    MENU_BUTTON = SyncInventoryPage.MENU_BUTTON
+    LOGOUT_LINK = SyncInventoryPage.LOGOUT_LINK
+    RESET_LINK = SyncInventoryPage.RESET_LINK
+    CLOSE_MENU_BUTTON = SyncInventoryPage.CLOSE_MENU_BUTTON
+
+    async def add_item_to_cart(self, item_name_kebab_case):
+        """
+        Add a specific item to the cart using its kebab-case name.
+        Example: 'sauce-labs-backpack'
+        """
+        await self.click((By.CSS_SELECTOR, f"[data-test='add-to-cart-{item_name_kebab_case}']"))
+
+    async def get_item_names(self):
+        """Return the names of all listed items, in display order."""
+        return await self.read_texts(self.ITEM_NAME)
+
+    async def get_item_prices(self):
+        """Return the prices of all listed items as floats, in display order."""
+        return [float(price.replace("$", "")) for price in await self.read_texts(self.ITEM_PRICE)]
+
+    async def get_cart_count(self):
+        """Return the number of items currently in the cart."""
+        return int(await self.get_text(self.CART_BADGE))
+
+    async def go_to_cart(self):
+        """Navigate to the Cart page."""
+        await self.click(self.CART_LINK)
+
+    async def sort_by(self, option_value):
+        """
+        Sort the inventory items by the given option value.
+        Options: 'az', 'za', 'lohi', 'hilo'
+        """
+        by, value = self.SORT_CONTAINER
+        await self.click((by, f"{value} option[value='{option_value}']"))
+
+    async def open_menu(self):
+        """Open the side menu and wait until it is interactive."""
+        await self.click(self.MENU_BUTTON)
+        await self._wait(self.LOGOUT_LINK, "clickable")
+
+    async def logout(self):
+        """Perform the logout action via the side menu."""
+        await self.open_menu()
+        await self.click(self.LOGOUT_LINK)
+
+    async def reset_app_state(self):
+        """Reset the application state (e.g., clear cart) via the side menu."""
+        await self.open_menu()
+        await self.click(self.RESET_LINK)
+        # Resetting empties the cart, which removes the cart badge
+        await self.wait_for_invisibility(self.CART_BADGE)
+        await self.click(self.CLOSE_MENU_BUTTON)
@@ -0,0 +1,26 @@
+from pages.login_page import LoginPage as SyncLoginPage
+from .base_page import BasePage
+
+class LoginPage(BasePage):
+    """
+    Async counterpart of pages.login_page.LoginPage.
+    """
+
+    # Locators
+    USERNAME_INPUT = SyncLoginPage.USERNAME_INPUT
+    PASSWORD_INPUT = SyncLoginPage.PASSWORD_INPUT
+    LOGIN_BUTTON = SyncLoginPage.LOGIN_BUTTON
+    ERROR_MESSAGE = SyncLoginPage.ERROR_MESSAGE
+
+    async def load(self):
+        """Navigate to the Login Page (SyncLoginPage.URL, which follows --base-url)."""
+        await self.navigate(SyncLoginPage.URL)
+
+    async def login(self, username, password, mode=None):
+        """Perform the login action with the given credentials (mode: see BasePage.fill_form)."""
+        await self.fill_form({self.USERNAME_INPUT: username, self.PASSWORD_INPUT: password}, mode)
+        await self.click(self.LOGIN_BUTTON)
+
+    async def get_error_text(self):
+        """Retrieve the text of the error message displayed on failure."""
+        return await self.get_text(self.ERROR_MESSAGE)
@@ -0,0 +1,26 @@
+import inspect
+
+from utils.async_webdriver import AsyncWebDriver, run_sync
+
+class SyncPage:
+    """
+    Synchronous view of an async page object, for tests written against the sync API:
+        login_page = SyncPage.of(LoginPage, driver)   # driver: a selenium WebDriver
+        login_page.login("standard_user", "secret_sauce")
+    Coroutine methods run to completion on the shared background event loop; locators and
+    other attributes are passed through.
+    """
+
+    def __init__(self, page):
+        self.page = page
+
+    @classmethod
+    def of(cls, page_class, driver):
+        """Wrap a page_class page driving the session of a synchronous selenium WebDriver."""
+        return cls(page_class(AsyncWebDriver.attach(driver)))
+
+    def __getattr__(self, name):
+        attribute = getattr(self.page, name)
+        if inspect.iscoroutinefunction(attribute):
+            return lambda *args, **kwargs: run_sync(attribute(*args, **kwargs))
+        return attribute
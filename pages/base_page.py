@@ -1,21 +1,68 @@
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.action_chains import ActionChains
+from utils.wait_engine import create_engine
+from utils import js_locators
+from utils.instrumentation import span
 
 class BasePage:
     """
     BasePage serves as the parent class for all page objects.
     It provides common methods and initializes the Selenium WebDriver.
+    Waits go through a pluggable wait engine (see utils/wait_engine.py).
     """
 
+    TIMEOUT = 15
+
+    # How fill_form enters values unless a call says otherwise; page objects may override it.
+    # fast: one script sets every value; faithful: real keystrokes, sent as one action sequence.
+    FORM_MODES = ("fast", "faithful")
+    FORM_MODE = "fast"
+
+    READ_ALL_SCRIPT = js_locators.script("""
+        var by = arguments[0], value = arguments[1], props = arguments[2];
+        return __findAll(by, value).map(function (el) {
+            var row = {};
+            props.forEach(function (prop) {
+                if (prop === 'text') { row[prop] = __isVisible(el) ? (el.innerText || '').trim() : ''; }
+                else if (prop === 'visible') { row[prop] = __isVisible(el); }
+                else if (prop === 'enabled') { row[prop] = !el.disabled; }
+                else if (prop === 'tag') { row[prop] = el.tagName.toLowerCase(); }
+                else if (prop === 'value') { row[prop] = el.value; }
+                else { row[prop] = el.getAttribute(prop); }
+            });
+            return row;
+        });
+    """)
+
+    FILL_FORM_SCRIPT = js_locators.script("""
+        var fields = arguments[0], typed = arguments[1];
+        var elements = [];
+        for (var i = 0; i < fields.length; i++) {
+            var el = __findAll(fields[i][0], fields[i][1])[0];
+            if (!__isVisible(el)) { return i; }
+            elements.push(el);
+        }
+        elements.forEach(function (el, i) {
+            // React tracks the value it last rendered and ignores input events when el.value matches it;
+            // the prototype's setter updates the DOM without updating that tracker.
+            var property = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+            var value = typed ? '' : fields[i][2];
+            if (property && property.set) { property.set.call(el, value); } else { el.value = value; }
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        });
+        return typed ? elements : null;
+    """)
+
     def __init__(self, driver: WebDriver):
         """Initialize the BasePage with a Selenium WebDriver instance."""
         # Wrap the driver with SelfHealingDriver
         from utils.self_healing_driver import SelfHealingDriver
         self.driver = SelfHealingDriver(driver)
-        self.wait = WebDriverWait(driver, 15)
+        self.wait_engine = create_engine(driver, self.TIMEOUT)
 
+    @span
     def navigate(self, url: str):
         """Navigate to the specified URL."""
         self.driver.get(url)
@@ -32,22 +79,84 @@ class BasePage:
         """Find a single element."""
         return self.driver.find_element(*locator)
 
+    @span(wait=True)
     def wait_for_element(self, locator: tuple):
         """Wait for an element to be visible and return it."""
-        return self.wait.until(EC.visibility_of_element_located(locator))
+        return self.wait_engine.until_visible(locator)
 
+    @span
     def click(self, locator: tuple):
         """Wait for an element to be clickable and click it."""
-        element = self.wait.until(EC.element_to_be_clickable(locator))
+        element = self.wait_engine.until_clickable(locator)
         element.click()
 
+    @span
     def enter_text(self, locator: tuple, text: str):
         """Wait for an element to be visible, clear it, and enter text."""
         element = self.wait_for_element(locator)
         element.clear()
         element.send_keys(text)
 
+    @span
+    def fill_form(self, fields: dict, mode: str = None):
+        """
+        Enter a value into every field of a form, e.g. fill_form({USERNAME_INPUT: "standard_user", ...}).
+        mode "fast" sets all values and fires the input and change events in one script call.
+        mode "faithful" clears the fields in that call, then types each value with real keystrokes
+        sent as one action sequence. Defaults to the page's FORM_MODE.
+        Waits only for fields that are not visible yet.
+        """
+        mode = mode or self.FORM_MODE
+        if mode not in self.FORM_MODES:
+            raise ValueError(f"Unknown form mode: {mode}")
+        locators = list(fields)
+        rows = [[by, value, str(fields[(by, value)])] for by, value in locators]
+        for _ in range(len(locators) + 1):
+            result = self.driver.execute_script(self.FILL_FORM_SCRIPT, rows, mode == "faithful")
+            if not isinstance(result, int):
+                break
+            self.wait_for_element(locators[result])
+        else:
+            raise TimeoutException(f"Form fields did not stay visible: {locators}")
+        if mode == "faithful":
+            actions = ActionChains(self.driver.driver, duration=0)
+            for element, (_, _, text) in zip(result, rows):
+                actions.click(element).send_keys(text)
+            actions.perform()
+
+    @span
     def get_text(self, locator: tuple) -> str:
         """Wait for an element to be visible and return its text."""
         element = self.wait_for_element(locator)
         return element.text
+
+    @span
+    def read_all(self, locator: tuple, props=("text",), wait: bool = True) -> list:
+        """
+        Read properties of every element matching the locator in a single round trip.
+        Supported props: "text", "visible", "enabled", "tag", "value"; any other name is read as an attribute.
+        Returns one dict per element, e.g. [{"text": "$29.99"}, ...].
+        """
+        if wait:
+            self.wait_for_element(locator)
+        by, value = locator
+        return self.driver.execute_script(self.READ_ALL_SCRIPT, by, value, list(props))
+
+    def read_texts(self, locator: tuple, wait: bool = True) -> list:
+        """Return the visible text of every element matching the locator in a single round trip."""
+        return [row["text"] for row in self.read_all(locator, ("text",), wait)]
+
+    @span(wait=True)
+    def wait_for_invisibility(self, locator: tuple, timeout: float = None):
+        """Wait until an element is hidden or removed from the page."""
+        self.wait_engine.until_invisible(locator, timeout)
+
+    @span(wait=True)
+    def wait_for_dom_stable(self, quiet_ms: int = 300, timeout: float = None):
+        """Wait until the DOM has stopped changing for quiet_ms milliseconds (e.g. after an animation)."""
+        self.wait_engine.until_dom_stable(quiet_ms, timeout)
+
+    @span(wait=True)
+    def wait_for_network_idle(self, idle_ms: int = 500, timeout: float = None):
+        """Wait until the page has loaded and no network request has been active for idle_ms milliseconds."""
+        self.wait_engine.until_network_idle(idle_ms, timeout)
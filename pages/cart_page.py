@@ -30,19 +30,21 @@ class CartPage(BasePage):
         """Return the price of the first item in the cart."""
         return self.get_text(self.ITEM_PRICE)
 
-    def checkout(self, first_name, last_name, zip_code):
+    def checkout(self, first_name, last_name, zip_code, mode=None):
         """
         Perform the checkout flow:
         1. Click Checkout
-        2. Fill user details
+        2. Fill user details (mode: see BasePage.fill_form)
         3. Click Continue
         """
         self.click(self.CHECKOUT_BUTTON)
-        self.enter_text(self.FIRST_NAME_INPUT, first_name)
-        self.enter_text(self.LAST_NAME_INPUT, last_name)
-        self.enter_text(self.POSTAL_CODE_INPUT, zip_code)
+        self.fill_form({
+            self.FIRST_NAME_INPUT: first_name,
+            self.LAST_NAME_INPUT: last_name,
+            self.POSTAL_CODE_INPUT: zip_code,
+        }, mode)
         self.click(self.CONTINUE_BUTTON)
-        self.wait.until(EC.url_contains("checkout-step-two.html"))
+        self.wait_engine.until(EC.url_contains("checkout-step-two.html"))
         self.wait_for_element(self.FINISH_BUTTON)
 
     def finish_checkout(self):
@@ -9,6 +9,9 @@ class InventoryPage(BasePage):
     """
 
     # Locators
+    INVENTORY_LIST = (By.CSS_SELECTOR, ".inventory_list")
+    ITEM_NAME = (By.CSS_SELECTOR, ".inventory_item_name")
+    ITEM_PRICE = (By.CSS_SELECTOR, ".inventory_item_price")
     CART_BADGE = (By.CSS_SELECTOR, ".shopping_cart_badge")
     CART_LINK = (By.CSS_SELECTOR, ".shopping_cart_link")
     SORT_CONTAINER = (By.CSS_SELECTOR, ".product_sort_container")
@@ -25,6 +28,14 @@ class InventoryPage(BasePage):
         locator = (By.CSS_SELECTOR, f"[data-test='add-to-cart-{item_name_kebab_case}']")
         self.click(locator)
 
+    def get_item_names(self):
+        """Return the names of all listed items, in display order."""
+        return self.read_texts(self.ITEM_NAME)
+
+    def get_item_prices(self):
+        """Return the prices of all listed items as floats, in display order."""
+        return [float(price.replace("$", "")) for price in self.read_texts(self.ITEM_PRICE)]
+
     def get_cart_count(self):
         """Return the number of items currently in the cart."""
         return int(self.get_text(self.CART_BADGE))
@@ -47,9 +58,7 @@ class InventoryPage(BasePage):
         self.click(self.MENU_BUTTON)
         # Wait for menu to be visible (animation) and interactive
         # Using a locator that represents the open menu container is better, but waiting for a link to be clickable is good too.
-        from selenium.webdriver.support import expected_conditions as EC
-        self.wait.until(EC.visibility_of_element_located(self.LOGOUT_LINK))
-        self.wait.until(EC.element_to_be_clickable(self.LOGOUT_LINK))
+        self.wait_engine.until_clickable(self.LOGOUT_LINK)
 
     def logout(self):
         """Perform the logout action via the side menu."""
@@ -60,7 +69,6 @@ class InventoryPage(BasePage):
         """Reset the application state (e.g., clear cart) via the side menu."""
         self.open_menu()
         self.click(self.RESET_LINK)
-        # Wait for reset to likely happen
-        import time
-        time.sleep(1) 
+        # Resetting empties the cart, which removes the cart badge
+        self.wait_for_invisibility(self.CART_BADGE)
         self.click(self.CLOSE_MENU_BUTTON)
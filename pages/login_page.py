@@ -18,10 +18,9 @@ class LoginPage(BasePage):
         """Navigate to the Login Page."""
         self.navigate(self.URL)
 
-    def login(self, username, password):
-        """Perform the login action with the given credentials."""
-        self.enter_text(self.USERNAME_INPUT, username)
-        self.enter_text(self.PASSWORD_INPUT, password)
+    def login(self, username, password, mode=None):
+        """Perform the login action with the given credentials (mode: see BasePage.fill_form)."""
+        self.fill_form({self.USERNAME_INPUT: username, self.PASSWORD_INPUT: password}, mode)
         self.click(self.LOGIN_BUTTON)
 
     def get_error_text(self):
@@ -0,0 +1,73 @@
+import json
+from urllib.parse import urljoin, urlsplit
+
+from .login_page import LoginPage
+from .inventory_page import InventoryPage
+from .cart_page import CartPage
+
+# The application keeps the cart client-side: a JSON list of product ids in localStorage.
+CART_KEY = "cart-contents"
+
+# Product ids by the kebab-case name used in the add-to-cart / remove data-test attributes.
+PRODUCT_IDS = {
+    "sauce-labs-backpack": 4,
+    "sauce-labs-bike-light": 0,
+    "sauce-labs-bolt-t-shirt": 1,
+    "sauce-labs-fleece-jacket": 5,
+    "sauce-labs-onesie": 2,
+    "test.allthethings()-t-shirt-(red)": 3,
+}
+
+# Pages a seeded state can start on: path, page object and the element showing it is ready.
+TARGETS = {
+    "inventory": ("inventory.html", InventoryPage, InventoryPage.INVENTORY_LIST),
+    "cart": ("cart.html", CartPage, CartPage.CHECKOUT_BUTTON),
+    "checkout-step-one": ("checkout-step-one.html", CartPage, CartPage.CONTINUE_BUTTON),
+    "checkout-step-two": ("checkout-step-two.html", CartPage, CartPage.FINISH_BUTTON),
+}
+
+WRITE_STORAGE_SCRIPT = """
+    var entries = arguments[0];
+    Object.keys(entries).forEach(function (k) {
+        if (entries[k] === null) { window.localStorage.removeItem(k); }
+        else { window.localStorage.setItem(k, entries[k]); }
+    });
+"""
+
+
+def cart_storage(items) -> dict:
+    """
+    localStorage entries holding a cart with the given items (kebab-case names).
+    An empty cart removes the entry, as the application does.
+    """
+    unknown = [item for item in items if item not in PRODUCT_IDS]
+    if unknown:
+        raise ValueError(f"Unknown products: {', '.join(unknown)}")
+    ids = [PRODUCT_IDS[item] for item in dict.fromkeys(items)]
+    return {CART_KEY: json.dumps(ids) if ids else None}
+
+
+def seed_cart(driver, items, target: str = "cart", session_cache=None, username: str = "standard_user"):
+    """
+    Put the given items (kebab-case names) in the cart and open the target page with one navigation,
+    instead of adding them on the inventory page and clicking through to it.
+    target: 'inventory', 'cart', 'checkout-step-one' or 'checkout-step-two'.
+    session_cache: SessionCache restoring the user's session along with the cart; without it the
+    browser must already be logged in.
+    Returns the page object of the target page.
+    """
+    path, page_class, ready = TARGETS[target]
+    url = urljoin(LoginPage.URL, path)
+    storage = cart_storage(items)
+    if session_cache is not None:
+        session_cache.open_page(driver, url, ready, username, local_storage=storage)
+        return page_class(driver)
+    parts = urlsplit(LoginPage.URL)
+    if not driver.current_url.startswith(f"{parts.scheme}://{parts.netloc}/"):
+        # Storage is scoped to the origin.
+        driver.get(LoginPage.URL)
+    driver.execute_script(WRITE_STORAGE_SCRIPT, storage)
+    page = page_class(driver)
+    page.navigate(url)
+    page.wait_for_element(ready)
+    return page
@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import pytest
+import allure
+from pages.aio.login_page import LoginPage
+from pages.aio.inventory_page import InventoryPage
+from pages.aio.sync import SyncPage
+from utils.async_webdriver import AsyncWebDriver
+from utils.driver_factory import browser_options
+
+@allure.feature("Async Page Objects")
+class TestAsyncPages:
+    """
+    Test suite for the asyncio page objects.
+    Covers the synchronous adapter and many sessions driven from one event loop.
+    """
+
+    SESSIONS = 4
+
+    @allure.story("Sync Adapter")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_login_through_sync_adapter(self, driver):
+        """Verify that async page objects drive the session of the sync driver fixture."""
+        login_page = SyncPage.of(LoginPage, driver)
+
+        with allure.step("Login with valid credentials"):
+            login_page.load()
+            login_page.login("standard_user", "secret_sauce")
+
+        with allure.step("Verify inventory through the sync driver"):
+            assert "inventory.html" in driver.current_url
+
+    @allure.story("Concurrent Sessions")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_concurrent_sessions(self, driver, request):
+        """Verify that several sessions log in and read the inventory concurrently on one event loop."""
+        service = getattr(driver, "service", None)
+        if service is None:
+            pytest.skip("Needs a local driver service to start more sessions on")
+        capabilities = browser_options(
+            request.config.getoption("--driver-browser"), request.config.getoption("--driver-profile")
+        ).to_capabilities()
+
+        async def shop():
+            session = await AsyncWebDriver.start(service.service_url, capabilities)
+            try:
+                login_page = LoginPage(session)
+                await login_page.load()
+                await login_page.login("standard_user", "secret_sauce")
+                return await InventoryPage(session).get_item_names()
+            finally:
+                await session.quit()
+
+        async def main():
+            return await asyncio.gather(*(shop() for _ in range(self.SESSIONS)))
+
+        with allure.step(f"Log in with {self.SESSIONS} concurrent sessions"):
+            results = asyncio.run(main())
+
+        with allure.step("Verify every session saw the inventory"):
+            assert len(results) == self.SESSIONS
+            assert all("Sauce Labs Backpack" in names for names in results)
+
+if __name__ == '__main__':
+    pytest.main([__file__])
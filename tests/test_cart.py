@@ -4,8 +4,6 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pytest
 import allure
 from selenium.webdriver.common.by import By
-from pages.login_page import LoginPage
-from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
 
 @allure.feature("Cart")
@@ -17,21 +15,10 @@ class TestCart:
 
     @allure.story("Cart Management")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_remove_item_from_cart(self, driver):
+    def test_remove_item_from_cart(self, driver, seeded_cart):
         """Verify that an item can be removed from the cart."""
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        cart_page = CartPage(driver)
-        
-        with allure.step("Login as standard user"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
-            
-        with allure.step("Add item to cart"):
-            inventory_page.add_item_to_cart("sauce-labs-backpack")
-            
-        with allure.step("Navigate to cart"):
-            inventory_page.go_to_cart()
+        with allure.step("Open cart holding the backpack"):
+            cart_page = seeded_cart(["sauce-labs-backpack"])
             
         with allure.step("Remove item from cart"):
             cart_page.remove_item("sauce-labs-backpack")
@@ -42,18 +29,10 @@ class TestCart:
 
     @allure.story("Cart Management")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_continue_shopping(self, driver):
+    def test_continue_shopping(self, driver, seeded_cart):
         """Verify that 'Continue Shopping' redirects back to inventory."""
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        cart_page = CartPage(driver)
-        
-        with allure.step("Login as standard user"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
-            
-        with allure.step("Navigate to cart"):
-            inventory_page.go_to_cart()
+        with allure.step("Open empty cart"):
+            cart_page = seeded_cart([])
             
         with allure.step("Click Continue Shopping"):
             cart_page.continue_shopping()
@@ -63,20 +42,13 @@ class TestCart:
 
     @allure.story("Advanced: UI Layout")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_cart_layout(self, driver):
+    def test_cart_layout(self, driver, seeded_cart):
         """
         Verify the presence and text of key elements on the cart page.
         Ensures UI structure is correct (Title, Headers, Buttons).
         """
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        cart_page = CartPage(driver)
-        
-        with allure.step("Login and go to cart"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
-            inventory_page.add_item_to_cart("sauce-labs-backpack")
-            inventory_page.go_to_cart()
+        with allure.step("Open cart holding the backpack"):
+            seeded_cart(["sauce-labs-backpack"])
             
         with allure.step("Verify UI Layout"):
             # Verify page title
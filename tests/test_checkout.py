@@ -6,9 +6,16 @@ import allure
 import random
 import string
 from selenium.webdriver.common.by import By
-from pages.login_page import LoginPage
-from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
+from utils import scenario
+
+@scenario.prefix(ready=CartPage.FIRST_NAME_INPUT)
+def checkout_information(driver, seeded_cart):
+    """
+    Checkout information page with the backpack in the cart, shared by the negative checkout tests:
+    the first one seeds it, the others restore the checkpoint taken here.
+    """
+    return seeded_cart(["sauce-labs-backpack"], target="checkout-step-one")
 
 @allure.feature("Checkout")
 class TestCheckout:
@@ -19,15 +26,11 @@ class TestCheckout:
 
     @allure.story("Advanced: Dynamic Data")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_checkout_dynamic_data(self, driver):
+    def test_checkout_dynamic_data(self, driver, seeded_cart):
         """
         Verify checkout with randomly generated user data.
         Ensures application handles variable input correctly.
         """
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        cart_page = CartPage(driver)
-        
         # Helper functions for random data
         def random_string(length=8):
             return ''.join(random.choices(string.ascii_letters, k=length))
@@ -39,11 +42,8 @@ class TestCheckout:
         last_name = random_string()
         zip_code = random_digits()
         
-        with allure.step("Login and go to checkout"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
-            inventory_page.add_item_to_cart("sauce-labs-backpack")
-            inventory_page.go_to_cart()
+        with allure.step("Open cart holding the backpack"):
+            cart_page = seeded_cart(["sauce-labs-backpack"])
             
         with allure.step(f"Checkout with dynamic data: {first_name} {last_name}, {zip_code}"):
             cart_page.checkout(first_name, last_name, zip_code)
@@ -53,18 +53,10 @@ class TestCheckout:
 
     @allure.story("Negative Checkout")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_checkout_empty_firstname(self, driver):
+    def test_checkout_empty_firstname(self, driver, checkout_information):
         """Verify error message when First Name is empty."""
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        cart_page = CartPage(driver)
-        
-        with allure.step("Login and go to checkout"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
-            inventory_page.add_item_to_cart("sauce-labs-backpack")
-            inventory_page.go_to_cart()
-            driver.find_element(*CartPage.CHECKOUT_BUTTON).click()
+        with allure.step("Open checkout information with the backpack in the cart"):
+            cart_page = checkout_information
             
         with allure.step("Try to continue with empty first name"):
             driver.find_element(*CartPage.LAST_NAME_INPUT).send_keys("Doe")
@@ -76,18 +68,10 @@ class TestCheckout:
 
     @allure.story("Negative Checkout")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_checkout_empty_lastname(self, driver):
+    def test_checkout_empty_lastname(self, driver, checkout_information):
         """Verify error message when Last Name is empty."""
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        cart_page = CartPage(driver)
-        
-        with allure.step("Login and go to checkout"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
-            inventory_page.add_item_to_cart("sauce-labs-backpack")
-            inventory_page.go_to_cart()
-            driver.find_element(*CartPage.CHECKOUT_BUTTON).click()
+        with allure.step("Open checkout information with the backpack in the cart"):
+            cart_page = checkout_information
             
         with allure.step("Try to continue with empty last name"):
             driver.find_element(*CartPage.FIRST_NAME_INPUT).send_keys("John")
@@ -99,18 +83,10 @@ class TestCheckout:
 
     @allure.story("Negative Checkout")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_checkout_empty_zip(self, driver):
+    def test_checkout_empty_zip(self, driver, checkout_information):
         """Verify error message when Postal Code is empty."""
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        cart_page = CartPage(driver)
-        
-        with allure.step("Login and go to checkout"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
-            inventory_page.add_item_to_cart("sauce-labs-backpack")
-            inventory_page.go_to_cart()
-            driver.find_element(*CartPage.CHECKOUT_BUTTON).click()
+        with allure.step("Open checkout information with the backpack in the cart"):
+            cart_page = checkout_information
             
         with allure.step("Try to continue with empty zip code"):
             driver.find_element(*CartPage.FIRST_NAME_INPUT).send_keys("John")
@@ -26,9 +26,10 @@ class TestE2E:
         cart_page = CartPage(driver)
 
         # 1. Login Step
+        # The journey types with real keystrokes, as a user would (see BasePage.fill_form).
         with allure.step("Login as standard user"):
             login_page.load()
-            login_page.login("standard_user", "secret_sauce")
+            login_page.login("standard_user", "secret_sauce", mode="faithful")
 
         # 2. Add Item Step
         item_name = "Sauce Labs Backpack"
@@ -49,7 +50,7 @@ class TestE2E:
 
         # 5. Checkout Step
         with allure.step("Proceed to checkout"):
-            cart_page.checkout("John", "Doe", "12345")
+            cart_page.checkout("John", "Doe", "12345", mode="faithful")
 
         # 6. Finish Step
         with allure.step("Finish checkout"):
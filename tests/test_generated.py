@@ -1,61 +1,107 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from urllib.parse import urlsplit
 import pytest
 import allure
 from selenium.webdriver.common.by import By
 from pages.login_page import LoginPage
 
 @allure.feature('Generated Tests')
-class TestGenerated:
+class TestGeneratedInventory:
+    """Checks of the inventory page, read once for the whole class."""
 
-    @pytest.fixture(autouse=True)
-    def setup(self, driver):
-        self.login_page = LoginPage(driver)
-        self.login_page.load()
-        self.login_page.login('standard_user', 'secret_sauce')
+    ITEM_NAME = (By.CSS_SELECTOR, '[data-test="inventory-item-name"]')
+    ADD_TO_CART_BUTTON = (By.CSS_SELECTOR, '[data-test^="add-to-cart"]')
+
+    @pytest.fixture(scope='class')
+    def items(self, class_inventory):
+        """Name and visibility of every listed item, read in one in-page query."""
+        rows = class_inventory.read_all(self.ITEM_NAME, ('text', 'visible'))
+        return {row['text']: row for row in rows}
+
+    @pytest.fixture(scope='class')
+    def add_to_cart_buttons(self, class_inventory):
+        return class_inventory.read_all(self.ADD_TO_CART_BUTTON, ('visible',))
 
     @allure.story('Verify Item Visibility')
-    def test_item_visibility_saucelabsbackpack_0(self, driver):
+    def test_item_visibility_saucelabsbackpack(self, items):
         """Verify that 'Sauce Labs Backpack' is displayed."""
-        item = driver.find_element(By.XPATH, "//div[text()='Sauce Labs Backpack']")
-        assert item.is_displayed()
+        assert 'Sauce Labs Backpack' in items
+        assert items['Sauce Labs Backpack']['visible']
 
     @allure.story('Verify Item Visibility')
-    def test_item_visibility_saucelabsbikelight_1(self, driver):
+    def test_item_visibility_saucelabsbikelight(self, items):
         """Verify that 'Sauce Labs Bike Light' is displayed."""
-        item = driver.find_element(By.XPATH, "//div[text()='Sauce Labs Bike Light']")
-        assert item.is_displayed()
+        assert 'Sauce Labs Bike Light' in items
+        assert items['Sauce Labs Bike Light']['visible']
 
     @allure.story('Verify Item Visibility')
-    def test_item_visibility_saucelabsbolttshirt_2(self, driver):
+    def test_item_visibility_saucelabsbolttshirt(self, items):
         """Verify that 'Sauce Labs Bolt T-Shirt' is displayed."""
-        item = driver.find_element(By.XPATH, "//div[text()='Sauce Labs Bolt T-Shirt']")
-        assert item.is_displayed()
+        assert 'Sauce Labs Bolt T-Shirt' in items
+        assert items['Sauce Labs Bolt T-Shirt']['visible']
 
     @allure.story('Verify Item Visibility')
-    def test_item_visibility_saucelabsfleecejacket_3(self, driver):
+    def test_item_visibility_saucelabsfleecejacket(self, items):
         """Verify that 'Sauce Labs Fleece Jacket' is displayed."""
-        item = driver.find_element(By.XPATH, "//div[text()='Sauce Labs Fleece Jacket']")
-        assert item.is_displayed()
+        assert 'Sauce Labs Fleece Jacket' in items
+        assert items['Sauce Labs Fleece Jacket']['visible']
 
     @allure.story('Verify Item Visibility')
-    def test_item_visibility_saucelabsonesie_4(self, driver):
+    def test_item_visibility_saucelabsonesie(self, items):
         """Verify that 'Sauce Labs Onesie' is displayed."""
-        item = driver.find_element(By.XPATH, "//div[text()='Sauce Labs Onesie']")
-        assert item.is_displayed()
+        assert 'Sauce Labs Onesie' in items
+        assert items['Sauce Labs Onesie']['visible']
 
     @allure.story('Verify Item Visibility')
-    def test_item_visibility_testallthethingstshirtred_5(self, driver):
+    def test_item_visibility_testallthethingstshirtred(self, items):
         """Verify that 'Test.allTheThings() T-Shirt (Red)' is displayed."""
-        item = driver.find_element(By.XPATH, "//div[text()='Test.allTheThings() T-Shirt (Red)']")
-        assert item.is_displayed()
+        assert 'Test.allTheThings() T-Shirt (Red)' in items
+        assert items['Test.allTheThings() T-Shirt (Red)']['visible']
 
     @allure.story('Verify Add to Cart Buttons')
-    def test_add_to_cart_buttons_exist(self, driver):
+    def test_add_to_cart_buttons_exist(self, add_to_cart_buttons):
         """Verify that at least one Add to Cart button exists."""
-        buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Add to cart')]")
-        assert len(buttons) > 0
+        assert len(add_to_cart_buttons) > 0
+
+@allure.feature('Generated Tests')
+class TestGeneratedPages:
+    """Pages reached by the crawler, opened in one logged-in browser."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, class_inventory, class_driver):
+        self.driver = class_driver
+
+    @allure.story('Verify Page Reachable')
+    def test_page_reachable_inventory(self):
+        """Verify that '/inventory.html' opens for a logged-in user."""
+        self.driver.get(LoginPage.URL + 'inventory.html')
+        assert urlsplit(self.driver.current_url).path == '/inventory.html'
+
+    @allure.story('Verify Page Reachable')
+    def test_page_reachable_cart(self):
+        """Verify that '/cart.html' opens for a logged-in user."""
+        self.driver.get(LoginPage.URL + 'cart.html')
+        assert urlsplit(self.driver.current_url).path == '/cart.html'
+
+    @allure.story('Verify Page Reachable')
+    def test_page_reachable_checkout_step_one(self):
+        """Verify that '/checkout-step-one.html' opens for a logged-in user."""
+        self.driver.get(LoginPage.URL + 'checkout-step-one.html')
+        assert urlsplit(self.driver.current_url).path == '/checkout-step-one.html'
+
+    @allure.story('Verify Page Reachable')
+    def test_page_reachable_checkout_step_two(self):
+        """Verify that '/checkout-step-two.html' opens for a logged-in user."""
+        self.driver.get(LoginPage.URL + 'checkout-step-two.html')
+        assert urlsplit(self.driver.current_url).path == '/checkout-step-two.html'
+
+    @allure.story('Verify Page Reachable')
+    def test_page_reachable_checkout_complete(self):
+        """Verify that '/checkout-complete.html' opens for a logged-in user."""
+        self.driver.get(LoginPage.URL + 'checkout-complete.html')
+        assert urlsplit(self.driver.current_url).path == '/checkout-complete.html'
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -3,7 +3,6 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pytest
 import allure
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from pages.login_page import LoginPage
@@ -14,49 +13,36 @@ class TestInventory:
 
     @allure.story("Logout")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_logout(self, driver):
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        
-        with allure.step("Login as standard user"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
+    def test_logout(self, driver, logged_in_inventory):
+        with allure.step("Open inventory as standard user"):
+            inventory_page = logged_in_inventory("standard_user")
             
         with allure.step("Perform logout"):
             inventory_page.logout()
             
         with allure.step("Verify redirection to login page"):
             WebDriverWait(driver, 30).until_not(EC.url_contains("inventory.html"))
-            assert "saucedemo.com" in driver.current_url and "inventory.html" not in driver.current_url
+            assert driver.current_url.startswith(LoginPage.URL) and "inventory.html" not in driver.current_url
             assert driver.find_element(*LoginPage.LOGIN_BUTTON).is_displayed()
 
     @allure.story("Sorting")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_sort_low_to_high(self, driver):
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        
-        with allure.step("Login as standard user"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
+    def test_sort_low_to_high(self, driver, logged_in_inventory):
+        with allure.step("Open inventory as standard user"):
+            inventory_page = logged_in_inventory("standard_user")
             
         with allure.step("Sort products by Price (low to high)"):
             inventory_page.sort_by("lohi")
             
         with allure.step("Verify sorting"):
-            prices = driver.find_elements(By.CSS_SELECTOR, ".inventory_item_price")
-            price_values = [float(price.text.replace("$", "")) for price in prices]
+            price_values = inventory_page.get_item_prices()
             assert price_values == sorted(price_values), "Prices are not sorted low to high"
 
     @allure.story("App State")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_reset_app_state(self, driver):
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        
-        with allure.step("Login as standard user"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
+    def test_reset_app_state(self, driver, logged_in_inventory):
+        with allure.step("Open inventory as standard user"):
+            inventory_page = logged_in_inventory("standard_user")
             
         with allure.step("Add item to cart"):
             inventory_page.add_item_to_cart("sauce-labs-backpack")
@@ -77,27 +63,19 @@ class TestInventory:
 
     @allure.story("Advanced: Network Interception")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_inventory_no_images(self, driver):
-        # Only works with Chromium-based browsers (Chrome, Edge)
+    @pytest.mark.network_policy("images")
+    def test_inventory_no_images(self, driver, logged_in_inventory):
+        # Image URLs are only visible to the CDP backend; the Firefox proxy sees HTTPS hosts only
         if driver.name not in ["chrome", "MicrosoftEdge"]:
-            pytest.skip("Network interception only supported on Chromium-based browsers")
+            pytest.skip("Image blocking only supported on Chromium-based browsers")
 
-        # Enable Network domain
-        driver.execute_cdp_cmd("Network.enable", {})
-        # Block images
-        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": ["*.jpg", "*.png", "*.jpeg", "*.gif"]})
-
-        login_page = LoginPage(driver)
-        
-        with allure.step("Login with images blocked"):
-            login_page.load()
-            login_page.login("standard_user", "secret_sauce")
+        with allure.step("Open inventory with images blocked"):
+            inventory_page = logged_in_inventory("standard_user")
             
         with allure.step("Verify page loads without images"):
-            inventory_list = driver.find_element(By.CSS_SELECTOR, ".inventory_list")
+            inventory_list = driver.find_element(*InventoryPage.INVENTORY_LIST)
             assert inventory_list.is_displayed()
-            items = driver.find_elements(By.CSS_SELECTOR, ".inventory_item_name")
-            assert len(items) == 6
+            assert len(inventory_page.get_item_names()) == 6
 
 if __name__ == '__main__':
     pytest.main([__file__])
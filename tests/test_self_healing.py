@@ -5,6 +5,8 @@ import pytest
 import allure
 from selenium.webdriver.common.by import By
 from pages.login_page import LoginPage
+from utils.healing_cache import HealingCache
+from utils.self_healing_driver import SelfHealingDriver
 
 @allure.feature("Self Healing")
 class TestSelfHealing:
@@ -45,5 +47,40 @@ class TestSelfHealing:
         assert element.is_displayed()
         assert element.get_attribute("id") == "login-button"
 
+    @allure.story("Healing Cache")
+    def test_healed_locator_is_cached(self, driver):
+        """
+        Verify that a healed locator is remembered and tried first on the next lookup,
+        instead of retrying the broken locator and walking the backup list again.
+        """
+        login_page = LoginPage(driver)
+        login_page.load()
+        cache = HealingCache(path=None)
+        healing_driver = SelfHealingDriver(driver, cache=cache)
+        broken_locator = (By.CSS_SELECTOR, "div.wrong_container > #login-button")
+
+        healing_driver.find_element(broken_locator)
+        assert cache.stats()["misses"] == 1
+        assert cache.lookup(driver.current_url, broken_locator) == (By.ID, "login-button")
+
+        element = healing_driver.find_element(broken_locator)
+        assert element.get_attribute("id") == "login-button"
+        assert cache.stats()["hits"] == 1
+
+    @allure.story("Ranked In-Browser Healing")
+    def test_ranked_healing(self, driver):
+        """
+        Verify that ranked healing evaluates all candidates in the browser and picks
+        the element most similar to the broken locator.
+        """
+        login_page = LoginPage(driver)
+        login_page.load()
+        healing_driver = SelfHealingDriver(driver, cache=HealingCache(path=None), heal_mode="ranked")
+        broken_locator = (By.CSS_SELECTOR, "form > button[data-test='login-button']")
+
+        element = healing_driver.find_element(broken_locator)
+
+        assert element.get_attribute("id") == "login-button"
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,132 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import subprocess
+import pytest
+import allure
+from utils.test_impact import symbol_hashes, affected, changes_since, merge_failed
+
+PAGE = '''
+from selenium.webdriver.common.by import By
+
+
+class LoginPage:
+    URL = "https://www.saucedemo.com/"
+    USERNAME_INPUT = (By.ID, "user-name")
+    FILL_SCRIPT = "return fill(arguments[0]);"
+
+    def login(self, username):
+        self.fill_form({self.USERNAME_INPUT: username})
+
+    def load(self):
+        self.navigate(self.URL)
+'''
+
+PATH = "pages/login_page.py"
+
+
+def changed(old: str, new: str) -> set:
+    before, after = symbol_hashes(old, PATH), symbol_hashes(new, PATH)
+    return {name for name in set(before) | set(after) if before.get(name) != after.get(name)}
+
+
+def git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A git repository with one committed page object."""
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.email", "tests@example.com")
+    git(tmp_path, "config", "user.name", "tests")
+    (tmp_path / "pages").mkdir()
+    (tmp_path / PATH).write_text(PAGE)
+    (tmp_path / ".gitignore").write_text(".test-durations.json\n")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "baseline")
+    return tmp_path
+
+
+@allure.feature("Test Impact")
+class TestSymbolHashes:
+    """Changes in page objects are mapped to the methods and attributes they touch."""
+
+    def test_method_change(self):
+        assert changed(PAGE, PAGE.replace("self.navigate(self.URL)", "self.navigate(self.URL + 'x')")) == {
+            f"{PATH}::LoginPage.load"
+        }
+
+    def test_locator_change(self):
+        assert changed(PAGE, PAGE.replace('"user-name"', '"username"')) == {f"{PATH}::LoginPage.USERNAME_INPUT"}
+
+    def test_formatting_is_ignored(self):
+        assert changed(PAGE, PAGE.replace("(By.ID, ", "(By.ID,  ")) == set()
+
+    def test_import_change_is_module(self):
+        assert changed(PAGE, "import time\n" + PAGE) == {f"{PATH}::<module>"}
+
+
+@allure.feature("Test Impact")
+class TestAffected:
+    """Selection of the tests affected by a set of changed symbols."""
+
+    RECORDED = {
+        "tests/test_login.py::TestLogin::test_valid_login": [
+            f"{PATH}::LoginPage.login", f"{PATH}::LoginPage.USERNAME_INPUT", "pages/base_page.py::BasePage.fill_form",
+        ],
+        "tests/test_login.py::TestLogin::test_load": [f"{PATH}::LoginPage.load"],
+        "tests/test_cart.py::TestCart::test_add": ["pages/cart_page.py::CartPage.add"],
+    }
+    NODEIDS = list(RECORDED) + ["tests/test_cart.py::TestCart::test_new"]
+
+    def test_recorded_locator_selects_its_tests(self):
+        selected = affected(self.RECORDED, self.NODEIDS, {f"{PATH}::LoginPage.USERNAME_INPUT"}, set())
+        assert selected == {"tests/test_login.py::TestLogin::test_valid_login", "tests/test_cart.py::TestCart::test_new"}
+
+    def test_unrecorded_attribute_selects_its_class(self):
+        selected = affected(self.RECORDED, self.NODEIDS, {"pages/base_page.py::BasePage.FILL_FORM_SCRIPT"}, set())
+        assert "tests/test_login.py::TestLogin::test_valid_login" in selected
+        assert "tests/test_cart.py::TestCart::test_add" not in selected
+
+    def test_module_change_selects_everything_under_it(self):
+        selected = affected(self.RECORDED, self.NODEIDS, {f"{PATH}::<module>"}, set())
+        assert {"tests/test_login.py::TestLogin::test_valid_login", "tests/test_login.py::TestLogin::test_load"} <= selected
+        assert "tests/test_cart.py::TestCart::test_add" not in selected
+
+    def test_changed_test_file_selects_all_its_tests(self):
+        selected = affected(self.RECORDED, self.NODEIDS, set(), {"tests/test_cart.py"})
+        assert selected == {"tests/test_cart.py::TestCart::test_add", "tests/test_cart.py::TestCart::test_new"}
+
+    def test_failures_stay_until_their_test_runs_again(self):
+        previous = ["tests/test_cart.py::TestCart::test_add", "tests/test_login.py::TestLogin::test_load"]
+        ran = {"tests/test_login.py::TestLogin::test_load": [], "tests/test_login.py::TestLogin::test_valid_login": []}
+        assert merge_failed(previous, ran, {"tests/test_login.py::TestLogin::test_valid_login"}) == [
+            "tests/test_cart.py::TestCart::test_add", "tests/test_login.py::TestLogin::test_valid_login",
+        ]
+
+
+@allure.feature("Test Impact")
+class TestChangesSince:
+    """Changed files in a git working tree, mapped to symbols and test files."""
+
+    def test_clean_tree(self, repo):
+        assert changes_since(str(repo), "HEAD") == (set(), set())
+
+    def test_ignored_and_untracked_outputs_do_not_force_a_full_run(self, repo):
+        (repo / ".test-durations.json").write_text("{}")
+        (repo / "results.json").write_text("{}")
+        assert changes_since(str(repo), "HEAD") == (set(), set())
+
+    def test_page_change(self, repo):
+        (repo / PATH).write_text(PAGE.replace('"user-name"', '"username"'))
+        assert changes_since(str(repo), "HEAD") == ({f"{PATH}::LoginPage.USERNAME_INPUT"}, set())
+
+    def test_untracked_test_file(self, repo):
+        (repo / "tests").mkdir()
+        (repo / "tests" / "test_new.py").write_text("def test_new():\n    pass\n")
+        assert changes_since(str(repo), "HEAD") == (set(), {"tests/test_new.py"})
+
+    def test_other_code_forces_a_full_run(self, repo):
+        (repo / "helpers.py").write_text("VALUE = 1\n")
+        assert changes_since(str(repo), "HEAD") is None
@@ -0,0 +1,361 @@
+import hashlib
+import logging
+import queue
+import sys
+import os
+import re
+import threading
+import time
+from urllib.error import URLError
+from urllib.parse import urldefrag, urljoin, urlsplit
+from urllib.request import urlopen
+
+from selenium.common.exceptions import WebDriverException
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from pages.inventory_page import InventoryPage
+from utils.driver_factory import create_driver
+
+logger = logging.getLogger("Crawler")
+
+
+class PageState:
+    """A distinct page state found by the crawler: its URL, DOM fingerprint and test-relevant elements."""
+
+    def __init__(self, url: str, depth: int, fingerprint: str, title: str, elements: list, reused: bool = False):
+        self.url = url
+        self.depth = depth
+        self.fingerprint = fingerprint
+        self.title = title
+        # One dict per element carrying a data-test attribute: data_test, tag, id, text, visible.
+        self.elements = elements
+        # True when the state was taken from the previous crawl because the server response was unchanged.
+        self.reused = reused
+
+    @property
+    def path(self) -> str:
+        parts = urlsplit(self.url)
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def find(self, data_test: str) -> list:
+        """Return the elements whose data-test attribute equals or starts with the given value."""
+        return [e for e in self.elements if e["data_test"] == data_test or e["data_test"].startswith(data_test + "-")]
+
+    def __repr__(self):
+        return f"PageState({self.path!r}, depth={self.depth}, elements={len(self.elements)})"
+
+
+class Crawler:
+    """
+    Breadth-first exploration of an application with a pool of headless browsers.
+
+    Every worker thread owns one logged-in browser and takes pages from a shared frontier.
+    Same-origin links are queued directly; buttons and submits (forms are filled with
+    placeholder values) are clicked once to learn where they lead. A state is identified
+    by its URL plus a fingerprint of the DOM structure, so each one is visited once. The
+    crawl stops at max_depth, when the time budget is spent, or when the frontier is empty.
+
+    Every visited page is also recorded in self.pages, keyed by path, together with a hash
+    of its server response (the HTML and the scripts it loads). Passing those records back
+    as previous_pages skips the browser for every page whose response hash is unchanged.
+    """
+
+    # One round trip per page: structure for the fingerprint, data-test elements, links and click targets.
+    SCAN_SCRIPT = """
+        var skip = new RegExp(arguments[0], 'i');
+        function visible(el) {
+            var rect = el.getBoundingClientRect();
+            return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+        }
+        function selector(el) {
+            if (el.getAttribute('data-test')) { return '[data-test="' + el.getAttribute('data-test') + '"]'; }
+            if (el.id) { return '#' + el.id; }
+            return null;
+        }
+        var shape = [], elements = [], links = [], clicks = [];
+        var nodes = document.body ? document.body.getElementsByTagName('*') : [];
+        for (var i = 0; i < nodes.length; i++) {
+            var el = nodes[i], test = el.getAttribute('data-test');
+            shape.push(el.tagName + (test ? '[' + test + ']' : ''));
+            if (test) {
+                elements.push({
+                    data_test: test, tag: el.tagName.toLowerCase(), id: el.id || null,
+                    text: (el.innerText || el.value || '').trim().slice(0, 120), visible: visible(el)
+                });
+            }
+            var key = (el.id || '') + ' ' + (test || '');
+            if (el.tagName === 'A' && el.href && el.getAttribute('href') !== '#') {
+                if (el.origin === location.origin && !skip.test(key)) { links.push(el.href); }
+            } else if ((el.tagName === 'BUTTON' || el.tagName === 'A' || (el.tagName === 'INPUT' && el.type === 'submit'))
+                       && visible(el) && selector(el) && !skip.test(key)) {
+                clicks.push(selector(el));
+            }
+        }
+        return {shape: shape.join('|'), elements: elements, links: links, clicks: clicks, title: document.title};
+    """
+
+    # Fill the empty text fields of the form around the target before submitting it.
+    FILL_FORM_SCRIPT = """
+        var target = document.querySelector(arguments[0]), value = arguments[1];
+        var form = target && target.form;
+        if (!form) { return 0; }
+        var filled = 0;
+        Array.prototype.forEach.call(form.querySelectorAll('input[type=text], input:not([type])'), function (input) {
+            if (!input.value) {
+                var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+                setter.call(input, value);
+                input.dispatchEvent(new Event('input', {bubbles: true}));
+                filled++;
+            }
+        });
+        return filled;
+    """
+
+    # Controls that must not be explored: they log out, wipe state, leave the site or only toggle the cart.
+    SKIP_PATTERN = r"logout|reset|about|menu|burger|add-to-cart|remove|sort|cancel|error-button"
+    FORM_VALUE = "12345"
+    SCRIPT_SRC = re.compile(r"<script[^>]+src=[\"']([^\"']+)[\"']", re.IGNORECASE)
+
+    def __init__(self, start_url: str, workers: int = 4, max_depth: int = 3, time_budget: float = 120,
+                 driver_factory=None, login=None, previous_pages=None):
+        """
+        start_url: first page to visit (after login).
+        workers: number of browsers exploring in parallel.
+        max_depth: number of link or click steps away from start_url that are explored.
+        time_budget: seconds after which no new page is started.
+        driver_factory: callable returning a WebDriver (default: headless Chrome).
+        login: callable(driver) preparing every new browser, e.g. logging in.
+        previous_pages: self.pages of an earlier crawl, reused for pages whose response is unchanged.
+        """
+        self.start_url = start_url
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.driver_factory = driver_factory or (lambda: create_driver("chrome", profile="fast"))
+        self.login = login
+        self.previous_pages = previous_pages or {}
+        self.states = []
+        self.pages = {}
+        self.stats = {"visited": 0, "reused": 0, "duplicates": 0, "clicks": 0, "errors": 0, "skipped": 0}
+        self._script_hashes = {}
+        self._frontier = queue.Queue()
+        self._seen_urls = set()
+        self._seen_states = set()
+        # (fingerprint, selector) pairs already clicked: pages with the same structure lead to the same place.
+        self._followed = set()
+        self._lock = threading.Lock()
+        self._deadline = None
+
+    def crawl(self) -> list:
+        """Explore from start_url and return the discovered PageStates in breadth-first order."""
+        self._deadline = time.monotonic() + self.time_budget
+        self._enqueue(self.start_url, 0)
+        threads = [
+            threading.Thread(target=self._work, name=f"crawler-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        self._frontier.join()
+        for _ in threads:
+            self._frontier.put(None)
+        for thread in threads:
+            thread.join()
+        self.states.sort(key=lambda state: (state.depth, state.url))
+        return self.states
+
+    @property
+    def complete(self) -> bool:
+        """True when every reachable page within max_depth was crawled (no errors, time budget not hit)."""
+        return not self.stats["errors"] and not self.stats["skipped"]
+
+    def _enqueue(self, url: str, depth: int):
+        url = urldefrag(url)[0]
+        with self._lock:
+            if url in self._seen_urls:
+                return
+            self._seen_urls.add(url)
+        self._frontier.put((url, depth))
+
+    def _work(self):
+        # Browsers are started on first use, so a crawl served from previous_pages starts none.
+        browser = {"driver": None}
+        try:
+            while True:
+                entry = self._frontier.get()
+                if entry is None:
+                    self._frontier.task_done()
+                    return
+                try:
+                    if time.monotonic() < self._deadline:
+                        self._visit(browser, *entry)
+                    else:
+                        with self._lock:
+                            self.stats["skipped"] += 1
+                except WebDriverException as e:
+                    logger.warning(f"Crawling {entry[0]} failed: {e.msg}")
+                    with self._lock:
+                        self.stats["errors"] += 1
+                except Exception as e:
+                    # Anything else (a crashed driver, a failing factory or login) must not end the thread,
+                    # or its queued entries are never marked done and crawl() waits forever.
+                    logger.warning(f"Crawling {entry[0]} failed: {e!r}")
+                    with self._lock:
+                        self.stats["errors"] += 1
+                    self._discard(browser)
+                finally:
+                    self._frontier.task_done()
+        finally:
+            self._discard(browser)
+
+    def _driver(self, browser: dict):
+        if browser["driver"] is None:
+            driver = self.driver_factory()
+            if self.login:
+                try:
+                    self.login(driver)
+                except Exception:
+                    self._discard({"driver": driver})
+                    raise
+            browser["driver"] = driver
+        return browser["driver"]
+
+    @staticmethod
+    def _discard(browser: dict):
+        """Quit the browser, if any, ignoring errors: it may already be gone. The next entry starts a new one."""
+        driver, browser["driver"] = browser["driver"], None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def _visit(self, browser: dict, url: str, depth: int):
+        response = self._response_hash(url)
+        key = self._path(url)
+        previous = self.previous_pages.get(key)
+        if response and previous and previous["response"] == response:
+            record = previous
+            state = self._add_state(self._absolute(record["url"]), depth, record, reused=True)
+            if state is None:
+                return
+            if depth < self.max_depth:
+                for path in record["links"] + record["targets"]:
+                    self._enqueue(self._absolute(path), depth + 1)
+            with self._lock:
+                self.pages[key] = record
+            return
+
+        driver = self._driver(browser)
+        driver.get(url)
+        scan = self._scan(driver)
+        landed = urldefrag(driver.current_url)[0]
+        record = {
+            "response": response,
+            "url": self._path(landed),
+            "fingerprint": hashlib.sha1(scan["shape"].encode("utf-8")).hexdigest()[:16],
+            "title": scan["title"],
+            "elements": scan["elements"],
+            "links": [self._path(link) for link in scan["links"]],
+            "targets": [],
+        }
+        if self._add_state(landed, depth, record) is None:
+            return
+        logger.info(f"[{depth}] {landed} ({len(scan['links'])} links, {len(scan['clicks'])} clicks)")
+        if depth < self.max_depth:
+            for link in scan["links"]:
+                self._enqueue(link, depth + 1)
+            for selector in scan["clicks"]:
+                if time.monotonic() >= self._deadline:
+                    with self._lock:
+                        self.stats["skipped"] += 1
+                    break
+                with self._lock:
+                    if (record["fingerprint"], selector) in self._followed:
+                        continue
+                    self._followed.add((record["fingerprint"], selector))
+                target = self._follow(driver, landed, selector)
+                if target:
+                    record["targets"].append(self._path(target))
+                    self._enqueue(target, depth + 1)
+        with self._lock:
+            self.pages[key] = record
+
+    def _add_state(self, url: str, depth: int, record: dict, reused: bool = False):
+        """Register a state unless an identical one (URL and DOM fingerprint) was seen; return it or None."""
+        with self._lock:
+            if (url, record["fingerprint"]) in self._seen_states:
+                self.stats["duplicates"] += 1
+                return None
+            self._seen_states.add((url, record["fingerprint"]))
+            self._seen_urls.add(url)
+            self.stats["reused" if reused else "visited"] += 1
+            state = PageState(url, depth, record["fingerprint"], record["title"], record["elements"], reused)
+            self.states.append(state)
+            return state
+
+    def _path(self, url: str) -> str:
+        parts = urlsplit(url)
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def _absolute(self, path: str) -> str:
+        return urljoin(self.start_url, path)
+
+    def _response_hash(self, url: str):
+        """Hash of the server response for the page and the scripts it loads, or None if it cannot be fetched."""
+        try:
+            with urlopen(url, timeout=10) as response:
+                body = response.read()
+        except (URLError, OSError, ValueError):
+            return None
+        digest = hashlib.sha256(body)
+        for src in self.SCRIPT_SRC.findall(body.decode("utf-8", "replace")):
+            script_url = urljoin(url, src)
+            if urlsplit(script_url).netloc != urlsplit(url).netloc:
+                continue
+            with self._lock:
+                script_hash = self._script_hashes.get(script_url)
+            if script_hash is None:
+                try:
+                    with urlopen(script_url, timeout=10) as response:
+                        script_hash = hashlib.sha256(response.read()).hexdigest()
+                except (URLError, OSError, ValueError):
+                    return None
+                with self._lock:
+                    self._script_hashes[script_url] = script_hash
+            digest.update(script_hash.encode("ascii"))
+        return digest.hexdigest()
+
+    def _scan(self, driver) -> dict:
+        return driver.execute_script(self.SCAN_SCRIPT, self.SKIP_PATTERN)
+
+    def _follow(self, driver, url: str, selector: str):
+        """Click the element on a fresh load of the page and return the same-origin URL it leads to, if any."""
+        with self._lock:
+            self.stats["clicks"] += 1
+        if urldefrag(driver.current_url)[0] != url:
+            driver.get(url)
+        try:
+            driver.execute_script(self.FILL_FORM_SCRIPT, selector, self.FORM_VALUE)
+            driver.execute_script("var el = document.querySelector(arguments[0]); if (el) { el.click(); }", selector)
+            BasePage(driver).wait_for_network_idle(idle_ms=100, timeout=5)
+        except WebDriverException:
+            return None
+        target = urldefrag(driver.current_url)[0]
+        if target == url or urlsplit(target).netloc != urlsplit(url).netloc:
+            return None
+        return target
+
+
+def login_as(username: str = "standard_user", password: str = "secret_sauce"):
+    """Return a Crawler login callable that signs in through the login page."""
+    def login(driver):
+        login_page = LoginPage(driver)
+        login_page.load()
+        login_page.login(username, password)
+        InventoryPage(driver).wait_for_element(InventoryPage.INVENTORY_LIST)
+    return login
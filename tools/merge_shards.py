@@ -0,0 +1,84 @@
+import argparse
+import os
+import shutil
+import sys
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.duration_scheduling import load_history
+from utils.file_lock import write_json_atomic
+from utils.test_impact import load_map, merge_failed
+
+
+def merge_allure_results(shard_dirs, output_dir):
+    """
+    Copy the allure-results of every shard into one directory.
+    Result and attachment files carry unique UUID names, so a plain copy is a merge.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    copied = 0
+    for shard_dir in shard_dirs:
+        for name in os.listdir(shard_dir):
+            source = os.path.join(shard_dir, name)
+            if os.path.isfile(source):
+                shutil.copy2(source, os.path.join(output_dir, name))
+                copied += 1
+    return copied
+
+
+def merge_durations(history_files, output_file):
+    """
+    Merge the duration files written by the shards (--duration-shard-history) into output_file,
+    which holds the history of the previous runs.
+    Each file only holds the tests its shard ran, so later files simply add or update entries.
+    """
+    merged = load_history(output_file)
+    for history_file in history_files:
+        for key, durations in load_history(history_file).items():
+            merged.setdefault(key, {}).update(durations)
+    write_json_atomic(output_file, merged)
+    return sum(len(durations) for durations in merged.values())
+
+
+def merge_impact_maps(map_files, output_file):
+    """
+    Merge the impact maps written by the shards (--impact-shard-map, utils/test_impact.py)
+    into output_file, which holds the map of the previous runs.
+    Each file only holds the tests its shard recorded, so later files simply add or update entries.
+    Tests a shard ran leave the failed list unless they failed again.
+    """
+    merged = load_map(output_file)
+    for map_file in map_files:
+        shard_map = load_map(map_file)
+        merged.setdefault("tests", {}).update(shard_map.get("tests", {}))
+        merged["failed"] = merge_failed(merged.get("failed", ()), shard_map.get("tests", {}), shard_map.get("failed", ()))
+        if "commit" in shard_map:
+            merged["commit"] = shard_map["commit"]
+    write_json_atomic(output_file, merged)
+    return len(merged.get("tests", {}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge allure results, duration histories and impact maps from test shards.")
+    parser.add_argument("--allure", nargs="*", default=[], help="allure-results directories of the shards")
+    parser.add_argument("--allure-out", default="allure-results", help="Merged allure-results directory")
+    parser.add_argument("--durations", nargs="*", default=[], help="Duration history files of the shards")
+    parser.add_argument("--durations-out", default=".test-durations.json", help="Merged duration history file")
+    parser.add_argument("--impact", nargs="*", default=[], help="Test impact maps of the shards")
+    parser.add_argument("--impact-out", default=".test-impact.json", help="Merged test impact map")
+    args = parser.parse_args()
+
+    if args.allure:
+        copied = merge_allure_results(args.allure, args.allure_out)
+        print(f"Merged {copied} allure files into {args.allure_out}")
+    if args.durations:
+        count = merge_durations(args.durations, args.durations_out)
+        print(f"Duration history {args.durations_out} now holds {count} entries")
+    if args.impact:
+        count = merge_impact_maps(args.impact, args.impact_out)
+        print(f"Test impact map {args.impact_out} now holds {count} tests")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,101 +1,246 @@
 import sys
 import os
+import argparse
+import hashlib
+import json
 import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 
 # Ensure project root is in path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from utils.self_healing_driver import SelfHealingDriver
+from pages.login_page import LoginPage
+from tools.crawler import Crawler, login_as
+from utils import local_app
+from utils.file_lock import write_json_atomic
 
-def generate_tests():
+GENERATED_TEST_PATH = os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_generated.py')
+# Fingerprints of the crawled pages and of every generated test, used to regenerate incrementally.
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_generated.manifest.json')
+
+HEADER = (
+    "import sys\n"
+    "import os\n"
+    "sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))\n"
+    "from urllib.parse import urlsplit\n"
+    "import pytest\n"
+    "import allure\n"
+    "from selenium.webdriver.common.by import By\n"
+    "from pages.login_page import LoginPage\n\n"
+)
+# Generated tests are grouped in classes. Every class logs in once (class_inventory) and
+# reads its page once, so a test costs an assertion, not a login and a page load.
+GROUPS = {
+    "TestGeneratedInventory": (
+        "@allure.feature('Generated Tests')\n"
+        "class TestGeneratedInventory:\n"
+        "    \"\"\"Checks of the inventory page, read once for the whole class.\"\"\"\n\n"
+        "    ITEM_NAME = (By.CSS_SELECTOR, '[data-test=\"inventory-item-name\"]')\n"
+        "    ADD_TO_CART_BUTTON = (By.CSS_SELECTOR, '[data-test^=\"add-to-cart\"]')\n\n"
+        "    @pytest.fixture(scope='class')\n"
+        "    def items(self, class_inventory):\n"
+        "        \"\"\"Name and visibility of every listed item, read in one in-page query.\"\"\"\n"
+        "        rows = class_inventory.read_all(self.ITEM_NAME, ('text', 'visible'))\n"
+        "        return {row['text']: row for row in rows}\n\n"
+        "    @pytest.fixture(scope='class')\n"
+        "    def add_to_cart_buttons(self, class_inventory):\n"
+        "        return class_inventory.read_all(self.ADD_TO_CART_BUTTON, ('visible',))\n\n"
+    ),
+    "TestGeneratedPages": (
+        "@allure.feature('Generated Tests')\n"
+        "class TestGeneratedPages:\n"
+        "    \"\"\"Pages reached by the crawler, opened in one logged-in browser.\"\"\"\n\n"
+        "    @pytest.fixture(autouse=True)\n"
+        "    def setup(self, class_inventory, class_driver):\n"
+        "        self.driver = class_driver\n\n"
+    ),
+}
+FOOTER = (
+    "if __name__ == '__main__':\n"
+    "    pytest.main([__file__])\n"
+)
+
+def crawl(base_url=None, workers=4, max_depth=3, time_budget=120, previous_pages=None):
+    """
+    Explores the application breadth-first with a pool of headless browsers.
+    base_url: application to crawl; 'local' serves the bundled replica (default: LoginPage.URL).
+    previous_pages: pages of the last crawl; those whose server response is unchanged are not reloaded.
+    Returns the Crawler, holding the discovered states and pages.
+    """
+    if base_url == "local":
+        base_url = local_app.start()
+    if base_url:
+        local_app.use_base_url(base_url)
+    print(f"Crawling {LoginPage.URL} with {workers} browsers (depth {max_depth}, budget {time_budget}s)")
+    crawler = Crawler(
+        LoginPage.URL + "inventory.html",
+        workers=workers, max_depth=max_depth, time_budget=time_budget,
+        login=login_as("standard_user", "secret_sauce"), previous_pages=previous_pages,
+    )
+    started = time.monotonic()
+    crawler.crawl()
+    print(f"Crawled {len(crawler.states)} pages in {time.monotonic() - started:.1f}s "
+          f"({', '.join(f'{name}: {count}' for name, count in crawler.stats.items())})")
+    return crawler
+
+def safe_name(text):
+    """Sanitize text for use in a function name."""
+    return "".join(c for c in text if c.isalnum() or c == '_').lower()
+
+def unique_ids(prefix, texts, name=safe_name):
+    """
+    Map every text to the test id prefix + name(text).
+    Texts whose ids collide (e.g. "A-B" and "AB") all get a short hash of the text appended,
+    so the ids do not depend on the order the texts were found in.
+    """
+    texts_by_id = {}
+    for text in texts:
+        texts_by_id.setdefault(prefix + name(text), set()).add(text)
+    ids = {}
+    for test_id, colliding in texts_by_id.items():
+        for text in colliding:
+            ids[text] = test_id if len(colliding) == 1 else f"{test_id}_{fingerprint(text)[:8]}"
+    return ids
+
+def render_tests(states):
+    """
+    Returns the generated tests as (group, test_id, source) tuples, group being the class.
+    Test ids are derived from what a test covers (item name, page path), never from its position,
+    so they stay stable when the site adds, removes or reorders elements.
+    """
+    inventory = next((state for state in states if state.path.startswith("/inventory.html")), None)
+    item_names = [e["text"] for e in inventory.find("inventory-item-name")] if inventory else []
+    add_to_cart_buttons = inventory.find("add-to-cart") if inventory else []
+    pages = [state for state in states if "?" not in state.path]
+
+    print(f"Found {len(pages)} pages.")
+    print(f"Found {len(add_to_cart_buttons)} Add to Cart buttons.")
+    print(f"Found {len(item_names)} Item links.")
+
+    tests = []
+    # Generate test for each item link; all of them assert on the one batched read of the class
+    item_ids = unique_ids("test_item_visibility_", item_names)
+    for item_name in dict.fromkeys(item_names):
+        test_id = item_ids[item_name]
+        tests.append(("TestGeneratedInventory", test_id,
+            f"    @allure.story('Verify Item Visibility')\n"
+            f"    def {test_id}(self, items):\n"
+            f"        \"\"\"Verify that {item_name!r} is displayed.\"\"\"\n"
+            f"        assert {item_name!r} in items\n"
+            f"        assert items[{item_name!r}]['visible']\n\n"))
+
+    # Generate test for cart buttons
+    if add_to_cart_buttons:
+        test_id = "test_add_to_cart_buttons_exist"
+        tests.append(("TestGeneratedInventory", test_id,
+            f"    @allure.story('Verify Add to Cart Buttons')\n"
+            f"    def {test_id}(self, add_to_cart_buttons):\n"
+            f"        \"\"\"Verify that at least one Add to Cart button exists.\"\"\"\n"
+            f"        assert len(add_to_cart_buttons) > 0\n\n"))
+
+    # Generate test for each page the crawler reached
+    page_ids = unique_ids("test_page_reachable_", [state.path for state in pages],
+                          lambda path: safe_name(path.strip('/').replace('.html', '').replace('-', '_')))
+    for state in pages:
+        test_id = page_ids[state.path]
+        tests.append(("TestGeneratedPages", test_id,
+            f"    @allure.story('Verify Page Reachable')\n"
+            f"    def {test_id}(self):\n"
+            f"        \"\"\"Verify that '{state.path}' opens for a logged-in user.\"\"\"\n"
+            f"        self.driver.get(LoginPage.URL + '{state.path.lstrip('/')}')\n"
+            f"        assert urlsplit(self.driver.current_url).path == '{state.path}'\n\n"))
+    return tests
+
+def fingerprint(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+def load_manifest(path=MANIFEST_PATH):
+    """Return the manifest of the last generation, or an empty one."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"pages": {}, "tests": []}
+
+def merge_tests(previous, rendered, complete=True):
+    """
+    Merges freshly rendered tests into the entries of the previous manifest.
+    Unchanged tests keep their position, changed ones are updated in place and new ones are
+    appended. Tests that were not rendered again are removed only after a complete crawl.
+    Returns the merged entries and the number of added, updated, removed and unchanged tests.
+    """
+    fresh = {test_id: (group, source) for group, test_id, source in rendered}
+    counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+    merged = []
+    for entry in previous:
+        group, source = fresh.pop(entry["id"], (None, None))
+        if source is None:
+            if complete:
+                counts["removed"] += 1
+                continue
+            merged.append(entry)
+            counts["unchanged"] += 1
+        elif fingerprint(source) == entry["fingerprint"] and group == entry.get("group"):
+            merged.append(entry)
+            counts["unchanged"] += 1
+        else:
+            merged.append({"group": group, "id": entry["id"], "fingerprint": fingerprint(source), "source": source})
+            counts["updated"] += 1
+    for group, test_id, source in rendered:
+        if fresh.pop(test_id, None) is not None:
+            merged.append({"group": group, "id": test_id, "fingerprint": fingerprint(source), "source": source})
+            counts["added"] += 1
+    return merged, counts
+
+def write_tests(tests, generated_test_path=GENERATED_TEST_PATH):
+    """
+    Writes the test file from manifest entries.
+    The file is left untouched when its content would not change, so pytest caches stay valid.
+    Returns True if the file was written.
+    """
+    content = HEADER
+    for group, header in GROUPS.items():
+        sources = [entry["source"] for entry in tests if entry.get("group") == group]
+        if sources:
+            content += header + "".join(sources)
+    content += FOOTER
+    try:
+        with open(generated_test_path) as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    with open(generated_test_path, "w") as f:
+        f.write(content)
+    return True
+
+def generate_tests(base_url=None, workers=4, max_depth=3, time_budget=120, full=False):
     """
-    Crawls the application and generates a test file.
+    Crawls the application and updates the generated test file incrementally.
+    base_url: application to crawl; 'local' serves the bundled replica (default: LoginPage.URL).
+    full: ignore the manifest, reload every page in the browser and rewrite every test.
     """
     print("Starting Test Generator...")
-    
-    # Setup Driver
-    service = ChromeService(ChromeDriverManager().install())
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless") # Run headless for generation
-    options.add_argument("--disable-gpu")
-    original_driver = webdriver.Chrome(service=service, options=options)
-    driver = SelfHealingDriver(original_driver)
-    
-    generated_test_path = os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_generated.py')
-    
+    manifest = {"pages": {}, "tests": []} if full else load_manifest()
     try:
-        # 1. Login
-        print("Navigating to Login Page...")
-        driver.get("https://www.saucedemo.com/")
-        
-        driver.find_element((By.ID, "user-name")).send_keys("standard_user")
-        driver.find_element((By.ID, "password")).send_keys("secret_sauce")
-        driver.find_element((By.ID, "login-button")).click()
-        
-        print("Login successful. Scanning Inventory Page...")
-        time.sleep(2) # Wait for load
-        
-        # 2. Scan for elements
-        # Find all "Add to cart" buttons
-        add_to_cart_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Add to cart')]")
-        # Find all Item links
-        item_links = driver.find_elements(By.CLASS_NAME, "inventory_item_name")
-        
-        print(f"Found {len(add_to_cart_buttons)} Add to Cart buttons.")
-        print(f"Found {len(item_links)} Item links.")
-        
-        # 3. Generate Test File
-        with open(generated_test_path, "w") as f:
-            f.write("import sys\n")
-            f.write("import os\n")
-            f.write("sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))\n")
-            f.write("import pytest\n")
-            f.write("import allure\n")
-            f.write("from selenium.webdriver.common.by import By\n")
-            f.write("from pages.login_page import LoginPage\n\n")
-            
-            f.write("@allure.feature('Generated Tests')\n")
-            f.write("class TestGenerated:\n\n")
-            
-            f.write("    @pytest.fixture(autouse=True)\n")
-            f.write("    def setup(self, driver):\n")
-            f.write("        self.login_page = LoginPage(driver)\n")
-            f.write("        self.login_page.load()\n")
-            f.write("        self.login_page.login('standard_user', 'secret_sauce')\n\n")
-            
-            # Generate test for each item link
-            for i, link in enumerate(item_links):
-                item_name = link.text
-                # Sanitize name for function name
-                safe_name = "".join(c for c in item_name if c.isalnum() or c == '_').lower()
-                
-                f.write(f"    @allure.story('Verify Item Visibility')\n")
-                f.write(f"    def test_item_visibility_{safe_name}_{i}(self, driver):\n")
-                f.write(f"        \"\"\"Verify that '{item_name}' is displayed.\"\"\"\n")
-                f.write(f"        item = driver.find_element(By.XPATH, \"//div[text()='{item_name}']\")\n")
-                f.write(f"        assert item.is_displayed()\n\n")
-
-            # Generate test for cart buttons
-            if add_to_cart_buttons:
-                 f.write(f"    @allure.story('Verify Add to Cart Buttons')\n")
-                 f.write(f"    def test_add_to_cart_buttons_exist(self, driver):\n")
-                 f.write(f"        \"\"\"Verify that at least one Add to Cart button exists.\"\"\"\n")
-                 f.write(f"        buttons = driver.find_elements(By.XPATH, \"//button[contains(text(), 'Add to cart')]\")\n")
-                 f.write(f"        assert len(buttons) > 0\n\n")
-
-            f.write("if __name__ == '__main__':\n")
-            f.write("    pytest.main([__file__])\n")
-            
-        print(f"Test file generated at: {generated_test_path}")
-        
+        crawler = crawl(base_url, workers, max_depth, time_budget, previous_pages=manifest["pages"])
+        tests, counts = merge_tests(manifest["tests"], render_tests(crawler.states), crawler.complete)
+        written = write_tests(tests)
+        # Pages the crawl did not reach this time are kept for the next incremental run.
+        pages = dict(manifest["pages"], **crawler.pages)
+        write_json_atomic(MANIFEST_PATH, {"pages": pages, "tests": tests})
+        print(", ".join(f"{name}: {count}" for name, count in counts.items()) + " tests")
+        print(f"Test file {'generated' if written else 'unchanged'} at: {GENERATED_TEST_PATH}")
     except Exception as e:
         print(f"Error during generation: {e}")
     finally:
-        driver.quit()
+        local_app.stop()
 
 if __name__ == "__main__":
-    generate_tests()
+    parser = argparse.ArgumentParser(description="Generate tests by crawling the application.")
+    parser.add_argument("--base-url", default=None, help="Application URL, or 'local' for the bundled replica")
+    parser.add_argument("--workers", type=int, default=4, help="Number of headless browsers crawling in parallel")
+    parser.add_argument("--max-depth", type=int, default=3, help="Number of link or click steps explored from the inventory")
+    parser.add_argument("--time-budget", type=float, default=120, help="Seconds after which no new page is crawled")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and regenerate everything")
+    args = parser.parse_args()
+    generate_tests(args.base_url, args.workers, args.max_depth, args.time_budget, args.full)
@@ -0,0 +1,280 @@
+"""
+asyncio WebDriver client: many browser sessions driven from one event loop.
+
+Speaks the W3C WebDriver protocol over HTTP/1.1 keep-alive connections built on
+asyncio streams, so no third-party HTTP client is needed. Sessions talking to the same
+endpoint (a chromedriver, a Selenium Grid) share one ConnectionPool per event loop,
+which caps the open connections and reuses them between commands.
+
+    async def main():
+        capabilities = browser_options("chrome", "fast").to_capabilities()
+        drivers = await asyncio.gather(*(AsyncWebDriver.start(url, capabilities) for _ in range(20)))
+
+Errors are raised as the same selenium exceptions the synchronous driver raises.
+AsyncWebDriver.attach() wraps the session of an existing synchronous driver, and
+run_sync() runs a coroutine from synchronous code (see pages/aio/sync.py).
+"""
+import asyncio
+import json
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+# Key of element references in W3C payloads.
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+DEFAULT_POOL_SIZE = 32
+
+_pools = weakref.WeakKeyDictionary()
+_error_handler = ErrorHandler()
+
+
+class ConnectionPool:
+    """Keep-alive HTTP connections to one WebDriver endpoint, shared by every session on it."""
+
+    def __init__(self, url: str, size: int = DEFAULT_POOL_SIZE):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.size = size
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+        self.stats = {"requests": 0, "connections": 0}
+
+    async def request(self, method: str, path: str, payload=None) -> tuple:
+        """Send one request; return the HTTP status and the decoded JSON body."""
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        async with self._slots:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await self._open()
+            try:
+                status, data, keep_alive = await self._exchange(connection, method, path, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if not reused:
+                    raise
+                # The server closed the idle connection; send the request on a fresh one.
+                connection = await self._open()
+                status, data, keep_alive = await self._exchange(connection, method, path, body)
+            if keep_alive:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+        self.stats["requests"] += 1
+        return status, data
+
+    async def _open(self) -> tuple:
+        self.stats["connections"] += 1
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def _exchange(self, connection: tuple, method: str, path: str, body: bytes) -> tuple:
+        reader, writer = connection
+        head = (
+            f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            "Accept: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by the WebDriver server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return status, data.decode("utf-8"), keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader) -> bytes:
+        data = b""
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                return data
+            data += await reader.readexactly(size)
+            await reader.readline()
+
+    def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+
+def shared_pool(url: str) -> ConnectionPool:
+    """The connection pool for url on the running event loop."""
+    pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    if url not in pools:
+        pools[url] = ConnectionPool(url)
+    return pools[url]
+
+
+class AsyncWebElement:
+    """Reference to an element in one session."""
+
+    def __init__(self, driver: "AsyncWebDriver", element_id: str):
+        self.driver = driver
+        self.id = element_id
+
+    async def _execute(self, method: str, command: str, payload=None):
+        return await self.driver.execute(method, f"/element/{self.id}{command}", payload)
+
+    async def click(self):
+        await self._execute("POST", "/click", {})
+
+    async def clear(self):
+        await self._execute("POST", "/clear", {})
+
+    async def send_keys(self, text: str):
+        await self._execute("POST", "/value", {"text": str(text)})
+
+    async def text(self) -> str:
+        return await self._execute("GET", "/text")
+
+    async def get_attribute(self, name: str):
+        return await self._execute("GET", f"/attribute/{name}")
+
+    async def find_element(self, by: str, value: str) -> "AsyncWebElement":
+        return self.driver._element(await self._execute("POST", "/element", _w3c_locator(by, value)))
+
+
+class AsyncWebDriver:
+    """One WebDriver session, driven with coroutines."""
+
+    def __init__(self, url: str, session_id: str, owns_session: bool = True, pool: ConnectionPool = None):
+        """
+        url: WebDriver endpoint; session_id: an existing session on it.
+        pool: connections to use; default: the pool shared by all sessions on url in the running loop.
+        """
+        self.url = url
+        self.session_id = session_id
+        self.owns_session = owns_session
+        self._pool = pool
+
+    @property
+    def pool(self) -> ConnectionPool:
+        return self._pool or shared_pool(self.url)
+
+    @classmethod
+    async def start(cls, url: str, capabilities: dict, pool: ConnectionPool = None) -> "AsyncWebDriver":
+        """Create a new session on the WebDriver endpoint at url."""
+        status, data = await (pool or shared_pool(url)).request(
+            "POST", "/session", {"capabilities": {"alwaysMatch": capabilities}}
+        )
+        return cls(url, _check(status, data)["sessionId"], pool=pool)
+
+    @classmethod
+    def attach(cls, driver) -> "AsyncWebDriver":
+        """Drive the session of a synchronous selenium WebDriver; quit() leaves it open."""
+        service = getattr(driver, "service", None)
+        url = service.service_url if service is not None else driver.command_executor._client_config.remote_server_addr
+        return cls(url, driver.session_id, owns_session=False)
+
+    async def execute(self, method: str, command: str, payload=None):
+        status, data = await self.pool.request(method, f"/session/{self.session_id}{command}", payload)
+        return _check(status, data)
+
+    def _element(self, value) -> AsyncWebElement:
+        return AsyncWebElement(self, value[ELEMENT_KEY])
+
+    def _wrap(self, value):
+        if isinstance(value, list):
+            return [self._wrap(v) for v in value]
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return self._element(value)
+            return {k: self._wrap(v) for k, v in value.items()}
+        return value
+
+    @staticmethod
+    def _unwrap(value):
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [AsyncWebDriver._unwrap(v) for v in value]
+        return value
+
+    async def get(self, url: str):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def current_url(self) -> str:
+        return await self.execute("GET", "/url")
+
+    async def title(self) -> str:
+        return await self.execute("GET", "/title")
+
+    async def find_element(self, by: str, value: str) -> AsyncWebElement:
+        return self._element(await self.execute("POST", "/element", _w3c_locator(by, value)))
+
+    async def find_elements(self, by: str, value: str) -> list:
+        return [self._element(v) for v in await self.execute("POST", "/elements", _w3c_locator(by, value))]
+
+    async def execute_script(self, script: str, *args):
+        result = await self.execute("POST", "/execute/sync", {"script": script, "args": self._unwrap(args)})
+        return self._wrap(result)
+
+    async def execute_async_script(self, script: str, *args):
+        result = await self.execute("POST", "/execute/async", {"script": script, "args": self._unwrap(args)})
+        return self._wrap(result)
+
+    async def quit(self):
+        """End the session, unless it belongs to a synchronous driver (see attach)."""
+        if self.owns_session:
+            await self.execute("DELETE", "")
+
+
+def _w3c_locator(by: str, value: str) -> dict:
+    """Translate Selenium's legacy strategies to the ones the W3C protocol knows, as Selenium does."""
+    if by == "id":
+        by, value = "css selector", f'[id="{value}"]'
+    elif by == "name":
+        by, value = "css selector", f'[name="{value}"]'
+    elif by == "class name":
+        by, value = "css selector", f".{value}"
+    elif by == "tag name":
+        by = "css selector"
+    return {"using": by, "value": value}
+
+
+def _check(status: int, data: str):
+    """Return the value of a response, or raise the matching selenium exception."""
+    if status >= 400:
+        _error_handler.check_response({"status": status, "value": data})
+        raise WebDriverException(f"HTTP {status}: {data[:200]}")
+    return json.loads(data).get("value") if data else None
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def run_sync(coroutine):
+    """
+    Run a coroutine from synchronous code and return its result.
+    All such calls share one event loop in a daemon thread, so connection pools are reused.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="async-webdriver", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coroutine, _loop).result()
@@ -0,0 +1,306 @@
+"""
+Isolated browser contexts: several tests share one browser process.
+
+With --driver-contexts=M the driver fixture no longer starts a browser per test. Each
+test gets a fresh CDP browser context (Target.createBrowserContext): its own cookies,
+storage and cache, like an incognito window, disposed when the test ends. Creating a
+context takes milliseconds and costs a renderer, not a browser process.
+
+Packing: under pytest-xdist the controller starts one browser for every M workers and
+each worker attaches its own WebDriver session to it (utils/driver_factory.attach_driver),
+so M tests run concurrently in one process. Without xdist the single browser serves one
+context at a time. Chrome and Edge only; Firefox keeps a browser per test.
+
+Network policies work as with a browser per test: the performance log they read belongs
+to the WebDriver session, so each session is started with it when the run uses policies.
+When the shared browser dies, the session is dropped; the next test attaches again, or
+starts a browser of its own if the shared one is gone for good.
+
+The terminal summary shows tests and throughput per browser, the browser's peak resident
+memory (Linux) and the JS heap and DOM size measured in every context before disposal.
+"""
+import os
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from utils import report_properties
+from utils.driver_factory import attach_driver, create_driver
+
+SUPPORTED_BROWSERS = ("chrome", "edge")
+MB = 1024 * 1024
+
+_config = None
+_hosts = {}
+_session = None
+
+
+class ContextSession:
+    """
+    One WebDriver session on a shared browser that opens a fresh browser context per test.
+    The session keeps a home tab in the default context to issue browser-level commands from.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._home_target, self.home = self._create_window()
+        self._context = None
+        self.opened = 0
+        # Index of the browser among the run's shared browsers (see _new_session).
+        self.host = 0
+        driver.switch_to.window(self.home)
+
+    def _cdp(self, command: str, params: dict = None) -> dict:
+        return self.driver.execute_cdp_cmd(command, params or {})
+
+    def _create_window(self, context_id: str = None) -> tuple:
+        """Open a blank tab, in the given context or the default one; return its target id and window handle."""
+        params = {"url": "about:blank"}
+        if context_id:
+            params["browserContextId"] = context_id
+        target_id = self._cdp("Target.createTarget", params)["targetId"]
+        # chromedriver names window handles after the DevTools target id.
+        for handle in self.driver.window_handles:
+            if handle.endswith(target_id):
+                return target_id, handle
+        raise WebDriverException(f"No window handle for target {target_id}")
+
+    def open(self):
+        """Switch the driver into a new, empty browser context and return it."""
+        self._context = self._cdp("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+        self.driver.switch_to.window(self._create_window(self._context)[1])
+        self._cdp("Performance.enable")
+        self.opened += 1
+        return self.driver
+
+    def close(self) -> dict:
+        """Dispose the current context with all its windows; return its JS heap (MB) and DOM node count."""
+        metrics = {}
+        try:
+            values = {m["name"]: m["value"] for m in self._cdp("Performance.getMetrics")["metrics"]}
+            metrics = {"heap_mb": round(values.get("JSHeapUsedSize", 0) / MB, 2), "nodes": int(values.get("Nodes", 0))}
+        except WebDriverException:
+            pass
+        self.driver.switch_to.window(self.home)
+        self._cdp("Target.disposeBrowserContext", {"browserContextId": self._context})
+        self._context = None
+        return metrics
+
+    def quit(self):
+        try:
+            self._cdp("Target.closeTarget", {"targetId": self._home_target})
+        except WebDriverException:
+            pass
+        # An attached session only disconnects; the browser belongs to whoever started it.
+        self.driver.quit()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("browser contexts")
+    group.addoption(
+        "--driver-contexts", action="store", type=int, default=0, metavar="M",
+        help="Run every test in an isolated browser context, packing M concurrent tests "
+             "(pytest-xdist workers) into one browser process; Chrome and Edge only"
+    )
+
+
+def is_active(config) -> bool:
+    return config.getoption("--driver-contexts") > 0
+
+
+def pytest_configure(config):
+    global _config
+    _config = config
+    config._browser_contexts = {}
+    if not is_active(config):
+        return
+    browser = config.getoption("--driver-browser")
+    if browser not in SUPPORTED_BROWSERS:
+        raise pytest.UsageError(f"--driver-contexts needs a Chromium browser, not {browser}")
+    if config.getoption("--driver-reuse"):
+        raise pytest.UsageError("--driver-contexts and --driver-reuse cannot be combined")
+
+
+def _start_host(config, index, performance_log: bool = False) -> str:
+    """Start browser number index, if not running yet, and return its DevTools address."""
+    if index not in _hosts:
+        browser = config.getoption("--driver-browser")
+        driver = create_driver(browser, config.getoption("--driver-profile"), performance_log=performance_log)
+        _hosts[index] = driver
+        config._browser_contexts.setdefault(
+            index, {"tests": 0, "workers": 0, "peak_rss": 0, "first": None, "last": None}
+        )
+    driver = _hosts[index]
+    key = "goog:chromeOptions" if config.getoption("--driver-browser") == "chrome" else "ms:edgeOptions"
+    return driver.capabilities[key]["debuggerAddress"]
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    config = node.config
+    if not is_active(config):
+        return
+    # Workers gw0..gw(M-1) share browser 0, the next M browser 1, and so on.
+    index = int(node.gateway.id.lstrip("gw") or 0) // config.getoption("--driver-contexts")
+    address = _start_host(config, index)
+    config._browser_contexts[index]["workers"] += 1
+    node.workerinput["browser_context_host"] = [index, address]
+
+
+def acquire(config):
+    """Return a driver switched into a fresh browser context of this process's shared browser."""
+    global _session
+    for attempt in range(2):
+        if _session is None:
+            _session = _new_session(config)
+        try:
+            return _session.open()
+        except Exception:
+            # The browser or its driver died; the next attempt starts over.
+            _drop_session()
+            if attempt:
+                raise
+
+
+def _new_session(config) -> ContextSession:
+    """
+    Start this process's session: attached to the shared browser under xdist, or on a browser
+    of its own without xdist or when the shared browser is gone.
+    """
+    # Imported lazily: the module is also a plugin (see pytest_plugins) and must be registered first.
+    from utils import network_policy
+    performance_log = network_policy.is_active(config)
+    if hasattr(config, "workerinput"):
+        index, address = config.workerinput["browser_context_host"]
+        driver = None
+        try:
+            driver = attach_driver(config.getoption("--driver-browser"), address, performance_log)
+            session = ContextSession(driver)
+        except Exception:
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+        else:
+            session.host = index
+            return session
+    # A worker's own browser is not one of the controller's, so its tests are not counted per browser.
+    index = "private" if hasattr(config, "workerinput") else 0
+    _start_host(config, index, performance_log)
+    config._browser_contexts[index]["workers"] = 1
+    session = ContextSession(_hosts[index])
+    session.host = index
+    return session
+
+
+def _drop_session():
+    """Forget the session and, if this process started its browser, the browser too."""
+    global _session
+    session, _session = _session, None
+    for index, host in list(_hosts.items()):
+        if session is not None and host is session.driver:
+            del _hosts[index]
+    try:
+        if session is not None:
+            session.driver.quit()
+    except Exception:
+        pass
+
+
+def release(driver, item=None):
+    """Dispose the driver's current context; its measurements go to the report of item, if given."""
+    try:
+        metrics = _session.close()
+    except Exception:
+        # Nothing is left to dispose of in a dead browser; the next acquire() starts a new session.
+        _drop_session()
+        return
+    if item is not None:
+        item.user_properties.append(("browser_context", dict(metrics, host=_session.host)))
+
+
+def _tree_rss(pid: int) -> int:
+    """Resident memory in bytes of a process and all its descendants; 0 where /proc is unavailable."""
+    try:
+        entries = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return 0
+    children, rss = {}, {}
+    for entry in entries:
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Fields after "pid (comm) ": state, ppid, ... rss (in pages) is the 22nd.
+        fields = stat[stat.rindex(")") + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss[int(entry)] = int(fields[21])
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total * os.sysconf("SC_PAGE_SIZE")
+
+
+def pytest_runtest_logreport(report):
+    value = report_properties.value(report, "browser_context")
+    if value is None or _config is None:
+        return
+    stats = _config._browser_contexts.get(value["host"])
+    if stats is None:
+        return
+    now = time.monotonic()
+    stats["tests"] += 1
+    stats["first"] = stats["first"] or now - report.duration
+    stats["last"] = now
+    stats.setdefault("heap_mb", []).append(value.get("heap_mb", 0))
+    stats.setdefault("nodes", []).append(value.get("nodes", 0))
+    host = _hosts.get(value["host"])
+    service = getattr(host, "service", None)
+    if service is not None and service.process is not None:
+        stats["peak_rss"] = max(stats["peak_rss"], _tree_rss(service.process.pid))
+
+
+def pytest_unconfigure(config):
+    global _session
+    session, _session = _session, None
+    if session is not None:
+        # Disconnects from a shared browser, or quits the browser this process started.
+        try:
+            session.quit()
+        except Exception:
+            pass
+    for index in list(_hosts):
+        driver = _hosts.pop(index)
+        if session is not None and driver is session.driver:
+            continue
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    hosts = getattr(config, "_browser_contexts", None)
+    if not hosts:
+        return
+    terminalreporter.section("browser contexts")
+    for index, stats in sorted(hosts.items()):
+        if not stats["tests"]:
+            continue
+        minutes = max(stats["last"] - stats["first"], 1e-6) / 60
+        line = (f"browser {index}: {stats['tests']} tests, {stats['workers']} at a time, "
+                f"{stats['tests'] / minutes:.1f} tests/min")
+        if stats["peak_rss"]:
+            line += (f", peak {stats['peak_rss'] / MB:.0f} MB resident "
+                     f"({stats['peak_rss'] / MB / max(stats['workers'], 1):.0f} MB per concurrent context)")
+        terminalreporter.write_line(line)
+        heap, nodes = stats["heap_mb"], stats["nodes"]
+        terminalreporter.write_line(
+            f"    per context: JS heap mean {sum(heap) / len(heap):.1f} MB, max {max(heap):.1f} MB; "
+            f"DOM nodes mean {sum(nodes) / len(nodes):.0f}"
+        )
@@ -0,0 +1,84 @@
+"""
+Browser launch presets selected with --driver-profile.
+
+- default: a headed browser with everything enabled, maximized after start.
+- fast: new headless mode, images blocked, fixed window size, no background
+  networking, extensions or GPU, and page-load strategy "eager" (commands return
+  once the DOM is ready instead of waiting for every subresource).
+
+Timings depend heavily on the profile, so the profile is part of the report
+metadata and of the duration history key.
+"""
+
+DEFAULT_PROFILE = "default"
+PROFILES = {
+    "default": "headed, maximized, images enabled",
+    "fast": "headless, images blocked, fixed window size, eager page loads",
+}
+WINDOW_SIZE = (1920, 1080)
+
+CHROMIUM_FAST_ARGUMENTS = [
+    "--headless=new",
+    f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--no-first-run",
+    "--mute-audio",
+]
+
+FIREFOX_FAST_PREFERENCES = {
+    # 2 = block images
+    "permissions.default.image": 2,
+    "app.update.auto": False,
+    "browser.safebrowsing.downloads.remote.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "extensions.update.enabled": False,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "toolkit.telemetry.enabled": False,
+}
+
+
+def validate(profile: str) -> str:
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown driver profile: {profile}. Choose from: {', '.join(PROFILES)}")
+    return profile
+
+
+def apply_chromium(options, profile: str):
+    """Apply the profile to ChromeOptions or EdgeOptions."""
+    if validate(profile) != "fast":
+        return options
+    for argument in CHROMIUM_FAST_ARGUMENTS:
+        options.add_argument(argument)
+    prefs = dict(options.experimental_options.get("prefs", {}))
+    prefs["profile.managed_default_content_settings.images"] = 2
+    options.add_experimental_option("prefs", prefs)
+    options.page_load_strategy = "eager"
+    return options
+
+
+def apply_firefox(options, profile: str):
+    """Apply the profile to FirefoxOptions."""
+    if validate(profile) != "fast":
+        return options
+    options.add_argument("-headless")
+    options.add_argument(f"--width={WINDOW_SIZE[0]}")
+    options.add_argument(f"--height={WINDOW_SIZE[1]}")
+    for name, value in FIREFOX_FAST_PREFERENCES.items():
+        options.set_preference(name, value)
+    options.page_load_strategy = "eager"
+    return options
+
+
+def prepare_window(driver, profile: str):
+    """Size the window after start. Headless profiles already got a fixed size at launch."""
+    if profile == DEFAULT_PROFILE:
+        driver.maximize_window()
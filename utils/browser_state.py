@@ -0,0 +1,69 @@
+import time
+from urllib.parse import urlsplit
+
+
+class BrowserState:
+    """
+    Snapshot of the client-side state of one origin: cookies, localStorage and sessionStorage.
+    A snapshot can be restored into any clean browser to skip the UI steps that produced it.
+    """
+
+    CAPTURE_SCRIPT = """
+        return {
+            local: Object.assign({}, window.localStorage),
+            session: Object.assign({}, window.sessionStorage)
+        };
+    """
+
+    RESTORE_SCRIPT = """
+        var state = arguments[0];
+        window.localStorage.clear();
+        window.sessionStorage.clear();
+        Object.keys(state.local).forEach(function (k) { window.localStorage.setItem(k, state.local[k]); });
+        Object.keys(state.session).forEach(function (k) { window.sessionStorage.setItem(k, state.session[k]); });
+    """
+
+    # Cookie fields accepted by WebDriver's add_cookie.
+    COOKIE_FIELDS = ("name", "value", "path", "secure", "httpOnly", "expiry", "sameSite")
+
+    def __init__(self, url: str, cookies: list, local_storage: dict, session_storage: dict):
+        self.url = url
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.captured_at = time.time()
+
+    @property
+    def origin(self) -> str:
+        parts = urlsplit(self.url)
+        return f"{parts.scheme}://{parts.netloc}/"
+
+    @classmethod
+    def capture(cls, driver) -> "BrowserState":
+        """Capture the state of the page the driver is currently on."""
+        storage = driver.execute_script(cls.CAPTURE_SCRIPT)
+        return cls(driver.current_url, driver.get_cookies(), storage["local"], storage["session"])
+
+    def is_expired(self) -> bool:
+        """Return True when any captured cookie has passed its expiry time."""
+        now = time.time()
+        return any(cookie.get("expiry") and cookie["expiry"] <= now for cookie in self.cookies)
+
+    def apply(self, driver, local_storage: dict = None):
+        """
+        Write the captured cookies and storage into the browser.
+        local_storage entries are written on top of the captured ones; a None value removes the key.
+        Cookies and storage are scoped to the origin, so the browser is moved onto it first if needed.
+        """
+        if not driver.current_url.startswith(self.origin):
+            driver.get(self.origin)
+        driver.delete_all_cookies()
+        for cookie in self.cookies:
+            driver.add_cookie({k: v for k, v in cookie.items() if k in self.COOKIE_FIELDS})
+        local = {k: v for k, v in dict(self.local_storage, **(local_storage or {})).items() if v is not None}
+        driver.execute_script(self.RESTORE_SCRIPT, {"local": local, "session": self.session_storage})
+
+    def restore(self, driver, url: str = None, local_storage: dict = None):
+        """Apply the state (plus local_storage overrides) and load the given URL, or the URL it was captured on."""
+        self.apply(driver, local_storage)
+        driver.get(url or self.url)
@@ -0,0 +1,146 @@
+"""
+WebDriver command profile per test, with optional budgets.
+
+--command-profile reports the commands and round-trip time of every test.
+--command-budget N / --roundtrip-budget S fail the run when a test issues more than
+N commands or spends more than S seconds in command round trips (and imply profiling),
+so regressions in command count are caught in CI.
+--command-flame FILE writes the run's folded stacks (test;page method;...;command with
+round-trip microseconds as weight) for flamegraph.pl or speedscope.
+"""
+import pytest
+
+from utils import command_profiler, report_properties
+
+_config = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("webdriver command profile")
+    group.addoption(
+        "--command-profile", action="store_true", default=False,
+        help="Count and time every WebDriver command per test"
+    )
+    group.addoption(
+        "--command-budget", action="store", type=int, default=None,
+        help="Fail the run if any test issues more than this many WebDriver commands"
+    )
+    group.addoption(
+        "--roundtrip-budget", action="store", type=float, default=None,
+        help="Fail the run if any test spends more than this many seconds in WebDriver round trips"
+    )
+    group.addoption(
+        "--command-flame", action="store", default=None,
+        help="Write folded command stacks of the run to this file (flame graph input)"
+    )
+
+
+def _enabled(config) -> bool:
+    return bool(
+        config.getoption("--command-profile")
+        or config.getoption("--command-budget") is not None
+        or config.getoption("--roundtrip-budget") is not None
+        or config.getoption("--command-flame")
+    )
+
+
+def pytest_configure(config):
+    global _config
+    _config = config
+    config._command_profiles = {}
+    if _enabled(config):
+        command_profiler.enable(str(config.rootpath))
+
+
+def pytest_unconfigure(config):
+    command_profiler.disable()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    profiler = command_profiler.get_profiler()
+    if profiler is not None:
+        profiler.start_test()
+    yield
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_makereport(item, call):
+    # The teardown report is created last, so it carries the profile of the whole test.
+    profiler = command_profiler.get_profiler()
+    if call.when == "teardown" and profiler is not None:
+        profile = profiler.finish_test()
+        if profile and profile["count"]:
+            item.user_properties.append(("webdriver_commands", profile))
+
+
+def pytest_runtest_logreport(report):
+    if _config is not None:
+        report_properties.collect(report, "webdriver_commands", _config._command_profiles)
+
+
+def _over_budget(config) -> dict:
+    commands = config.getoption("--command-budget")
+    seconds = config.getoption("--roundtrip-budget")
+    over = {}
+    for nodeid, profile in config._command_profiles.items():
+        reasons = []
+        if commands is not None and profile["count"] > commands:
+            reasons.append(f"{profile['count']} commands > {commands}")
+        if seconds is not None and profile["seconds"] > seconds:
+            reasons.append(f"{profile['seconds']:.2f}s round trips > {seconds:.2f}s")
+        if reasons:
+            over[nodeid] = reasons
+    return over
+
+
+def write_folded(profiles: dict, path: str):
+    """Merge the per-test folded stacks into one file: 'frame;frame;command weight' per line."""
+    stacks = {}
+    for profile in profiles.values():
+        for stack, (count, seconds) in profile["stacks"].items():
+            stacks[stack] = stacks.get(stack, 0) + seconds
+    with open(path, "w") as f:
+        for stack, seconds in sorted(stacks.items()):
+            f.write(f"{stack} {max(1, round(seconds * 1_000_000))}\n")
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, "workerinput"):
+        return
+    flame = config.getoption("--command-flame")
+    if flame and config._command_profiles:
+        write_folded(config._command_profiles, flame)
+    if _over_budget(config) and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    profiles = config._command_profiles
+    if not profiles:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section("webdriver commands")
+    for nodeid, profile in sorted(profiles.items(), key=lambda kv: -kv[1]["count"])[:15]:
+        write(f"{profile['count']:6d} commands {profile['seconds']:8.2f}s  {nodeid}")
+    totals = {}
+    for profile in profiles.values():
+        for command, (count, seconds) in profile["commands"].items():
+            total = totals.setdefault(command, [0, 0.0])
+            total[0] += count
+            total[1] += seconds
+    write("by command:")
+    for command, (count, seconds) in sorted(totals.items(), key=lambda kv: -kv[1][0])[:15]:
+        write(f"{count:6d} x {seconds:8.2f}s  {command}")
+    count = sum(p["count"] for p in profiles.values())
+    seconds = sum(p["seconds"] for p in profiles.values())
+    write(f"{count:6d} commands {seconds:8.2f}s  in {len(profiles)} tests")
+    flame = config.getoption("--command-flame")
+    if flame:
+        write(f"folded stacks written to {flame}")
+    over = _over_budget(config)
+    for nodeid, reasons in over.items():
+        write(f"over budget: {nodeid}: {', '.join(reasons)}", red=True)
+    if over:
+        write(f"{len(over)} test(s) exceeded the WebDriver command budget", red=True, bold=True)
@@ -0,0 +1,113 @@
+"""
+Counts and times every WebDriver wire command (findElement, getElementText, executeScript, ...).
+
+The driver fixture wraps each driver's command executor (the RemoteConnection) in a
+ProfilingExecutor while profiling is enabled by the utils/command_budget.py plugin.
+Commands are attributed to the running test and to the project call stack that issued
+them (test -> page object method -> command), which gives a flame-style aggregate.
+"""
+import os
+import sys
+import threading
+import time
+
+# Frames from these files are plumbing, not callers worth showing in a stack.
+_SKIPPED_FILES = (
+    os.path.abspath(__file__),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "instrumentation.py"),
+)
+MAX_STACK_DEPTH = 12
+
+_profiler = None
+
+
+class CommandProfiler:
+    """Accumulates command counts and round-trip times for the running test."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root) + os.sep
+        self._lock = threading.Lock()
+        self._profile = None
+
+    def start_test(self):
+        with self._lock:
+            self._profile = {"count": 0, "seconds": 0.0, "commands": {}, "stacks": {}}
+
+    def finish_test(self) -> dict:
+        """Return the profile of the finished test: totals, per command and per folded stack."""
+        with self._lock:
+            profile, self._profile = self._profile, None
+        if profile:
+            profile["seconds"] = round(profile["seconds"], 6)
+        return profile
+
+    def record(self, command: str, seconds: float, frame=None):
+        if self._profile is None:
+            return
+        stack = self._stack(frame or sys._getframe(1), command)
+        with self._lock:
+            profile = self._profile
+            if profile is None:
+                return
+            profile["count"] += 1
+            profile["seconds"] += seconds
+            for key, bucket in ((command, profile["commands"]), (stack, profile["stacks"])):
+                entry = bucket.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += seconds
+
+    def _stack(self, frame, command: str) -> str:
+        """Fold the project frames that led to the command, outermost first: 'a;b;command'."""
+        names = []
+        while frame is not None and len(names) < MAX_STACK_DEPTH:
+            filename = frame.f_code.co_filename
+            if not filename.startswith("<"):
+                filename = os.path.abspath(filename)
+            if filename.startswith(self.root) and "site-packages" not in filename and filename not in _SKIPPED_FILES:
+                module = os.path.splitext(os.path.basename(filename))[0]
+                names.append(f"{module}:{getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)}")
+            frame = frame.f_back
+        names.reverse()
+        names.append(command)
+        return ";".join(names)
+
+
+class ProfilingExecutor:
+    """Wraps a driver's command executor and reports every command to the profiler."""
+
+    def __init__(self, executor, profiler: CommandProfiler):
+        self._executor = executor
+        self._profiler = profiler
+
+    def execute(self, command, params):
+        start = time.perf_counter()
+        try:
+            return self._executor.execute(command, params)
+        finally:
+            self._profiler.record(command, time.perf_counter() - start, sys._getframe(1))
+
+    def __getattr__(self, name):
+        return getattr(self._executor, name)
+
+
+def enable(root: str) -> CommandProfiler:
+    global _profiler
+    _profiler = CommandProfiler(root)
+    return _profiler
+
+
+def disable():
+    global _profiler
+    _profiler = None
+
+
+def get_profiler():
+    """Return the active profiler, or None when profiling is off."""
+    return _profiler
+
+
+def instrument(driver):
+    """Route the driver's commands through the profiler, once; a no-op when profiling is off."""
+    if _profiler is not None and not isinstance(driver.command_executor, ProfilingExecutor):
+        driver.command_executor = ProfilingExecutor(driver.command_executor, _profiler)
+    return driver
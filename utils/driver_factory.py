@@ -0,0 +1,92 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.common.proxy import Proxy, ProxyType
+from utils.driver_resolver import get_resolver
+from utils import browser_profiles
+
+
+def browser_options(browser: str, profile: str = browser_profiles.DEFAULT_PROFILE,
+                    proxy: str = None, performance_log: bool = False):
+    """
+    Return the launch options create_driver uses for the browser, e.g. as capabilities for
+    sessions started by other clients (see utils/async_webdriver.py).
+    """
+    browser_profiles.validate(profile)
+    if browser == "chrome":
+        options = webdriver.ChromeOptions()
+        # Disable password saving and bubbles
+        prefs = {
+            "credentials_enable_service": False,
+            "profile.password_manager_enabled": False,
+            "profile.default_content_setting_values.notifications": 2
+        }
+        options.add_experimental_option("prefs", prefs)
+        options.add_argument("--disable-save-password-bubble")
+        options.add_argument("--disable-infobars")
+        options.add_argument("--disable-notifications")
+        options.add_argument("--disable-popup-blocking")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        browser_profiles.apply_chromium(options, profile)
+        _apply_network_options(options, proxy, performance_log)
+    elif browser == "firefox":
+        options = browser_profiles.apply_firefox(webdriver.FirefoxOptions(), profile)
+        _apply_network_options(options, proxy, False)
+    elif browser == "edge":
+        options = browser_profiles.apply_chromium(webdriver.EdgeOptions(), profile)
+        _apply_network_options(options, proxy, performance_log)
+    else:
+        raise ValueError(f"Unsupported browser: {browser}")
+    return options
+
+
+def create_driver(browser: str, profile: str = browser_profiles.DEFAULT_PROFILE,
+                  proxy: str = None, performance_log: bool = False):
+    """
+    Start a new browser session for the given browser name.
+    Supported browsers: chrome, firefox, edge.
+    Supported profiles: see utils/browser_profiles.py.
+    proxy: host:port of an HTTP proxy for all traffic, e.g. the network policy proxy.
+    performance_log: record the Chromium performance (network) log, read with get_log("performance").
+    """
+    options = browser_options(browser, profile, proxy, performance_log)
+    resolver = get_resolver()
+    if browser == "chrome":
+        driver = webdriver.Chrome(service=ChromeService(resolver.resolve("chrome")), options=options)
+    elif browser == "firefox":
+        driver = webdriver.Firefox(service=FirefoxService(resolver.resolve("firefox")), options=options)
+    else:
+        driver = webdriver.Edge(service=EdgeService(resolver.resolve("edge")), options=options)
+
+    browser_profiles.prepare_window(driver, profile)
+    return driver
+
+
+def _apply_network_options(options, proxy: str, performance_log: bool):
+    if proxy:
+        options.proxy = Proxy({"proxyType": ProxyType.MANUAL, "httpProxy": proxy, "sslProxy": proxy})
+    if performance_log:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def attach_driver(browser: str, debugger_address: str, performance_log: bool = False):
+    """
+    Start a WebDriver session on a browser that is already running, e.g. one shared by
+    several pytest-xdist workers (see utils/browser_contexts.py). Chromium browsers only.
+    debugger_address: host:port of the browser's DevTools endpoint.
+    performance_log: as for create_driver; the log belongs to this session, not the browser.
+    """
+    resolver = get_resolver()
+    if browser == "chrome":
+        options = webdriver.ChromeOptions()
+        options.debugger_address = debugger_address
+        _apply_network_options(options, None, performance_log)
+        return webdriver.Chrome(service=ChromeService(resolver.resolve("chrome")), options=options)
+    if browser == "edge":
+        options = webdriver.EdgeOptions()
+        options.debugger_address = debugger_address
+        _apply_network_options(options, None, performance_log)
+        return webdriver.Edge(service=EdgeService(resolver.resolve("edge")), options=options)
+    raise ValueError(f"Cannot attach to a running {browser} browser")
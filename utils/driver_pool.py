@@ -0,0 +1,105 @@
+import logging
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger("DriverPool")
+
+
+class DriverPool:
+    """
+    Keeps warm browser sessions around so tests do not pay for a browser start each time.
+    Drivers are handed out with acquire() and returned with release(), which resets
+    the browser to a blank state. A driver is recycled after max_uses tests or as soon
+    as it stops responding.
+    """
+
+    RESET_STORAGE_SCRIPT = """
+        try { window.localStorage.clear(); } catch (e) {}
+        try { window.sessionStorage.clear(); } catch (e) {}
+    """
+
+    def __init__(self, factory, size: int = 1, max_uses: int = 50):
+        """
+        factory: callable returning a new WebDriver.
+        size: number of idle browsers kept warm.
+        max_uses: number of tests a browser may serve before it is replaced.
+        """
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.recycled = 0
+
+    def acquire(self):
+        """Return a clean driver, starting a new browser only if none is idle."""
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+        if driver is None:
+            driver = self.factory()
+            with self._lock:
+                self.created += 1
+                self._uses[id(driver)] = 0
+        with self._lock:
+            self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver):
+        """Reset a driver and put it back in the pool, or quit it if it is worn out or broken."""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0)
+        if uses >= self.max_uses or not self.reset(driver):
+            self.discard(driver)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(driver)
+                return
+        self.discard(driver)
+
+    def reset(self, driver) -> bool:
+        """
+        Bring a browser back to a neutral state:
+        extra windows closed, storage and cookies cleared, about:blank loaded.
+        Returns False when the browser no longer responds.
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            # Storage is scoped to the current origin, so clear it before leaving the page.
+            if driver.current_url.startswith("http"):
+                driver.execute_script(self.RESET_STORAGE_SCRIPT)
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            logger.warning(f"Browser failed to reset, recycling it: {e.__class__.__name__}")
+            return False
+
+    def discard(self, driver):
+        """Quit a driver and forget about it."""
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self.recycled += 1
+        self._quit(driver)
+
+    def close(self):
+        """Quit every idle driver."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._uses.clear()
+        for driver in idle:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.firefox import GeckoDriverManager
+from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from webdriver_manager.core.driver_cache import DriverCacheManager
+
+from utils.file_lock import FileLock, write_json_atomic
+
+logger = logging.getLogger("DriverResolver")
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SELENIUM_DRIVER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "selenium-azure")
+)
+
+
+class DriverResolver:
+    """
+    Resolves the driver binary (chromedriver, geckodriver, msedgedriver) once per machine.
+
+    The resolved path and the browser version it was resolved for are stored in a
+    lock-protected manifest inside cache_dir, so pytest-xdist workers and later pipeline
+    runs reuse the same binary instead of asking webdriver_manager again. When the
+    network is unavailable the resolver falls back to a pre-provisioned path
+    (offline_paths or the SELENIUM_<BROWSER>_DRIVER environment variable) or to the
+    last binary recorded in the manifest.
+    """
+
+    MANAGERS = {
+        "chrome": ChromeDriverManager,
+        "firefox": GeckoDriverManager,
+        "edge": EdgeChromiumDriverManager,
+    }
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, offline_paths: dict = None):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, "drivers.json")
+        self.offline_paths = offline_paths or {}
+        self.timings = {}
+        self._resolved = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, browser: str) -> str:
+        """Return the path to the driver binary for the given browser."""
+        if browser not in self.MANAGERS:
+            raise ValueError(f"Unsupported browser: {browser}")
+        with self._lock:
+            if browser in self._resolved:
+                return self._resolved[browser]
+            start = time.perf_counter()
+            with FileLock(self.manifest_path + ".lock"):
+                path, source = self._resolve_locked(browser)
+            self.timings[browser] = {"source": source, "seconds": time.perf_counter() - start}
+            logger.info(f"Resolved {browser} driver from {source} in {self.timings[browser]['seconds']:.2f}s: {path}")
+            self._resolved[browser] = path
+            return path
+
+    def _resolve_locked(self, browser: str):
+        manifest = self._load_manifest()
+        entry = manifest.get(browser)
+        manager = self.MANAGERS[browser](cache_manager=DriverCacheManager(root_dir=self.cache_dir))
+
+        browser_version = self._browser_version(manager)
+        if entry and os.path.exists(entry["path"]):
+            if browser_version is None or entry.get("browser_version") == browser_version:
+                return entry["path"], "manifest"
+
+        try:
+            path = manager.install()
+        except Exception as e:
+            logger.warning(f"Driver download for {browser} failed ({e.__class__.__name__}), trying offline fallback")
+            offline_path = self._offline_path(browser)
+            if offline_path:
+                return offline_path, "offline"
+            if entry and os.path.exists(entry["path"]):
+                return entry["path"], "stale-manifest"
+            raise
+
+        manifest[browser] = {
+            "path": path,
+            "browser_version": browser_version,
+            "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        write_json_atomic(self.manifest_path, manifest)
+        return path, "download"
+
+    def _offline_path(self, browser: str):
+        path = self.offline_paths.get(browser) or os.environ.get(f"SELENIUM_{browser.upper()}_DRIVER")
+        if path and os.path.exists(path):
+            return path
+        return None
+
+    @staticmethod
+    def _browser_version(manager):
+        try:
+            return manager.driver.get_browser_version_from_os()
+        except Exception:
+            return None
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+_default_resolver = None
+
+
+def get_resolver() -> DriverResolver:
+    """Return the process-wide resolver, creating it on first use."""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = DriverResolver()
+    return _default_resolver
+
+
+def configure(cache_dir: str = None, offline_paths: dict = None) -> DriverResolver:
+    """Replace the process-wide resolver, e.g. from command line options."""
+    global _default_resolver
+    _default_resolver = DriverResolver(cache_dir or DEFAULT_CACHE_DIR, offline_paths)
+    return _default_resolver
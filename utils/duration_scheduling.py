@@ -0,0 +1,249 @@
+"""
+Duration-balanced parallel execution.
+
+Per-test durations of the tests that passed in each run are written to a history file;
+a test that failed or was skipped keeps its previous duration. The history drives
+two things:
+- with pytest-xdist (-n N --duration-schedule) tests are handed to workers longest first,
+  one unit at a time, so the slowest tests never end up queued behind each other on one worker;
+- with --shard-count K --shard-index I the suite is split into K agent shards with
+  longest-processing-time (LPT) bin packing, so every shard gets a similar total duration.
+
+As with --dist loadscope, the unit is a test class (a module-level test is a unit of its
+own) and weighs the sum of its tests: class-scoped fixtures such as class_driver and
+class_inventory, and prefixes shared within a class (utils/scenario.py), are then set up
+once per class instead of on every worker and shard the class's tests land on.
+
+A shard also writes the durations of the tests it ran to --duration-shard-history;
+tools/merge_shards.py merges those files into the history the next run starts from.
+"""
+import json
+import os
+
+import pytest
+
+from utils.file_lock import FileLock, write_json_atomic
+
+DEFAULT_HISTORY = ".test-durations.json"
+# Weight of the newest measurement when merging with the recorded history.
+SMOOTHING = 0.5
+# Duration assumed for tests without history when nothing at all is known yet.
+DEFAULT_DURATION = 1.0
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("duration scheduling")
+    group.addoption(
+        "--duration-history", action="store", default=DEFAULT_HISTORY,
+        help="JSON file holding recorded per-test durations"
+    )
+    group.addoption(
+        "--duration-schedule", action="store_true", default=False,
+        help="With pytest-xdist, send tests to workers longest first using the duration history"
+    )
+    group.addoption(
+        "--shard-count", action="store", type=int, default=1,
+        help="Split the suite into this many duration-balanced shards"
+    )
+    group.addoption(
+        "--shard-index", action="store", type=int, default=0,
+        help="Zero-based index of the shard to run"
+    )
+    group.addoption(
+        "--duration-shard-history", action="store", default=None, metavar="PATH",
+        help="Also write the updated durations of only the tests run here to PATH, for tools/merge_shards.py"
+    )
+
+
+def history_key(config) -> str:
+    """Durations are only comparable for the same browser, launch profile and application server."""
+    browser = config.getoption("--driver-browser")
+    profile = config.getoption("--driver-profile")
+    key = browser if profile == "default" else f"{browser}/{profile}"
+    return f"{key}@local" if config.getoption("--base-url") == "local" else key
+
+
+def history_path(config) -> str:
+    return os.path.join(str(config.rootpath), config.getoption("--duration-history"))
+
+
+def load_history(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def estimate(nodeids, durations: dict) -> dict:
+    """Return a duration for every node id, using the mean of known tests for unknown ones."""
+    known = [durations[n] for n in nodeids if n in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION
+    return {n: durations.get(n, fallback) for n in nodeids}
+
+
+def scheduling_unit(nodeid: str) -> str:
+    """The class of a test in a class, like --dist loadscope; the test itself otherwise."""
+    parts = nodeid.split("[", 1)[0].split("::")
+    return "::".join(parts[:-1]) if len(parts) > 2 else nodeid
+
+
+def longest_first(nodeids, durations: dict) -> list:
+    """
+    Group node ids into scheduling units and order the units by descending total duration,
+    ties broken by unit name for determinism. The tests of a unit keep their order.
+    """
+    estimates = estimate(nodeids, durations)
+    units = {}
+    for nodeid in nodeids:
+        units.setdefault(scheduling_unit(nodeid), []).append(nodeid)
+    ordered = sorted(units.items(), key=lambda unit: (-sum(estimates[n] for n in unit[1]), unit[0]))
+    return [tests for _, tests in ordered]
+
+
+def lpt_partition(nodeids, durations: dict, bins: int) -> list:
+    """Split node ids into bins with the longest-processing-time-first heuristic, a unit at a time."""
+    estimates = estimate(nodeids, durations)
+    loads = [0.0] * bins
+    shards = [[] for _ in range(bins)]
+    for unit in longest_first(nodeids, durations):
+        target = loads.index(min(loads))
+        shards[target].extend(unit)
+        loads[target] += sum(estimates[nodeid] for nodeid in unit)
+    return shards
+
+
+_config = None
+
+
+def pytest_configure(config):
+    global _config
+    _config = config
+    count = config.getoption("--shard-count")
+    index = config.getoption("--shard-index")
+    if count < 1 or not 0 <= index < count:
+        raise pytest.UsageError(f"Invalid shard {index} of {count}")
+    config._duration_history = load_history(history_path(config)).get(history_key(config), {})
+    config._measured_durations = {}
+    # Tests that failed, errored or were skipped stopped early; their durations are not recorded.
+    config._stopped_early = set()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    count = config.getoption("--shard-count")
+    if count == 1:
+        return
+    index = config.getoption("--shard-index")
+    shards = lpt_partition([item.nodeid for item in items], config._duration_history, count)
+    selected = set(shards[index])
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+
+
+def pytest_runtest_logreport(report):
+    # Workers forward their reports to the controller, which records them once.
+    if _config is None or hasattr(_config, "workerinput"):
+        return
+    measured = _config._measured_durations
+    measured[report.nodeid] = measured.get(report.nodeid, 0.0) + report.duration
+    if report.failed or report.skipped:
+        _config._stopped_early.add(report.nodeid)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, "workerinput"):
+        return
+    measured = {nodeid: duration for nodeid, duration in config._measured_durations.items()
+                if nodeid not in config._stopped_early}
+    if not measured:
+        return
+    path = history_path(config)
+    key = history_key(config)
+    with FileLock(path + ".lock"):
+        history = load_history(path)
+        recorded = history.setdefault(key, {})
+        for nodeid, duration in measured.items():
+            previous = recorded.get(nodeid)
+            recorded[nodeid] = round(
+                duration if previous is None else SMOOTHING * duration + (1 - SMOOTHING) * previous, 3
+            )
+        write_json_atomic(path, history)
+    shard_path = config.getoption("--duration-shard-history")
+    if shard_path:
+        # Only this run's tests: the full history also holds entries other shards are updating.
+        write_json_atomic(shard_path, {key: {nodeid: recorded[nodeid] for nodeid in measured}})
+
+
+@pytest.hookimpl(optionalhook=True, tryfirst=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not config.getoption("--duration-schedule"):
+        return None
+    return DurationScheduling(config, log)
+
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # pytest-xdist is optional
+    LoadScheduling = object
+
+
+class DurationScheduling(LoadScheduling):
+    """
+    xdist scheduler that keeps a global queue of units sorted longest first and tops every
+    worker up to two pending tests, a whole unit at a time, as it finishes one. Handing out
+    work on demand from that queue is online LPT scheduling: long units start early and
+    short ones fill the gaps.
+    """
+
+    # xdist workers need the next item queued to run the current one.
+    QUEUE_DEPTH = 2
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        positions = {nodeid: i for i, nodeid in enumerate(self.collection)}
+        units = longest_first(self.collection, self.config._duration_history)
+        self.pending[:] = [positions[nodeid] for unit in units for nodeid in unit]
+        self.units = {positions[nodeid]: scheduling_unit(nodeid) for nodeid in self.collection}
+        if not self.collection:
+            return
+
+        for depth in range(1, self.QUEUE_DEPTH + 1):
+            for node in self.nodes:
+                if self.pending and len(self.node2pending[node]) < depth:
+                    self._send_unit(node)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+        if self.pending:
+            while self.pending and len(self.node2pending[node]) < self.QUEUE_DEPTH:
+                self._send_unit(node)
+        else:
+            node.shutdown()
+
+    def _send_unit(self, node):
+        """Send the tests of the next pending unit to the node together."""
+        unit = self.units[self.pending[0]]
+        count = 1
+        while count < len(self.pending) and self.units[self.pending[count]] == unit:
+            count += 1
+        self._send_tests(node, count)
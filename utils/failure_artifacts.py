@@ -0,0 +1,245 @@
+"""
+Captures a screenshot, the DOM, the browser console log and the URL when a test fails.
+
+Only the calls into the browser run on the test's thread. Decoding, hashing, compressing
+and writing happen on a small thread pool while the test's fixtures are torn down; the
+teardown report waits for them and attaches the files to Allure and to the streaming
+HTML report (or pytest-html when that is used instead).
+
+Files are content-addressed (<sha256>.png, <sha256>.html.gz, <sha256>.json), so a
+screenshot identical to an earlier one is stored once. With the streaming report on they
+live in its assets/failures/ directory, otherwise in --artifacts-dir. The store is capped
+per run (--artifacts-max-mb); when it grows past the cap the oldest files are evicted
+first. Only the store's own directory is capped, never other report assets.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils import report_properties, stream_report
+from utils.file_lock import FileLock
+
+DEFAULT_DIR = "artifacts"
+DEFAULT_MAX_MB = 200
+# Subdirectory of the streaming report's assets holding the failure artifacts.
+REPORT_SUBDIR = "failures"
+WRITER_THREADS = 2
+
+_pending_key = pytest.StashKey()
+_saved_key = pytest.StashKey()
+_store = None
+_config = None
+
+
+class ArtifactStore:
+    """Content-addressed files in one directory, capped in total size with oldest-first eviction."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {"stored": 0, "deduplicated": 0, "evicted": 0}
+        self._executor = ThreadPoolExecutor(max_workers=WRITER_THREADS, thread_name_prefix="artifacts")
+
+    def submit(self, func, *args):
+        return self._executor.submit(func, *args)
+
+    def put(self, content: bytes, extension: str) -> str:
+        """Store content unless an identical file exists; return its path."""
+        path = os.path.join(self.directory, f"{hashlib.sha256(content).hexdigest()}.{extension}")
+        if os.path.exists(path):
+            # Refresh the age of the file so eviction keeps what is still being produced.
+            os.utime(path)
+            self.stats["deduplicated"] += 1
+            return path
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self.stats["stored"] += 1
+        return path
+
+    def evict(self):
+        """Remove the oldest files until the directory fits the cap; shared by all workers."""
+        with FileLock(os.path.join(self.directory, ".lock")):
+            files = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.startswith(".") and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.stats["evicted"] += 1
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("failure artifacts")
+    group.addoption(
+        "--artifacts-dir", action="store", default=DEFAULT_DIR,
+        help="Directory for failure screenshots and DOM snapshots when the streaming report is off"
+    )
+    group.addoption(
+        "--artifacts-max-mb", action="store", type=float, default=DEFAULT_MAX_MB,
+        help="Size cap of the failure artifacts of a run; oldest files are evicted first (0 disables capture)"
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    # trylast: the streaming report must have chosen its directory first.
+    global _store, _config
+    _config = config
+    config._failure_artifacts = {}
+    max_mb = config.getoption("--artifacts-max-mb")
+    if not max_mb:
+        return
+    directory = os.path.join(str(config.rootpath), config.getoption("--artifacts-dir"))
+    if not hasattr(config, "workerinput"):
+        # Controller, or a run without xdist: the cap applies to this run only.
+        shutil.rmtree(directory, ignore_errors=True)
+    # Capture where tests run: in xdist workers, or in the main process without xdist.
+    if hasattr(config, "workerinput") or getattr(config.option, "dist", "no") == "no":
+        assets = stream_report.assets_dir()
+        if assets:
+            # A directory of its own: eviction must not remove assets other report fragments link to.
+            directory = os.path.join(assets, REPORT_SUBDIR)
+        os.makedirs(directory, exist_ok=True)
+        _store = ArtifactStore(directory, int(max_mb * 1024 * 1024))
+
+
+def pytest_unconfigure(config):
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+def _drivers(item) -> list:
+    funcargs = getattr(item, "funcargs", {})
+    return [value for value in funcargs.values() if isinstance(value, WebDriver)]
+
+
+def _capture(driver) -> dict:
+    """Read everything from the browser on the test's thread; no encoding or disk work here."""
+    captured = {}
+    for name, read in (
+        ("url", lambda: driver.current_url),
+        ("screenshot", driver.get_screenshot_as_base64),
+        ("dom", lambda: driver.page_source),
+        # Only Chromium browsers expose the console log.
+        ("console", lambda: driver.get_log("browser")),
+    ):
+        try:
+            captured[name] = read()
+        except WebDriverException:
+            captured[name] = None
+        except Exception:
+            # A crashed browser fails with connection errors; capture must never break the run.
+            captured[name] = None
+    return captured
+
+
+def _save(store: ArtifactStore, captured: dict, when: str) -> list:
+    """Background task: encode, deduplicate and write one capture; returns the stored files."""
+    saved = []
+    if captured["screenshot"]:
+        path = store.put(base64.b64decode(captured["screenshot"]), "png")
+        saved.append(("screenshot", path, "png"))
+    if captured["dom"]:
+        dom = captured["dom"].encode("utf-8")
+        path = store.put(gzip.compress(dom, compresslevel=6), "html.gz")
+        saved.append(("DOM snapshot", path, "html.gz"))
+    details = {"when": when, "url": captured["url"], "console": captured["console"]}
+    path = store.put(json.dumps(details, indent=1).encode("utf-8"), "json")
+    saved.append(("URL and console log", path, "json"))
+    store.evict()
+    return saved
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    store = _store
+    if store is not None and call.when == "teardown":
+        # The writes overlapped with fixture teardown; the report needs their results now.
+        _attach(item, [future.result() for future in item.stash.get(_pending_key, [])])
+    outcome = yield
+    report = outcome.get_result()
+    if store is None:
+        return
+    if call.when == "teardown":
+        _attach_html_extras(item, report)
+    elif report.failed:
+        for driver in _drivers(item):
+            captured = _capture(driver)
+            item.stash.setdefault(_pending_key, []).append(store.submit(_save, store, captured, call.when))
+
+
+def _attach(item, captures: list):
+    item.stash[_pending_key] = []
+    # Files may have been evicted already by a later capture of another worker.
+    artifacts = [entry for saved in captures for entry in saved if os.path.exists(entry[1])]
+    item.stash[_saved_key] = artifacts
+    if artifacts:
+        item.user_properties.append(("failure_artifacts", [path for _, path, _ in artifacts]))
+    for name, path, _ in artifacts:
+        stream_report.attach_asset(item, path, name)
+    try:
+        import allure
+    except ImportError:
+        return
+    for name, path, extension in artifacts:
+        if extension == "png":
+            allure.attach.file(path, name=name, attachment_type=allure.attachment_type.PNG)
+        elif extension == "html.gz":
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                allure.attach(f.read(), name=name, attachment_type=allure.attachment_type.HTML)
+        else:
+            allure.attach.file(path, name=name, attachment_type=allure.attachment_type.JSON)
+
+
+def _attach_html_extras(item, report):
+    artifacts = item.stash.get(_saved_key, None)
+    if not artifacts or not item.config.pluginmanager.hasplugin("html"):
+        return
+    from pytest_html import extras
+    report.extras = getattr(report, "extras", []) + [
+        extras.png(path, name) if extension == "png" else extras.url(path, name)
+        for name, path, extension in artifacts
+    ]
+
+
+def pytest_runtest_logreport(report):
+    if _config is not None:
+        report_properties.collect(report, "failure_artifacts", _config._failure_artifacts)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    artifacts = getattr(config, "_failure_artifacts", None)
+    if not artifacts:
+        return
+    terminalreporter.section("failure artifacts")
+    for nodeid, paths in artifacts.items():
+        terminalreporter.write_line(f"{nodeid}:")
+        for path in paths:
+            terminalreporter.write_line(f"    {os.path.relpath(path, str(config.rootpath))}")
+    if _store is not None:
+        # Without xdist this process captured the artifacts itself.
+        terminalreporter.write_line(", ".join(f"{name}: {count}" for name, count in _store.stats.items()))
@@ -0,0 +1,171 @@
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+from utils.file_lock import FileLock, write_json_atomic
+
+DEFAULT_PATH = ".healing-cache.json"
+
+
+class HealingCache:
+    """
+    Remembers which backup locator healed a broken locator, keyed by
+    (page URL pattern, original locator).
+
+    Entries are persisted to a JSON file shared by pytest-xdist workers and later runs.
+    Writes merge with what is on disk under a file lock, so workers never drop each
+    other's entries. An entry is evicted when the original locator works again.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, revalidate_every: int = 20):
+        """
+        path: JSON store, or None to keep the cache in memory only.
+        revalidate_every: every N-th cache hit the original locator is retried first,
+        so entries for locators that were fixed in the app get evicted.
+        """
+        self.path = path
+        self.revalidate_every = max(1, revalidate_every)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = {}
+        self._locators = set()
+        self._uses = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._reload()
+
+    @staticmethod
+    def url_pattern(url: str) -> str:
+        """Reduce a URL to a pattern: no query or fragment, and numbers replaced by '*'."""
+        parts = urlsplit(url)
+        return re.sub(r"\d+", "*", f"{parts.netloc}{parts.path}")
+
+    @staticmethod
+    def locator_key(locator: tuple) -> str:
+        by, value = locator
+        return f"{by}={value}"
+
+    def knows(self, locator: tuple) -> bool:
+        """
+        Cheap check, without the page URL, whether the locator was ever healed.
+        Picks up entries other workers stored since the last read; a stat() is far cheaper than a round trip.
+        """
+        key = self.locator_key(locator)
+        if key not in self._locators and self._changed_on_disk():
+            self._reload()
+        return key in self._locators
+
+    def lookup(self, url: str, locator: tuple):
+        """Return the healed locator for this page and locator, or None."""
+        key = self._key(url, locator)
+        entry = self._entries.get(key)
+        if entry is None and self._changed_on_disk():
+            self._reload()
+            entry = self._entries.get(key)
+        return tuple(entry["healed"]) if entry else None
+
+    def due_for_revalidation(self, url: str, locator: tuple) -> bool:
+        """Return True when the original locator should be retried before the healed one."""
+        key = self._key(url, locator)
+        with self._lock:
+            self._uses[key] = self._uses.get(key, 0) + 1
+            return self._uses[key] % self.revalidate_every == 0
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def store(self, url: str, locator: tuple, healed: tuple):
+        """Remember the locator that healed the original one on this page."""
+        key = self._key(url, locator)
+        entry = {"healed": list(healed), "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        with self._lock:
+            self._entries[key] = entry
+            self._locators.add(self.locator_key(locator))
+        self._persist(key, entry)
+
+    def evict(self, url: str, locator: tuple):
+        """Forget the healed locator, e.g. because the original works again."""
+        key = self._key(url, locator)
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return
+            self.evictions += 1
+            self._locators = {k.split("|", 1)[1] for k in self._entries}
+        self._persist(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _key(self, url: str, locator: tuple) -> str:
+        return f"{self.url_pattern(url)}|{self.locator_key(locator)}"
+
+    def _persist(self, key: str, entry):
+        if not self.path:
+            return
+        with FileLock(self.path + ".lock"):
+            on_disk = self._read()
+            if entry is None:
+                on_disk.pop(key, None)
+            else:
+                on_disk[key] = entry
+            write_json_atomic(self.path, on_disk)
+            self._mtime = os.path.getmtime(self.path)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _changed_on_disk(self) -> bool:
+        if not self.path:
+            return False
+        try:
+            return os.path.getmtime(self.path) != self._mtime
+        except OSError:
+            return False
+
+    def _reload(self):
+        if not self.path:
+            return
+        entries = self._read()
+        with self._lock:
+            self._entries = entries
+            self._locators = {k.split("|", 1)[1] for k in entries}
+            try:
+                self._mtime = os.path.getmtime(self.path)
+            except OSError:
+                self._mtime = None
+
+
+_default_cache = None
+
+
+def get_cache() -> HealingCache:
+    """Return the process-wide healing cache, creating an in-memory one on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HealingCache(path=None)
+    return _default_cache
+
+
+def configure(path: str = DEFAULT_PATH, revalidate_every: int = 20) -> HealingCache:
+    """Replace the process-wide healing cache, e.g. from command line options."""
+    global _default_cache
+    _default_cache = HealingCache(path, revalidate_every)
+    return _default_cache
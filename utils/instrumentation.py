@@ -0,0 +1,201 @@
+"""
+Per-interaction latency tracing for page objects and the self-healing driver.
+
+Enabled by the utils/perf_trace.py plugin (--perf-trace). Every traced call (BasePage
+actions and waits, SelfHealingDriver.find_element and heal attempts) becomes one record
+with the page, the locator or URL, the total time, the time spent waiting, and the
+number and round-trip time of the WebDriver commands it issued. Records stream to one
+compact JSON-lines file per worker.
+
+Record keys: t test, k kind, p page, l locator/URL, d total ms, w wait ms,
+c command round-trip ms, n commands. A record of kind "test" closes every test.
+
+When tracing is off the decorators cost two global lookups per call and WebDriver
+commands are not wrapped at all.
+
+An observer (set_observer) is called at the start of every span, with or without tracing;
+the test impact plugin uses it to learn which page objects and locators a test touches.
+"""
+import functools
+import json
+import os
+import time
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+_tracer = None
+_observer = None
+
+
+class Tracer:
+    """Collects spans for the current test and streams them to a JSON-lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "w", buffering=1 << 16)
+        self._spans = []
+        self._wait_depth = 0
+        self.test = None
+        self.records = []
+        self._test_totals = None
+
+    # -- spans ------------------------------------------------------------------------
+
+    def open(self, kind: str, page: str, target: str) -> dict:
+        if page is None and self._spans:
+            page = self._spans[-1]["p"]
+        span = {"k": kind, "p": page, "l": target, "w": 0.0, "c": 0.0, "n": 0, "start": time.perf_counter()}
+        self._spans.append(span)
+        return span
+
+    def close(self, span: dict):
+        span["d"] = (time.perf_counter() - span.pop("start")) * 1000
+        self._spans.remove(span)
+        self._write(span)
+
+    def add_wait(self, ms: float):
+        for span in self._spans:
+            span["w"] += ms
+        if self._test_totals is not None:
+            self._test_totals["w"] += ms
+
+    def add_command(self, ms: float):
+        for span in self._spans:
+            span["c"] += ms
+            span["n"] += 1
+        if self._test_totals is not None:
+            self._test_totals["c"] += ms
+            self._test_totals["n"] += 1
+
+    # -- tests ------------------------------------------------------------------------
+
+    def start_test(self, nodeid: str):
+        self.test = nodeid
+        self.records = []
+        self._test_totals = {"k": "test", "p": None, "l": None, "w": 0.0, "c": 0.0, "n": 0, "start": time.perf_counter()}
+
+    def finish_test(self) -> dict:
+        totals = self._test_totals
+        if totals is None:
+            return None
+        totals["d"] = (time.perf_counter() - totals.pop("start")) * 1000
+        self._write(totals)
+        self._test_totals = None
+        self.test = None
+        return totals
+
+    def flush(self):
+        self._file.flush()
+
+    def close_file(self):
+        self._file.close()
+
+    def _write(self, record: dict):
+        record["t"] = self.test
+        for key in ("d", "w", "c"):
+            record[key] = round(record[key], 1)
+        self.records.append(record)
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def _target(args) -> str:
+    if not args:
+        return None
+    first = args[0]
+    if isinstance(first, tuple) and len(first) == 2:
+        return f"{first[0]}={first[1]}"
+    if len(args) >= 2 and isinstance(first, str) and isinstance(args[1], str):
+        return f"{first}={args[1]}"
+    return first if isinstance(first, str) else None
+
+
+def span(func=None, kind: str = None, wait: bool = False, page: bool = True):
+    """
+    Record a span for every call of the decorated method.
+    kind defaults to the method name; wait=True counts the whole call as waiting;
+    page=False takes the page from the enclosing span instead of the instance's class.
+    Works as @span, @span(kind="heal") or @span(wait=True).
+    """
+    if func is None:
+        return functools.partial(span, kind=kind, wait=wait, page=page)
+    name = kind or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _observer is not None:
+            _observer(func, self, args)
+        tracer = _tracer
+        if tracer is None:
+            return func(self, *args, **kwargs)
+        record = tracer.open(name, type(self).__name__ if page else None, _target(args))
+        if wait:
+            tracer._wait_depth += 1
+        start = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            if wait:
+                tracer._wait_depth -= 1
+                if tracer._wait_depth == 0:
+                    tracer.add_wait((time.perf_counter() - start) * 1000)
+            tracer.close(record)
+    return wrapper
+
+
+def waiting(func):
+    """Count calls of the decorated method as wait time of the enclosing spans, without a record."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer
+        if tracer is None:
+            return func(*args, **kwargs)
+        tracer._wait_depth += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            tracer._wait_depth -= 1
+            if tracer._wait_depth == 0:
+                tracer.add_wait((time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+_original_execute = WebDriver.execute
+
+
+def _timed_execute(self, driver_command, params=None):
+    start = time.perf_counter()
+    try:
+        return _original_execute(self, driver_command, params)
+    finally:
+        tracer = _tracer
+        if tracer is not None:
+            tracer.add_command((time.perf_counter() - start) * 1000)
+
+
+def enable(path: str) -> Tracer:
+    """Start tracing into the given file and time every WebDriver command."""
+    global _tracer
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _tracer = Tracer(path)
+    WebDriver.execute = _timed_execute
+    return _tracer
+
+
+def disable():
+    global _tracer
+    WebDriver.execute = _original_execute
+    if _tracer is not None:
+        _tracer.close_file()
+        _tracer = None
+
+
+def set_observer(observer):
+    """Call observer(func, instance, args) at the start of every span; None removes it."""
+    global _observer
+    _observer = observer
+
+
+def get_tracer():
+    """Return the active tracer, or None when tracing is off."""
+    return _tracer
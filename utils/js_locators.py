@@ -0,0 +1,57 @@
+"""
+JavaScript counterparts of Selenium's locator strategies and visibility checks.
+
+Scripts that run inside the browser (waits, batched reads, in-page healing) prepend
+HELPERS_JS and can then call:
+    __findAll(by, value, root)  -> array of elements matching a Selenium (By, value) locator
+    __isVisible(element)        -> approximation of WebElement.is_displayed()
+    __isClickable(element)      -> visible and enabled
+"""
+
+HELPERS_JS = r"""
+function __quote(value) {
+    return '"' + String(value).replace(/["\\]/g, '\\$&') + '"';
+}
+function __findAll(by, value, root) {
+    root = root || document;
+    var list;
+    switch (by) {
+        case 'css selector': list = root.querySelectorAll(value); break;
+        case 'id': list = root.querySelectorAll('[id=' + __quote(value) + ']'); break;
+        case 'name': list = root.querySelectorAll('[name=' + __quote(value) + ']'); break;
+        case 'class name': list = root.getElementsByClassName(value); break;
+        case 'tag name': list = root.getElementsByTagName(value); break;
+        case 'xpath':
+            var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            list = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { list.push(snapshot.snapshotItem(i)); }
+            break;
+        case 'link text':
+        case 'partial link text':
+            list = Array.prototype.filter.call(root.querySelectorAll('a'), function (a) {
+                var text = (a.innerText || '').trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+            break;
+        default:
+            throw new Error('Unsupported locator strategy: ' + by);
+    }
+    return Array.prototype.slice.call(list);
+}
+function __isVisible(el) {
+    if (!el || !el.isConnected) { return false; }
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' || style.visibility === 'collapse') { return false; }
+    if (parseFloat(style.opacity) === 0) { return false; }
+    var rect = el.getBoundingClientRect();
+    return el.getClientRects().length > 0 && (rect.width > 0 || rect.height > 0);
+}
+function __isClickable(el) {
+    return __isVisible(el) && !el.disabled;
+}
+"""
+
+
+def script(body: str) -> str:
+    """Return a script body with the locator helpers in scope."""
+    return HELPERS_JS + body
@@ -0,0 +1,122 @@
+"""
+Serves the bundled stand-in for www.saucedemo.com (demo_app/) from an in-process server.
+
+Run the suite against it with --base-url=local. The replica implements the login,
+inventory, item, cart and checkout flows with the same ids, data-test attributes,
+session cookie and localStorage cart as the real site, so every page object works
+unchanged and runs need neither internet access nor a third-party site.
+
+The server is started once per session. Under pytest-xdist the controller starts it
+and hands its URL to the workers.
+"""
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+from pages.login_page import LoginPage
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "demo_app")
+# Pages of the single-page app; all of them are served the same shell.
+ROUTES = {
+    "/", "/inventory.html", "/inventory-item.html", "/cart.html",
+    "/checkout-step-one.html", "/checkout-step-two.html", "/checkout-complete.html",
+}
+
+
+class _AppHandler(SimpleHTTPRequestHandler):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=APP_DIR, **kwargs)
+
+    def translate_path(self, path):
+        if urlsplit(path).path in ROUTES:
+            path = "/index.html"
+        return super().translate_path(path)
+
+    def end_headers(self):
+        # Static assets are immutable during a run; pages must always reflect the current script.
+        cacheable = self.path.startswith("/static/")
+        self.send_header("Cache-Control", "max-age=3600" if cacheable else "no-store")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalAppServer(ThreadingHTTPServer):
+    """Threaded HTTP server for demo_app/, running in a daemon thread."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _AppHandler)
+        self._thread = threading.Thread(target=self.serve_forever, name="local-app", daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+def use_base_url(url: str):
+    """Point the page objects at the application under test."""
+    LoginPage.URL = url if url.endswith("/") else url + "/"
+
+
+_server = None
+
+
+def start() -> str:
+    """Start the local replica for this process, if not running yet, and return its URL."""
+    global _server
+    if _server is None:
+        _server = LocalAppServer()
+    return _server.url
+
+
+def stop():
+    global _server
+    if _server is not None:
+        _server.close()
+        _server = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("application under test")
+    group.addoption(
+        "--base-url", action="store", default=None,
+        help=f"URL of the application under test (default {LoginPage.URL}); 'local' serves the bundled replica"
+    )
+
+
+def pytest_configure(config):
+    base_url = config.getoption("--base-url")
+    if hasattr(config, "workerinput") and "base_url" in config.workerinput:
+        base_url = config.workerinput["base_url"]
+    if base_url == "local":
+        base_url = start()
+    if base_url:
+        use_base_url(base_url)
+    config._base_url = LoginPage.URL
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # Workers share the controller's server instead of starting their own.
+    node.workerinput["base_url"] = node.config._base_url
+
+
+def pytest_unconfigure(config):
+    stop()
+
+
+def pytest_report_header(config):
+    return f"base url: {config._base_url}"
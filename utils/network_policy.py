@@ -0,0 +1,473 @@
+"""
+Network policies for every browser the driver fixture creates: block lists,
+throttling profiles and canned responses.
+
+Chromium (Chrome, Edge) is controlled over CDP. Firefox has no CDP in Selenium, so its
+traffic is routed through a local proxy (PolicyProxy). Over HTTPS the proxy only sees
+host names, so on Firefox block rules match hosts and canned responses are not available.
+
+The suite-wide policy comes from --network-block / --network-throttle; tests add to it
+with a marker:
+
+    @pytest.mark.network_policy(block=["images"], throttle="slow-3g",
+                                stubs={"*/api/cart*": {"status": 200, "body": "[]"}})
+
+Tests without any rules are left alone: their browsers get no performance log or proxy
+and no CDP calls. Blocked requests are reported per test. Bytes saved are estimated from response sizes
+learned whenever the same URL was loaded unblocked (kept in --network-sizes).
+"""
+import fnmatch
+import json
+import logging
+import os
+import select
+import socket
+import socketserver
+import threading
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from utils import report_properties
+from utils.file_lock import FileLock, write_json_atomic
+
+logger = logging.getLogger("NetworkPolicy")
+
+DEFAULT_SIZES = ".network-sizes.json"
+
+BLOCK_PRESETS = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "analytics": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*segment.io*", "*hotjar.com*", "*backtrace.io*",
+    ],
+}
+
+# Parameters for CDP Network.emulateNetworkConditions; throughput in bytes per second, -1 = unlimited.
+THROTTLE_PROFILES = {
+    "none": {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1},
+    "fast-3g": {"offline": False, "latency": 150, "downloadThroughput": 1600 * 1024 // 8, "uploadThroughput": 750 * 1024 // 8},
+    "slow-3g": {"offline": False, "latency": 400, "downloadThroughput": 500 * 1024 // 8, "uploadThroughput": 500 * 1024 // 8},
+    "offline": {"offline": True, "latency": 0, "downloadThroughput": 0, "uploadThroughput": 0},
+}
+
+# Answers matching fetch/XHR calls in the page instead of sending them. Installed before
+# any page script runs, so application code only ever sees the canned responses.
+STUB_SCRIPT = """
+(function (stubs) {
+    function toRegExp(pattern) {
+        return new RegExp('^' + pattern.replace(/[.+^${}()|[\\]\\\\]/g, '\\\\$&').replace(/\\*/g, '.*').replace(/\\?/g, '.') + '$');
+    }
+    var rules = Object.keys(stubs).map(function (pattern) { return [toRegExp(pattern), stubs[pattern]]; });
+    function match(url) {
+        var absolute = new URL(url, location.href).href;
+        for (var i = 0; i < rules.length; i++) {
+            if (rules[i][0].test(absolute)) { return rules[i][1]; }
+        }
+        return null;
+    }
+    function body(stub) {
+        return typeof stub.body === 'string' ? stub.body : JSON.stringify(stub.body === undefined ? '' : stub.body);
+    }
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function (input, init) {
+            var stub = match(typeof input === 'string' ? input : input.url);
+            if (!stub) { return originalFetch.apply(this, arguments); }
+            return Promise.resolve(new Response(body(stub), {status: stub.status || 200, headers: stub.headers || {}}));
+        };
+    }
+    var originalOpen = XMLHttpRequest.prototype.open, originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__stub = match(url);
+        return originalOpen.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function () {
+        var xhr = this, stub = xhr.__stub;
+        if (!stub) { return originalSend.apply(this, arguments); }
+        var text = body(stub);
+        [['readyState', 4], ['status', stub.status || 200], ['responseText', text], ['response', text]]
+            .forEach(function (p) { Object.defineProperty(xhr, p[0], {value: p[1], configurable: true}); });
+        setTimeout(function () {
+            ['readystatechange', 'load', 'loadend'].forEach(function (type) {
+                var handler = xhr['on' + type];
+                if (handler) { handler.call(xhr, new Event(type)); }
+                xhr.dispatchEvent(new Event(type));
+            });
+        }, 0);
+    };
+})(%s);
+"""
+
+
+class NetworkPolicy:
+    """
+    What the browser may load.
+    block: preset names (see BLOCK_PRESETS) or URL wildcard patterns.
+    throttle: a THROTTLE_PROFILES name, or None for an unthrottled network.
+    stubs: URL wildcard pattern -> {"status", "body", "headers"} for fetch/XHR calls.
+    """
+
+    def __init__(self, block=(), throttle: str = None, stubs: dict = None):
+        if throttle is not None and throttle not in THROTTLE_PROFILES:
+            raise ValueError(f"Unknown throttle profile: {throttle}. Choose from: {', '.join(THROTTLE_PROFILES)}")
+        self.block = []
+        for rule in block:
+            for pattern in BLOCK_PRESETS.get(rule, [rule]):
+                if pattern not in self.block:
+                    self.block.append(pattern)
+        self.throttle = throttle
+        self.stubs = dict(stubs or {})
+
+    @classmethod
+    def from_marker(cls, marker) -> "NetworkPolicy":
+        kwargs = dict(marker.kwargs)
+        kwargs["block"] = list(marker.args) + list(kwargs.get("block", []))
+        return cls(**kwargs)
+
+    def merged(self, other: "NetworkPolicy") -> "NetworkPolicy":
+        """Combine two policies; the other policy's throttle profile and stubs win."""
+        policy = NetworkPolicy(self.block + other.block, other.throttle or self.throttle)
+        policy.stubs = {**self.stubs, **other.stubs}
+        return policy
+
+    def is_empty(self) -> bool:
+        return not (self.block or self.throttle or self.stubs)
+
+    def blocks(self, url: str) -> bool:
+        return any(fnmatch.fnmatchcase(url, pattern) for pattern in self.block)
+
+    def stub_for(self, url: str):
+        for pattern, stub in self.stubs.items():
+            if fnmatch.fnmatchcase(url, pattern):
+                return stub
+        return None
+
+    def __repr__(self):
+        return f"NetworkPolicy(block={self.block}, throttle={self.throttle}, stubs={list(self.stubs)})"
+
+
+class ResponseSizes:
+    """Learned encoded response sizes per URL, shared by workers and runs through a JSON file."""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._sizes = self._read() if path else {}
+        self._learned = {}
+
+    def get(self, url: str) -> int:
+        return self._sizes.get(url, 0)
+
+    def learn(self, url: str, size: int):
+        if size > 0 and self._sizes.get(url) != size:
+            self._sizes[url] = self._learned[url] = size
+
+    def save(self):
+        if not self.path or not self._learned:
+            return
+        with FileLock(self.path + ".lock"):
+            on_disk = self._read()
+            on_disk.update(self._learned)
+            write_json_atomic(self.path, on_disk)
+        self._learned = {}
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+class ChromiumNetworkController:
+    """Applies policies to a Chrome or Edge session over CDP."""
+
+    def __init__(self, driver, sizes: ResponseSizes):
+        self.driver = driver
+        self.sizes = sizes
+        self._stub_script_id = None
+        self._enabled = False
+
+    def apply(self, policy: NetworkPolicy):
+        if not self._enabled:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self._enabled = True
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": policy.block})
+        self.driver.execute_cdp_cmd("Network.emulateNetworkConditions", THROTTLE_PROFILES[policy.throttle or "none"])
+        if self._stub_script_id is not None:
+            self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._stub_script_id})
+            self._stub_script_id = None
+        if policy.stubs:
+            result = self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": STUB_SCRIPT % json.dumps(policy.stubs)}
+            )
+            self._stub_script_id = result.get("identifier")
+
+    def collect(self) -> dict:
+        """Read the performance log: learn sizes of loaded responses and count blocked requests."""
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException:
+            # The browser was started without performance logging.
+            return {"requests": 0, "bytes": 0}
+        urls, blocked = {}, []
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                urls[params["requestId"]] = params["request"]["url"]
+            elif method == "Network.loadingFinished" and params.get("requestId") in urls:
+                self.sizes.learn(urls[params["requestId"]], int(params.get("encodedDataLength", 0)))
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                blocked.append(urls.get(params["requestId"], ""))
+        return {"requests": len(blocked), "bytes": sum(self.sizes.get(url) for url in blocked)}
+
+
+class ProxyNetworkController:
+    """Applies policies to a browser that sends its traffic through a PolicyProxy."""
+
+    def __init__(self, proxy: "PolicyProxy"):
+        self.proxy = proxy
+
+    def apply(self, policy: NetworkPolicy):
+        if policy.stubs:
+            logger.warning("Canned responses are not supported through the proxy; HTTPS bodies are opaque to it")
+        self.proxy.policy = policy
+
+    def collect(self) -> dict:
+        return self.proxy.drain_stats()
+
+
+class _ProxyHandler(socketserver.StreamRequestHandler):
+    """Minimal forward proxy: CONNECT tunnels for HTTPS, request forwarding for plain HTTP."""
+
+    CHUNK = 16384
+
+    def handle(self):
+        request_line = self.rfile.readline(65537).decode("latin-1").strip()
+        if not request_line:
+            return
+        method, target, _ = request_line.split(" ", 2)
+        headers = []
+        while True:
+            line = self.rfile.readline(65537)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            headers.append(line)
+        policy = self.server.policy
+
+        if method == "CONNECT":
+            host, port = target.rsplit(":", 1)
+            url = f"https://{host}/"
+        else:
+            parts = urlsplit(target)
+            host, port = parts.hostname, parts.port or 80
+            url = target
+        throttle = THROTTLE_PROFILES[policy.throttle or "none"]
+
+        if policy.blocks(url) or throttle["offline"]:
+            self.server.record_blocked(url)
+            self.wfile.write(b"HTTP/1.1 403 Blocked by network policy\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            return
+        stub = policy.stub_for(url) if method != "CONNECT" else None
+        if stub is not None:
+            body = stub.get("body", "")
+            body = (body if isinstance(body, str) else json.dumps(body)).encode()
+            head = [f"HTTP/1.1 {stub.get('status', 200)} Stubbed", f"Content-Length: {len(body)}", "Connection: close"]
+            head += [f"{name}: {value}" for name, value in stub.get("headers", {}).items()]
+            self.wfile.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+            return
+
+        try:
+            upstream = socket.create_connection((host, int(port)), timeout=30)
+        except OSError:
+            self.wfile.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            return
+        with upstream:
+            if method == "CONNECT":
+                self.wfile.write(b"HTTP/1.1 200 Connection Established\r\n\r\n")
+            else:
+                path = urlsplit(target)._replace(scheme="", netloc="").geturl() or "/"
+                forwarded = [h for h in headers if not h.lower().startswith((b"proxy-", b"connection"))]
+                upstream.sendall(f"{method} {path} HTTP/1.1\r\n".encode() + b"".join(forwarded)
+                                 + b"Connection: close\r\n\r\n")
+                length = next((int(h.split(b":", 1)[1]) for h in headers if h.lower().startswith(b"content-length:")), 0)
+                if length:
+                    upstream.sendall(self.rfile.read(length))
+            self._relay(upstream, throttle)
+
+    def _relay(self, upstream, throttle):
+        """Copy bytes both ways until either side closes, applying latency and bandwidth limits."""
+        if throttle["latency"]:
+            time.sleep(throttle["latency"] / 1000)
+        sockets = [self.connection, upstream]
+        while True:
+            readable, _, failed = select.select(sockets, [], sockets, 30)
+            if failed or not readable:
+                return
+            for source in readable:
+                data = source.recv(self.CHUNK)
+                if not data:
+                    return
+                target = upstream if source is self.connection else self.connection
+                limit = throttle["uploadThroughput"] if source is self.connection else throttle["downloadThroughput"]
+                if limit > 0:
+                    time.sleep(len(data) / limit)
+                target.sendall(data)
+
+
+class PolicyProxy(socketserver.ThreadingTCPServer):
+    """Local forward proxy enforcing the current NetworkPolicy, used for Firefox."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _ProxyHandler)
+        self.policy = NetworkPolicy()
+        self._blocked = []
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, name="network-policy-proxy", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self) -> str:
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def record_blocked(self, url: str):
+        with self._stats_lock:
+            self._blocked.append(url)
+
+    def drain_stats(self) -> dict:
+        with self._stats_lock:
+            blocked, self._blocked = self._blocked, []
+        return {"requests": len(blocked), "bytes": 0}
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+_config = None
+_sizes = ResponseSizes()
+_proxy = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("network policy")
+    group.addoption(
+        "--network-block", action="store", default="",
+        help="Comma-separated block rules applied to every test: presets (images, fonts, analytics) or URL patterns"
+    )
+    group.addoption(
+        "--network-throttle", action="store", default=None, choices=sorted(THROTTLE_PROFILES),
+        help="Throttling profile applied to every test"
+    )
+    group.addoption(
+        "--network-sizes", action="store", default=DEFAULT_SIZES,
+        help="JSON file of learned response sizes used to estimate bytes saved by blocking"
+    )
+
+
+def pytest_configure(config):
+    global _config, _sizes
+    _config = config
+    config.addinivalue_line(
+        "markers", "network_policy(*presets, block=[], throttle=None, stubs={}): network rules for this test"
+    )
+    config._network_active = False
+    config._network_saved = {}
+    _sizes = ResponseSizes(os.path.join(str(config.rootpath), config.getoption("--network-sizes")))
+
+
+def default_policy(config) -> NetworkPolicy:
+    rules = [rule.strip() for rule in config.getoption("--network-block").split(",") if rule.strip()]
+    return NetworkPolicy(rules, config.getoption("--network-throttle"))
+
+
+def pytest_collection_modifyitems(config, items):
+    # Only pay for performance logging and the Firefox proxy when some test uses a policy.
+    config._network_active = not default_policy(config).is_empty() or any(
+        item.get_closest_marker("network_policy") for item in items
+    )
+
+
+def is_active(config) -> bool:
+    return getattr(config, "_network_active", False)
+
+
+def policy_for(item) -> NetworkPolicy:
+    """The suite-wide policy combined with the test's network_policy marker."""
+    policy = default_policy(item.config)
+    marker = item.get_closest_marker("network_policy")
+    return policy.merged(NetworkPolicy.from_marker(marker)) if marker else policy
+
+
+def has_policy(item) -> bool:
+    """True when the test runs under a non-empty policy, i.e. needs performance logging or the proxy."""
+    return is_active(item.config) and not policy_for(item).is_empty()
+
+
+def proxy_address() -> str:
+    """Start the per-process policy proxy on first use and return its host:port."""
+    global _proxy
+    if _proxy is None:
+        _proxy = PolicyProxy()
+    return _proxy.address
+
+
+def attach(driver, item):
+    """Apply the test's policy to the driver. Returns a controller for detach(), or None without a policy."""
+    if not is_active(item.config):
+        return None
+    policy = policy_for(item)
+    if policy.is_empty():
+        # Browsers are reset by detach(), so a test without rules has nothing to apply or collect.
+        return None
+    if driver.name in ("chrome", "MicrosoftEdge"):
+        controller = ChromiumNetworkController(driver, _sizes)
+    elif _proxy is not None:
+        controller = ProxyNetworkController(_proxy)
+    else:
+        logger.warning(f"No network policy backend for {driver.name}")
+        return None
+    controller.apply(policy)
+    return controller
+
+
+def detach(controller, item):
+    """Record what the policy saved for the test and lift it, so reused browsers start clean."""
+    try:
+        stats = controller.collect()
+        controller.apply(NetworkPolicy())
+    except WebDriverException as e:
+        logger.warning(f"Could not reset the network policy: {e.__class__.__name__}")
+        return
+    if stats["requests"]:
+        item.user_properties.append(("network_saved", stats))
+
+
+def pytest_runtest_logreport(report):
+    if _config is not None:
+        report_properties.collect(report, "network_saved", _config._network_saved)
+
+
+def pytest_sessionfinish(session):
+    _sizes.save()
+    if _proxy is not None:
+        _proxy.close()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    saved = config._network_saved
+    if not saved:
+        return
+    terminalreporter.section("network policy")
+    for nodeid, stats in sorted(saved.items(), key=lambda kv: -kv[1]["bytes"]):
+        terminalreporter.write_line(f"{stats['requests']:5d} requests {stats['bytes'] / 1024:9.1f} KiB  {nodeid}")
+    requests = sum(stats["requests"] for stats in saved.values())
+    kib = sum(stats["bytes"] for stats in saved.values()) / 1024
+    terminalreporter.write_line(f"{requests:5d} requests {kib:9.1f} KiB  saved in {len(saved)} tests")
@@ -0,0 +1,127 @@
+"""
+Performance trace plugin: turns on utils/instrumentation.py with --perf-trace.
+
+Each worker streams its records to <perf-dir>/<worker>.jsonl. Every test's records are
+attached to its Allure result, and the terminal summary reads the files back to show
+the slowest locators, wait time against action time, and WebDriver commands per test.
+"""
+import glob
+import json
+import os
+import shutil
+
+import pytest
+
+from utils import instrumentation
+
+DEFAULT_DIR = ".perf"
+
+
+def load_records(directory: str) -> list:
+    records = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.jsonl"))):
+        with open(path) as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("performance trace")
+    group.addoption(
+        "--perf-trace", action="store_true", default=False,
+        help="Record timing of every page object interaction and WebDriver command"
+    )
+    group.addoption(
+        "--perf-dir", action="store", default=DEFAULT_DIR,
+        help="Directory for the per-worker trace files"
+    )
+
+
+def _trace_dir(config) -> str:
+    return os.path.join(str(config.rootpath), config.getoption("--perf-dir"))
+
+
+def pytest_configure(config):
+    if not config.getoption("--perf-trace"):
+        return
+    directory = _trace_dir(config)
+    if not hasattr(config, "workerinput"):
+        # Controller, or a run without xdist: start from an empty directory.
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+    # Trace where tests run: in xdist workers, or in the main process without xdist.
+    if hasattr(config, "workerinput") or getattr(config.option, "dist", "no") == "no":
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        instrumentation.enable(os.path.join(directory, f"{worker}.jsonl"))
+
+
+def pytest_unconfigure(config):
+    instrumentation.disable()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    tracer = instrumentation.get_tracer()
+    if tracer is not None:
+        tracer.start_test(item.nodeid)
+    yield
+    if tracer is not None:
+        tracer.finish_test()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    yield
+    tracer = instrumentation.get_tracer()
+    if tracer is None or call.when != "call" or not tracer.records:
+        return
+    try:
+        import allure
+    except ImportError:
+        return
+    allure.attach(
+        json.dumps(tracer.records, indent=1),
+        name="performance trace",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.getoption("--perf-trace") or hasattr(config, "workerinput"):
+        return
+    tracer = instrumentation.get_tracer()
+    if tracer is not None:
+        # Without xdist this process traced the tests itself and the file is still open.
+        tracer.flush()
+    records = load_records(_trace_dir(config))
+    if not records:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section("performance trace")
+
+    tests = [r for r in records if r["k"] == "test"]
+    spans = [r for r in records if r["k"] != "test"]
+    by_locator = {}
+    for record in spans:
+        if record["l"] is None or record["k"] in ("find_element", "heal"):
+            continue
+        key = (record["l"], record["p"])
+        total, calls, slowest = by_locator.get(key, (0.0, 0, 0.0))
+        by_locator[key] = (total + record["d"], calls + 1, max(slowest, record["d"]))
+    write("slowest locators (total, calls, max):")
+    for (target, page), (total, calls, slowest) in sorted(by_locator.items(), key=lambda kv: -kv[1][0])[:10]:
+        write(f"{total:10.1f} ms {calls:4d}x {slowest:8.1f} ms  {page}: {target}")
+
+    total = sum(r["d"] for r in tests)
+    wait = sum(r["w"] for r in tests)
+    if total:
+        write(f"wait vs action: {wait / 1000:.2f}s waiting ({wait / total:.0%}), "
+              f"{(total - wait) / 1000:.2f}s acting or in setup ({(total - wait) / total:.0%})")
+    healing = [r for r in spans if r["k"] == "heal"]
+    if healing:
+        write(f"self-healing: {len(healing)} heals, {sum(r['d'] for r in healing):.1f} ms")
+
+    write("WebDriver commands per test:")
+    for record in sorted(tests, key=lambda r: -r["n"])[:10]:
+        write(f"{record['n']:6d} commands {record['c']:10.1f} ms  {record['t']}")
+    write(f"{sum(r['n'] for r in tests):6d} commands in {len(tests)} tests; traces in {_trace_dir(config)}")
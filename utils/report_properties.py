@@ -0,0 +1,26 @@
+"""
+Per-test values plugins hand from the test to the controller.
+
+A plugin appends (name, value) to item.user_properties before the teardown report is
+made. Under pytest-xdist the user properties travel with the report to the controller,
+where the plugin reads them back in pytest_runtest_logreport with value() or collect().
+"""
+
+_MISSING = object()
+
+
+def value(report, name: str, default=None):
+    """Return the value the test stored under name, read from its teardown report only."""
+    if report.when != "teardown":
+        return default
+    for key, stored in reversed(report.user_properties):
+        if key == name:
+            return stored
+    return default
+
+
+def collect(report, name: str, results: dict):
+    """Store the value the test stored under name in results, keyed by node id."""
+    stored = value(report, name, _MISSING)
+    if stored is not _MISSING:
+        results[report.nodeid] = stored
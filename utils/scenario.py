@@ -0,0 +1,172 @@
+"""
+Prefix-sharing scenarios: tests that start with the same steps run those steps once.
+
+A prefix is a fixture declared with @scenario.prefix. It takes the driver fixture and
+returns the page the tests branch from:
+
+    @scenario.prefix(ready=CartPage.FIRST_NAME_INPUT)
+    def checkout_information(driver, seeded_cart):
+        return seeded_cart(["sauce-labs-backpack"], target="checkout-step-one")
+
+The first test of a worker that uses the prefix runs the steps and checkpoints the
+browser at the branch point (cookies, localStorage, sessionStorage and URL, see
+utils/browser_state.py). Later tests using it restore that checkpoint into their own
+fresh browser instead of repeating the steps, and receive a new page object of the same
+class. A checkpoint that no longer lands on its URL (expired session) is dropped and the
+steps run again. Parametrized tests share a checkpoint only with the same values of the
+parameters the prefix itself takes.
+
+The saved time is the prefix's own cost minus the restore, so a prefix pays off when its
+steps are slower than one navigation. Build it on the cheapest way to reach the branch
+point (a state builder such as seeded_cart where one exists); it then still keeps the
+variants together and reports what they cost.
+
+Every test still has its own result. Tests sharing a prefix are kept next to each other
+and marked with xdist_group. --duration-schedule and --shard-count keep a test class on
+one worker and shard (utils/duration_scheduling.py), so put a prefix's tests in one class
+there; --dist loadgroup keeps a group on one worker across classes. The terminal summary
+shows, per prefix, how often it ran and was restored, and the setup time saved.
+"""
+import inspect
+import time
+from urllib.parse import urlsplit
+
+import pytest
+
+from utils import report_properties
+from utils.browser_state import BrowserState
+from utils.wait_engine import create_engine
+
+# Seconds a restored checkpoint may take to show its ready element (BasePage.TIMEOUT).
+READY_TIMEOUT = 15
+
+_prefixes = set()
+_checkpoints = {}
+_config = None
+
+
+class Checkpoint:
+    """Browser state at a branch point, the page class returned there, and what the steps cost."""
+
+    def __init__(self, state: BrowserState, page_class, seconds: float):
+        self.state = state
+        self.page_class = page_class
+        self.seconds = seconds
+
+    def restore(self, driver) -> bool:
+        """Restore the state and reload the branch point URL; False if the browser ended up elsewhere."""
+        if self.state.is_expired():
+            return False
+        self.state.restore(driver)
+        return urlsplit(driver.current_url).path == urlsplit(self.state.url).path
+
+
+def prefix(func=None, *, ready: tuple = None):
+    """
+    Turn a function of fixtures into a prefix fixture whose steps run once per worker (see module doc).
+    ready: locator the page waits for after a checkpoint is restored, as the steps would have.
+    Usage: @scenario.prefix or @scenario.prefix(ready=CartPage.FIRST_NAME_INPUT)
+    """
+    if func is None:
+        return lambda f: prefix(f, ready=ready)
+    parameters = list(inspect.signature(func).parameters)
+    if "driver" not in parameters:
+        raise TypeError(f"Prefix {func.__name__} must take the driver fixture")
+    _prefixes.add(func.__name__)
+
+    def fixture(request, **kwargs):
+        driver = kwargs["driver"]
+        callspec = getattr(request.node, "callspec", None)
+        params = sorted((name, repr(value)) for name, value in callspec.params.items()
+                        if name in parameters) if callspec else []
+        key = (func.__module__, func.__qualname__, tuple(params))
+        checkpoint = _checkpoints.get(key)
+        if checkpoint is not None:
+            started = time.monotonic()
+            if checkpoint.restore(driver):
+                page = checkpoint.page_class(driver) if checkpoint.page_class else None
+                if ready is not None:
+                    # A prefix may return no page object; the wait engine needs only the driver.
+                    create_engine(driver, READY_TIMEOUT).until_visible(ready)
+                seconds = time.monotonic() - started
+                _record(request.node, func.__name__, True, seconds, checkpoint.seconds - seconds)
+                return page
+            del _checkpoints[key]
+        started = time.monotonic()
+        page = func(**kwargs)
+        seconds = time.monotonic() - started
+        _checkpoints[key] = Checkpoint(BrowserState.capture(driver), type(page) if page is not None else None, seconds)
+        _record(request.node, func.__name__, False, seconds, 0.0)
+        return page
+
+    # pytest reads the fixture's name and arguments from the function: the prefix's own plus request.
+    # functools.wraps is not used, as pytest would follow __wrapped__ back to the undecorated signature.
+    for attribute in ("__name__", "__qualname__", "__module__", "__doc__"):
+        setattr(fixture, attribute, getattr(func, attribute))
+    signature = inspect.signature(func)
+    fixture.__signature__ = signature.replace(parameters=[
+        inspect.Parameter("request", inspect.Parameter.POSITIONAL_OR_KEYWORD),
+        *(p.replace(kind=inspect.Parameter.KEYWORD_ONLY) for p in signature.parameters.values()),
+    ])
+    return pytest.fixture(fixture)
+
+
+def _record(item, name: str, restored: bool, seconds: float, saved: float):
+    item.user_properties.append(("scenario", {
+        "prefix": name, "restored": restored, "seconds": round(seconds, 3), "saved": round(saved, 3),
+    }))
+
+
+def pytest_configure(config):
+    global _config
+    _config = config
+    config._scenario_results = {}
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # Keep the tests of a prefix together so its checkpoint is still warm when they run.
+    # First, so pytest-xdist's --dist loadgroup sees the xdist_group markers added here.
+    groups = {}
+    for index, item in enumerate(items):
+        shared = sorted(_prefixes.intersection(getattr(item, "fixturenames", ())))
+        if shared:
+            name = f"{item.module.__name__}::{shared[0]}"
+            item.add_marker(pytest.mark.xdist_group(name=name))
+            groups.setdefault(name, index)
+    if not groups:
+        return
+
+    def position(indexed):
+        index, item = indexed
+        shared = sorted(_prefixes.intersection(getattr(item, "fixturenames", ())))
+        first = groups[f"{item.module.__name__}::{shared[0]}"] if shared else index
+        return first, index
+
+    items[:] = [item for _, item in sorted(enumerate(items), key=position)]
+
+
+def pytest_unconfigure(config):
+    _checkpoints.clear()
+
+
+def pytest_runtest_logreport(report):
+    if _config is not None:
+        report_properties.collect(report, "scenario", _config._scenario_results)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = getattr(config, "_scenario_results", None)
+    if not results:
+        return
+    terminalreporter.section("scenario checkpoints")
+    prefixes = {}
+    for result in results.values():
+        stats = prefixes.setdefault(result["prefix"], {"ran": 0, "restored": 0, "saved": 0.0})
+        stats["restored" if result["restored"] else "ran"] += 1
+        stats["saved"] += result["saved"]
+    for name, stats in sorted(prefixes.items()):
+        terminalreporter.write_line(
+            f"{name}: ran {stats['ran']}x, restored {stats['restored']}x, {stats['saved']:.2f}s setup saved"
+        )
+    terminalreporter.write_line(f"total setup saved: {sum(s['saved'] for s in prefixes.values()):.2f}s")
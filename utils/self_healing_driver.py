@@ -1,8 +1,12 @@
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from utils.healing_cache import HealingCache, get_cache
+from utils import js_locators
+from utils.instrumentation import span
 import logging
+import re
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,26 +16,156 @@ class SelfHealingDriver:
     """
     A wrapper around Selenium WebDriver that implements self-healing capabilities.
     If a locator fails, it attempts to find the element using alternative strategies.
+    Successful heals are remembered in a HealingCache so later lookups try the
+    working locator first instead of walking the backup list again.
+
+    Heal modes:
+    - "script": all candidates are evaluated in the browser in one round trip, first match wins.
+    - "ranked": like "script", but every match is scored by similarity to the original locator.
+    - "sequential": one find_element round trip per candidate.
     """
 
-    def __init__(self, driver: WebDriver):
+    HEAL_MODES = ("script", "ranked", "sequential")
+    HEAL_MODE = "script"
+
+    HEAL_SCRIPT = js_locators.script("""
+        var candidates = arguments[0], hints = arguments[1], ranked = arguments[2];
+        if (!ranked) {
+            for (var i = 0; i < candidates.length; i++) {
+                try {
+                    var el = __findAll(candidates[i][0], candidates[i][1])[0];
+                    if (el) { return [i, el]; }
+                } catch (e) {}
+            }
+            return null;
+        }
+        function tokens(el) {
+            var text = [el.id, el.getAttribute('name'), el.getAttribute('data-test'), el.className,
+                        el.tagName, (el.innerText || '').slice(0, 100)].join(' ').toLowerCase();
+            return text.split(/[^a-z0-9]+/);
+        }
+        function depth(el) {
+            var d = 0;
+            while (el.parentElement) { d++; el = el.parentElement; }
+            return d;
+        }
+        var seen = [], matches = [];
+        candidates.forEach(function (candidate, index) {
+            var found;
+            try { found = __findAll(candidate[0], candidate[1]); } catch (e) { return; }
+            found.forEach(function (el) {
+                if (seen.indexOf(el) !== -1) { return; }
+                seen.push(el);
+                var own = tokens(el);
+                var overlap = hints.length ? hints.filter(function (h) { return own.indexOf(h) !== -1; }).length / hints.length : 0;
+                var order = 1 - index / candidates.length;
+                var score = 0.5 * overlap + 0.3 * order + 0.15 * (__isVisible(el) ? 1 : 0) + 0.05 / (1 + depth(el) / 10);
+                matches.push({index: index, element: el, score: score, unique: found.length === 1});
+            });
+        });
+        matches.sort(function (a, b) { return b.score - a.score; });
+        // A broad candidate may find another element first; give the winner a locator of its own.
+        var best = matches[0];
+        if (best && !best.unique) {
+            best.locator = null;
+            ['id', 'data-test', 'name'].some(function (attribute) {
+                var value = best.element.getAttribute(attribute);
+                var selector = value && '[' + attribute + '=' + __quote(value) + ']';
+                if (selector && document.querySelectorAll(selector).length === 1) {
+                    best.locator = ['css selector', selector];
+                }
+                return !!best.locator;
+            });
+        }
+        return matches.slice(0, 5);
+    """)
+
+    def __init__(self, driver: WebDriver, cache: HealingCache = None, heal_mode: str = None):
         self.driver = driver
+        self.cache = cache or get_cache()
+        self.heal_mode = heal_mode or self.HEAL_MODE
+        if self.heal_mode not in self.HEAL_MODES:
+            raise ValueError(f"Unknown heal mode: {self.heal_mode}. Choose from: {', '.join(self.HEAL_MODES)}")
 
-    def find_element(self, locator: tuple) -> WebElement:
+    @span(page=False)
+    def find_element(self, by, value=None) -> WebElement:
         """
         Attempts to find an element. If the primary locator fails, triggers self-healing.
+        Accepts a locator tuple, find_element((By.ID, "x")), or WebDriver-style arguments, find_element(By.ID, "x").
         """
+        locator = by if value is None else (by, value)
         strategy, value = locator
+
+        # Only locators that were healed before cost the extra current_url round trip.
+        if self.cache.knows(locator):
+            url = self.driver.current_url
+            healed = self.cache.lookup(url, locator)
+            if healed:
+                element = self._find_cached(url, locator, healed)
+                if element is not None:
+                    return element
+
         try:
             return self.driver.find_element(strategy, value)
         except NoSuchElementException:
             logger.warning(f"Locator failed: {locator}. Attempting self-healing...")
-            return self._heal_locator(locator)
+            self.cache.record_miss()
+            element, healed = self._find_with_backups(locator)
+            if healed is not None:
+                self.cache.store(self.driver.current_url, locator, healed)
+            return element
+
+    def _find_cached(self, url: str, locator: tuple, healed: tuple):
+        """
+        Try the healed locator remembered for this page.
+        Returns None when the caller should fall back to the original locator.
+        """
+        if self.cache.due_for_revalidation(url, locator):
+            try:
+                element = self.driver.find_element(*locator)
+                logger.info(f"Original locator works again, evicting healed entry: {locator}")
+                self.cache.evict(url, locator)
+                return element
+            except NoSuchElementException:
+                pass
+        try:
+            element = self.driver.find_element(*healed)
+            self.cache.record_hit()
+            return element
+        except NoSuchElementException:
+            logger.info(f"Cached healed locator {healed} no longer matches, evicting it")
+            self.cache.evict(url, locator)
+            return None
 
     def _heal_locator(self, original_locator: tuple) -> WebElement:
         """
         Iterates through backup strategies to find the element.
         """
+        element, _ = self._find_with_backups(original_locator)
+        return element
+
+    @span(kind="heal", page=False)
+    def _find_with_backups(self, original_locator: tuple):
+        """
+        Finds the element with backup strategies and returns it with the locator that found it,
+        or None when no locator identifies the element reliably enough to be cached.
+        In "script" and "ranked" mode all candidates are evaluated in the browser in a single
+        round trip; "sequential" mode issues one find_element call per candidate.
+        """
+        if self.heal_mode != "sequential":
+            try:
+                return self._heal_in_browser(original_locator)
+            except WebDriverException as e:
+                if isinstance(e, NoSuchElementException):
+                    raise
+                logger.warning(f"In-browser healing unavailable ({e.__class__.__name__}), trying backups one by one")
+        return self._heal_sequential(original_locator)
+
+    def _backup_strategies(self, original_locator: tuple, extended: bool = False) -> list:
+        """
+        Build the list of backup locators for a broken locator, most specific first.
+        The extended candidates are only used when they cost no extra round trips.
+        """
         strategy, value = original_locator
         
         # Define backup strategies based on the original strategy
@@ -59,13 +193,80 @@ class SelfHealingDriver:
         if " " in value and not any(c in value for c in "[]#."):
              backup_strategies.append((By.XPATH, f"//*[contains(text(), '{value}')]"))
 
+        if extended:
+            # Identifiers used as attribute values in the original locator, e.g. [data-test='login-button']
+            identifiers = re.findall(r"""=\s*['"]([^'"]+)['"]""", value)
+            if strategy in (By.ID, By.NAME):
+                identifiers.append(value)
+            if strategy == By.CSS_SELECTOR and "#" in value:
+                identifiers.append(value.split("#")[-1].split(" ")[0].split(".")[0])
+            for identifier in identifiers:
+                backup_strategies.extend([
+                    (By.CSS_SELECTOR, f"[data-test='{identifier}']"),
+                    (By.ID, identifier),
+                    (By.NAME, identifier),
+                    (By.CSS_SELECTOR, f"[data-test*='{identifier}']"),
+                    (By.CSS_SELECTOR, f"[id*='{identifier}']"),
+                ])
+            if strategy == By.CLASS_NAME:
+                backup_strategies.append((By.CSS_SELECTOR, f"[class*='{value}']"))
+
+        # Keep the first occurrence of each candidate and never retry the original
+        unique = []
+        for candidate in backup_strategies:
+            if candidate != tuple(original_locator) and candidate not in unique:
+                unique.append(candidate)
+        return unique
+
+    def _heal_in_browser(self, original_locator: tuple):
+        """
+        Send every backup candidate to the browser in one execute_script call.
+        "script" mode returns the first candidate that matches; "ranked" mode scores every
+        match by attribute and text similarity to the original locator and picks the best.
+        """
+        candidates = self._backup_strategies(original_locator, extended=True)
+        ranked = self.heal_mode == "ranked"
+        hints = [t for t in re.split(r"[^a-z0-9]+", original_locator[1].lower()) if len(t) > 1]
+        logger.info(f"Trying {len(candidates)} backup strategies in the browser")
+        result = self.driver.execute_script(self.HEAL_SCRIPT, [list(c) for c in candidates], hints, ranked)
+
+        if not result:
+            logger.error(f"Self-healing failed for locator: {original_locator}")
+            raise NoSuchElementException(f"Could not find element after self-healing attempts: {original_locator}")
+        if not ranked:
+            index, element = result
+            backup_strategy, backup_value = candidates[index]
+            logger.info(f"Self-healing successful! Found element using: {backup_strategy}='{backup_value}'")
+            return element, (backup_strategy, backup_value)
+
+        for match in result:
+            logger.info(f"Candidate {candidates[match['index']]} scored {match['score']:.2f}")
+        best = result[0]
+        element = best["element"]
+        # Only a locator whose first match is the chosen element may be cached: find_element returns the first match.
+        if best["unique"]:
+            healed = candidates[best["index"]]
+        elif best.get("locator"):
+            healed = tuple(best["locator"])
+        else:
+            logger.info(f"Candidate {candidates[best['index']]} matches several elements; the heal is not cached")
+            return element, None
+        logger.info(f"Self-healing successful! Found element using: {healed[0]}='{healed[1]}'")
+        return element, healed
+
+    def _heal_sequential(self, original_locator: tuple):
+        """
+        Iterates through backup strategies with one find_element call each.
+        """
+        backup_strategies = self._backup_strategies(original_locator)
+
         # Execute backup strategies
         for backup_strategy, backup_value in backup_strategies:
             try:
                 logger.info(f"Trying backup strategy: {backup_strategy}='{backup_value}'")
                 element = self.driver.find_element(backup_strategy, backup_value)
                 logger.info(f"Self-healing successful! Found element using: {backup_strategy}='{backup_value}'")
-                return element
+                return element, (backup_strategy, backup_value)
             except NoSuchElementException:
                 continue
 
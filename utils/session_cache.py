@@ -0,0 +1,90 @@
+import logging
+from urllib.parse import urljoin
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from pages.login_page import LoginPage
+from pages.inventory_page import InventoryPage
+from utils.browser_state import BrowserState
+
+logger = logging.getLogger("SessionCache")
+
+
+class SessionCache:
+    """
+    Logs each user in once through the UI and keeps the resulting browser state.
+    Later requests for the same user restore the state and open inventory.html (or any
+    other page, see open_page) directly.
+    A snapshot that no longer authenticates (expired cookie, redirect back to the login
+    page) is discarded and re-created with a fresh UI login.
+    """
+
+    DEFAULT_PASSWORD = "secret_sauce"
+    # How long to wait for a restored session to show either the inventory or the login form.
+    VERIFY_TIMEOUT = 5
+
+    def __init__(self, password: str = DEFAULT_PASSWORD):
+        self.password = password
+        self._snapshots = {}
+        self.hits = 0
+        self.logins = 0
+
+    def open_inventory(self, driver, username: str = "standard_user", password: str = None) -> InventoryPage:
+        """Return an InventoryPage for a browser logged in as the given user."""
+        self.open_page(driver, self.inventory_url(), InventoryPage.INVENTORY_LIST, username, password)
+        return InventoryPage(driver)
+
+    def open_page(self, driver, url: str, ready: tuple, username: str = "standard_user", password: str = None,
+                  local_storage: dict = None):
+        """
+        Open url in a browser logged in as the given user and wait for the ready locator.
+        local_storage entries are written along with the restored session, before the page loads.
+        """
+        snapshot = self._snapshots.get(username)
+        if snapshot and not snapshot.is_expired():
+            snapshot.restore(driver, url, local_storage)
+            if self._is_authenticated(driver, ready):
+                self.hits += 1
+                return
+            logger.info(f"Session snapshot for {username} is stale, logging in again")
+        self._snapshots.pop(username, None)
+        snapshot = self._snapshots[username] = self.login(driver, username, password or self.password)
+        if url != self.inventory_url() or local_storage:
+            # The login left the browser on the inventory; the state goes in with one more load.
+            snapshot.restore(driver, url, local_storage)
+            WebDriverWait(driver, self.VERIFY_TIMEOUT).until(EC.visibility_of_element_located(ready))
+
+    def login(self, driver, username: str, password: str) -> BrowserState:
+        """Log in through the login page and capture the authenticated state."""
+        login_page = LoginPage(driver)
+        login_page.load()
+        login_page.login(username, password)
+        try:
+            login_page.wait_engine.until(EC.url_contains("inventory.html"))
+        except TimeoutException:
+            raise RuntimeError(f"Login failed for user: {username}")
+        self.logins += 1
+        return BrowserState.capture(driver)
+
+    def invalidate(self, username: str = None):
+        """Forget the snapshot of one user, or of all users."""
+        if username is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(username, None)
+
+    @staticmethod
+    def inventory_url() -> str:
+        return urljoin(LoginPage.URL, "inventory.html")
+
+    def _is_authenticated(self, driver, ready: tuple) -> bool:
+        try:
+            WebDriverWait(driver, self.VERIFY_TIMEOUT).until(EC.any_of(
+                EC.visibility_of_element_located(ready),
+                EC.visibility_of_element_located(LoginPage.LOGIN_BUTTON),
+            ))
+        except TimeoutException:
+            return False
+        return bool(driver.find_elements(*ready)) and not driver.find_elements(*LoginPage.LOGIN_BUTTON)
@@ -0,0 +1,102 @@
+"""
+Reports fixed time.sleep() calls per test and enforces an optional per-test budget.
+
+Only sleeps issued from project code (tests, page objects, tools, conftest) are counted.
+Polling loops inside Selenium and in utils/ (the wait engine) are synchronization, not
+fixed delays, and are ignored.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+from utils import report_properties
+
+_real_sleep = time.sleep
+_state = {"nodeid": None, "seconds": 0.0, "calls": 0, "root": None}
+
+
+def _counting_sleep(seconds):
+    if _state["nodeid"] is not None and _is_project_caller(sys._getframe(1)):
+        _state["seconds"] += seconds
+        _state["calls"] += 1
+    _real_sleep(seconds)
+
+
+def _is_project_caller(frame) -> bool:
+    filename = os.path.abspath(frame.f_code.co_filename)
+    root = _state["root"]
+    if not filename.startswith(root) or "site-packages" in filename:
+        return False
+    return not filename.startswith(os.path.join(root, "utils") + os.sep)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sleep guard")
+    group.addoption(
+        "--sleep-budget", action="store", type=float, default=None,
+        help="Fail the run if any test spends more than this many seconds in time.sleep"
+    )
+
+
+_config = None
+
+
+def pytest_configure(config):
+    global _config
+    _config = config
+    _state["root"] = str(config.rootpath)
+    config._sleep_totals = {}
+    time.sleep = _counting_sleep
+
+
+def pytest_unconfigure(config):
+    time.sleep = _real_sleep
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    _state.update(nodeid=item.nodeid, seconds=0.0, calls=0)
+    yield
+    _state["nodeid"] = None
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_makereport(item, call):
+    # The teardown report is created last, so it carries the total for the whole test.
+    if call.when == "teardown" and _state["calls"]:
+        item.user_properties.append(("sleep_seconds", round(_state["seconds"], 3)))
+
+
+def pytest_runtest_logreport(report):
+    if _config is not None:
+        report_properties.collect(report, "sleep_seconds", _config._sleep_totals)
+
+
+def _over_budget(config) -> dict:
+    budget = config.getoption("--sleep-budget")
+    if budget is None:
+        return {}
+    return {nodeid: seconds for nodeid, seconds in config._sleep_totals.items() if seconds > budget}
+
+
+def pytest_sessionfinish(session):
+    if _over_budget(session.config) and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    totals = config._sleep_totals
+    if not totals:
+        return
+    terminalreporter.section("sleep time")
+    for nodeid, seconds in sorted(totals.items(), key=lambda kv: -kv[1]):
+        terminalreporter.write_line(f"{seconds:8.2f}s  {nodeid}")
+    terminalreporter.write_line(f"{sum(totals.values()):8.2f}s  total in {len(totals)} tests")
+    over = _over_budget(config)
+    if over:
+        budget = config.getoption("--sleep-budget")
+        terminalreporter.write_line(
+            f"{len(over)} test(s) exceeded the sleep budget of {budget:.2f}s", red=True, bold=True
+        )
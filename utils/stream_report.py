@@ -0,0 +1,344 @@
+"""
+Streaming HTML report: results are written as tests finish instead of once at the end.
+
+--stream-report DIR produces:
+    index.html        static viewer; re-reads the results while the run is going
+    run.js            run metadata and status (running / finished)
+    results.jsonl     one JSON line per test, for tools
+    results.js        the same records as script calls, so index.html works from file://
+    tests/<id>.js     per-test detail (traceback, captured output, attachments), loaded on demand
+    assets/<sha256>.* attachments such as screenshots, stored once per distinct content
+
+Results are appended by the process that runs the tests, so every pytest-xdist worker
+writes its own records; appends are serialized with a FileLock. Nothing is kept in
+memory beyond the test being reported.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from utils.file_lock import FileLock
+
+# Captured output beyond this many characters per section is cut from the fragment.
+MAX_SECTION_CHARS = 64 * 1024
+_GENERATED = ("index.html", "run.js", "results.jsonl", "results.js", "tests", "assets", ".lock")
+
+_assets_key = pytest.StashKey()
+_phases_key = pytest.StashKey()
+_directory = None
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Test report</title>
+<style>
+body { font-family: sans-serif; margin: 1.5em; color: #222; }
+#summary span { margin-right: 1em; cursor: pointer; }
+#summary span.off { opacity: 0.35; }
+table { border-collapse: collapse; width: 100%; }
+td, th { text-align: left; padding: 3px 8px; border-bottom: 1px solid #eee; }
+tr.test { cursor: pointer; }
+tr.test:hover { background: #f5f5f5; }
+.passed { color: #2a7d2a; } .failed, .error { color: #c0392b; }
+.skipped, .xfailed, .xpassed { color: #b07d12; }
+td.detail { background: #fafafa; }
+pre { white-space: pre-wrap; font-size: 12px; margin: 0.3em 0 0.8em; }
+img { max-width: 100%; border: 1px solid #ddd; }
+</style>
+</head>
+<body>
+<h1>Test report</h1>
+<p id="run"></p>
+<p id="summary"></p>
+<table>
+<thead><tr><th>Result</th><th>Test</th><th>Duration</th><th>Worker</th></tr></thead>
+<tbody id="results"></tbody>
+</table>
+<script>
+var __report = (function () {
+  var seen = {}, counts = {}, hidden = {}, finished = false, body = document.getElementById("results");
+
+  function text(tag, value, cls) {
+    var el = document.createElement(tag);
+    el.textContent = value;
+    if (cls) { el.className = cls; }
+    return el;
+  }
+
+  function summary() {
+    var p = document.getElementById("summary");
+    p.textContent = "";
+    Object.keys(counts).sort().forEach(function (outcome) {
+      var span = text("span", counts[outcome] + " " + outcome, outcome + (hidden[outcome] ? " off" : ""));
+      span.onclick = function () { hidden[outcome] = !hidden[outcome]; filter(); summary(); };
+      p.appendChild(span);
+    });
+  }
+
+  function filter() {
+    Array.prototype.forEach.call(body.querySelectorAll("tr.test"), function (row) {
+      row.style.display = hidden[row.dataset.outcome] ? "none" : "";
+      if (row.nextSibling && row.nextSibling.className === "detail-row") {
+        row.nextSibling.style.display = row.style.display;
+      }
+    });
+  }
+
+  function load(src) {
+    var script = document.createElement("script");
+    script.src = src + "?" + Date.now();
+    script.onload = script.onerror = function () { script.remove(); };
+    document.head.appendChild(script);
+  }
+
+  function toggle(row, record) {
+    if (row.nextSibling && row.nextSibling.className === "detail-row") {
+      row.nextSibling.remove();
+      return;
+    }
+    var detail = document.createElement("tr"), cell = document.createElement("td");
+    detail.className = "detail-row";
+    cell.className = "detail";
+    cell.colSpan = 4;
+    cell.id = "detail-" + record.id;
+    cell.textContent = record.detail ? "loading..." : "no details recorded";
+    detail.appendChild(cell);
+    row.parentNode.insertBefore(detail, row.nextSibling);
+    if (record.detail) { load("tests/" + record.id + ".js"); }
+  }
+
+  function add(record) {
+    if (seen[record.id]) { return; }
+    seen[record.id] = true;
+    counts[record.outcome] = (counts[record.outcome] || 0) + 1;
+    var row = document.createElement("tr");
+    row.className = "test";
+    row.dataset.outcome = record.outcome;
+    row.appendChild(text("td", record.outcome, record.outcome));
+    row.appendChild(text("td", record.nodeid));
+    row.appendChild(text("td", record.duration.toFixed(2) + "s"));
+    row.appendChild(text("td", record.worker));
+    row.onclick = function () { toggle(row, record); };
+    if (hidden[record.outcome]) { row.style.display = "none"; }
+    body.appendChild(row);
+    summary();
+  }
+
+  function fragment(id, data) {
+    var cell = document.getElementById("detail-" + id);
+    if (!cell) { return; }
+    cell.textContent = "";
+    if (data.longrepr) { cell.appendChild(text("pre", data.longrepr)); }
+    data.sections.forEach(function (section) {
+      cell.appendChild(text("b", section[0]));
+      cell.appendChild(text("pre", section[1]));
+    });
+    data.assets.forEach(function (asset) {
+      cell.appendChild(text("div", asset.name));
+      if (asset.path.match(/\\.(png|jpe?g|gif|svg|webp)$/)) {
+        var img = document.createElement("img");
+        img.loading = "lazy";
+        img.src = asset.path;
+        cell.appendChild(img);
+      } else {
+        var link = text("a", asset.path);
+        link.href = asset.path;
+        cell.appendChild(link);
+      }
+    });
+  }
+
+  function run(info) {
+    finished = info.status === "finished";
+    var line = info.status + ", started " + info.started;
+    if (info.duration !== undefined) { line += ", " + info.duration.toFixed(1) + "s, exit status " + info.exitstatus; }
+    Object.keys(info.environment || {}).forEach(function (name) { line += " | " + name + ": " + info.environment[name]; });
+    document.getElementById("run").textContent = line;
+  }
+
+  function poll() {
+    load("run.js");
+    load("results.js");
+    if (!finished) { setTimeout(poll, 2000); }
+  }
+
+  setTimeout(poll, 0);
+  return { add: add, fragment: fragment, run: run };
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def test_id(nodeid: str) -> str:
+    """Stable, file-name safe id of a test."""
+    return hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:16]
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def attach(item, content, name: str, extension: str):
+    """
+    Attach content (bytes or str) to the report entry of a test, e.g. a screenshot.
+    The file is stored as assets/<sha256>.<extension>, so identical content is written once.
+    Returns the path relative to the report directory, or None when the report is off.
+    """
+    if _directory is None:
+        return None
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    path = os.path.join(_directory, "assets", f"{hashlib.sha256(content).hexdigest()}.{extension.lstrip('.')}")
+    if not os.path.exists(path):
+        _write_atomic(path, content)
+    return attach_asset(item, path, name)
+
+
+def assets_dir():
+    """Directory of the content-addressed attachments, or None when the report is off."""
+    return os.path.join(_directory, "assets") if _directory else None
+
+
+def attach_asset(item, path: str, name: str):
+    """Attach a file that is already stored under assets_dir() to the report entry of a test."""
+    if _directory is None:
+        return None
+    relative = os.path.relpath(path, _directory).replace(os.sep, "/")
+    item.stash.setdefault(_assets_key, []).append({"name": name, "path": relative, "size": os.path.getsize(path)})
+    return relative
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("streaming report")
+    group.addoption(
+        "--stream-report", action="store", default=None, metavar="DIR",
+        help="Write an HTML report to DIR that fills in while the tests run"
+    )
+
+
+def _environment(config) -> dict:
+    try:
+        from pytest_metadata.plugin import metadata_key
+        metadata = config.stash[metadata_key]
+    except (ImportError, KeyError):
+        return {}
+    return {name: str(value) for name, value in metadata.items() if name in ("Browser", "Driver profile", "Python")}
+
+
+def _write_run(config, **info):
+    script = f"__report.run({json.dumps(info)});\n"
+    _write_atomic(os.path.join(config._stream_report_dir, "run.js"), script.encode("utf-8"))
+
+
+def pytest_configure(config):
+    global _directory
+    directory = config.getoption("--stream-report")
+    config._stream_report_dir = None
+    if not directory:
+        return
+    directory = os.path.abspath(directory)
+    config._stream_report_dir = directory
+    if not hasattr(config, "workerinput"):
+        # Controller, or a run without xdist: start from an empty report before workers start.
+        for name in _GENERATED:
+            path = os.path.join(directory, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        for sub in ("tests", "assets"):
+            os.makedirs(os.path.join(directory, sub), exist_ok=True)
+        _write_atomic(os.path.join(directory, "index.html"), INDEX_HTML.encode("utf-8"))
+    # Report where tests run: in xdist workers, or in the main process without xdist.
+    if hasattr(config, "workerinput") or getattr(config.option, "dist", "no") == "no":
+        _directory = directory
+
+
+def pytest_unconfigure(config):
+    global _directory
+    _directory = None
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    if config._stream_report_dir and not hasattr(config, "workerinput"):
+        config._stream_report_started = time.time()
+        _write_run(
+            config, status="running", started=time.strftime("%Y-%m-%d %H:%M:%S"),
+            environment=_environment(config),
+        )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if config._stream_report_dir and not hasattr(config, "workerinput"):
+        _write_run(
+            config, status="finished",
+            started=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(config._stream_report_started)),
+            duration=round(time.time() - config._stream_report_started, 3),
+            exitstatus=int(exitstatus), environment=_environment(config),
+        )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if _directory is None:
+        return
+    item.stash.setdefault(_phases_key, []).append(outcome.get_result())
+    if call.when == "teardown":
+        _write_result(item, item.stash[_phases_key], item.stash.get(_assets_key, []))
+
+
+def _outcome(reports) -> str:
+    for report in reports:
+        if report.failed:
+            return "failed" if report.when == "call" else "error"
+    for report in reports:
+        if hasattr(report, "wasxfail"):
+            return "xfailed" if report.skipped else "xpassed"
+        if report.skipped:
+            return "skipped"
+    return "passed"
+
+
+def _longrepr_text(report) -> str:
+    if report.skipped and isinstance(report.longrepr, tuple):
+        # (path, line, "Skipped: reason")
+        return report.longrepr[2]
+    return report.longreprtext
+
+
+def _write_result(item, reports, assets):
+    outcome = _outcome(reports)
+    longrepr = "\n\n".join(_longrepr_text(r) for r in reports if r.longrepr and not r.passed)
+    sections = [(title, content[-MAX_SECTION_CHARS:]) for title, content in reports[-1].sections]
+    record = {
+        "id": test_id(item.nodeid),
+        "nodeid": item.nodeid,
+        "outcome": outcome,
+        "duration": round(sum(r.duration for r in reports), 3),
+        "worker": os.environ.get("PYTEST_XDIST_WORKER", "main"),
+        "detail": bool(longrepr or sections or assets),
+    }
+    if record["detail"]:
+        fragment = {"longrepr": longrepr, "sections": sections, "assets": assets}
+        script = f"__report.fragment({json.dumps(record['id'])}, {json.dumps(fragment)});\n"
+        _write_atomic(os.path.join(_directory, "tests", f"{record['id']}.js"), script.encode("utf-8"))
+    line = json.dumps(record)
+    with FileLock(os.path.join(_directory, ".lock")):
+        with open(os.path.join(_directory, "results.jsonl"), "a") as f:
+            f.write(line + "\n")
+        with open(os.path.join(_directory, "results.js"), "a") as f:
+            f.write(f"__report.add({line});\n")
@@ -0,0 +1,386 @@
+"""
+Test impact selection: run only the tests affected by changed page objects.
+
+--impact-record records, per test, the page-object symbols it touched: every pages/
+method on the call stack when a BasePage or SelfHealingDriver span starts, and the
+class attribute holding the locator it used. The map is merged into --impact-map
+(one entry per test, like the duration history). A shard also writes only the entries
+it recorded to --impact-shard-map, for tools/merge_shards.py.
+
+--impact-since REV compares the working tree with REV; --impact-since=recorded with the
+commit the map was last recorded at, so every commit since then is covered, falling back
+to the full suite when that commit is not in the local history. For changed files under pages/
+both versions are parsed and compared symbol by symbol (methods, class attributes, and
+the module body as "<module>"). Selected are: tests that touched a changed symbol, tests
+that touched the class of a changed member no test recorded (e.g. a script or URL
+attribute), all tests in changed test files, tests without a recorded entry, tests that
+failed when they last ran, and a deterministic safety sample (--impact-sample) of the rest. Any other changed file outside
+the documentation makes the selection fall back to the full suite, as does a missing map
+or a failing git.
+Untracked files count only under pages/ and tests/ or as Python modules elsewhere.
+
+Symbols are written "pages/login_page.py::LoginPage.login".
+"""
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils import instrumentation, report_properties
+from utils.file_lock import FileLock, write_json_atomic
+
+DEFAULT_MAP = ".test-impact.json"
+PAGES_DIR = "pages"
+TESTS_DIR = "tests"
+# Changes to these never affect test outcomes.
+IGNORED_SUFFIXES = (".md", ".gitignore", ".yml", ".yaml")
+MAX_STACK_DEPTH = 30
+# --impact-since value selecting against the commit the map was recorded at.
+RECORDED_REVISION = "recorded"
+
+_config = None
+_state = {"symbols": None, "pages": None, "root": None}
+_locator_names = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("test impact")
+    group.addoption(
+        "--impact-record", action="store_true", default=False,
+        help="Record the page-object methods and locators every test touches"
+    )
+    group.addoption(
+        "--impact-since", action="store", default=None, metavar="REV",
+        help="Run only the tests affected by page-object changes since this git revision, "
+             "or since the commit the map was recorded at with 'recorded'"
+    )
+    group.addoption(
+        "--impact-sample", action="store", type=float, default=0.1,
+        help="Fraction of the unaffected tests that still runs with --impact-since, as a safety net"
+    )
+    group.addoption(
+        "--impact-map", action="store", default=DEFAULT_MAP,
+        help="JSON file holding the recorded test-to-symbol map"
+    )
+    group.addoption(
+        "--impact-shard-map", action="store", default=None, metavar="PATH",
+        help="Also write the entries recorded in this run only to PATH, for tools/merge_shards.py"
+    )
+
+
+def map_path(config) -> str:
+    return os.path.join(str(config.rootpath), config.getoption("--impact-map"))
+
+
+def load_map(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# -- recording ------------------------------------------------------------------------
+
+
+def _relative(filename: str) -> str:
+    return os.path.relpath(filename, _state["root"]).replace(os.sep, "/")
+
+
+def _locator_name(page, locator):
+    """Return 'path::Class.ATTRIBUTE' of the class attribute holding the locator, if any."""
+    cls = type(page)
+    names = _locator_names.get(cls)
+    if names is None:
+        names = {}
+        for klass in reversed(cls.__mro__):
+            module = sys.modules.get(klass.__module__)
+            filename = getattr(module, "__file__", None)
+            if not filename or not os.path.abspath(filename).startswith(_state["pages"]):
+                continue
+            for name, value in vars(klass).items():
+                if isinstance(value, tuple) and len(value) == 2 and all(isinstance(v, str) for v in value):
+                    names[value] = f"{_relative(filename)}::{klass.__name__}.{name}"
+        _locator_names[cls] = names
+    return names.get(locator)
+
+
+def _observe(func, instance, args):
+    symbols = _state["symbols"]
+    if symbols is None:
+        return
+    pages = _state["pages"]
+    if func.__code__.co_filename.startswith(pages):
+        symbols.add(f"{_relative(func.__code__.co_filename)}::{func.__qualname__}")
+    # Locator arguments: (by, value), by and value, or a {locator: value} form (BasePage.fill_form).
+    if args and isinstance(args[0], dict):
+        locators = [key for key in args[0] if isinstance(key, tuple) and len(key) == 2]
+    elif args and isinstance(args[0], tuple) and len(args[0]) == 2:
+        locators = [args[0]]
+    elif len(args) >= 2 and isinstance(args[0], str) and isinstance(args[1], str):
+        locators = [(args[0], args[1])]
+    else:
+        locators = []
+    unnamed = []
+    for locator in locators:
+        name = _locator_name(instance, locator)
+        if name:
+            symbols.add(name)
+        else:
+            unnamed.append(locator)
+    frame = sys._getframe(1)
+    for _ in range(MAX_STACK_DEPTH):
+        if frame is None:
+            break
+        code = frame.f_code
+        if code.co_filename.startswith(pages):
+            symbols.add(f"{_relative(code.co_filename)}::{getattr(code, 'co_qualname', code.co_name)}")
+            page = frame.f_locals.get("self")
+            if unnamed and page is not None:
+                for locator in list(unnamed):
+                    name = _locator_name(page, locator)
+                    if name:
+                        symbols.add(name)
+                        unnamed.remove(locator)
+        frame = frame.f_back
+
+
+# -- changed symbols ------------------------------------------------------------------
+
+
+def symbol_hashes(source: str, path: str) -> dict:
+    """Hash every method and class attribute of a module, and the rest of it as '<module>'."""
+    tree = ast.parse(source)
+    hashes = {}
+    module_rest = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            header = [ast.dump(base) for base in node.bases] + [ast.dump(d) for d in node.decorator_list]
+            hashes[f"{path}::{node.name}"] = _hash(repr(header))
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    hashes[f"{path}::{node.name}.{child.name}"] = _hash(ast.dump(child))
+                elif isinstance(child, (ast.Assign, ast.AnnAssign)):
+                    targets = child.targets if isinstance(child, ast.Assign) else [child.target]
+                    for target in targets:
+                        if isinstance(target, ast.Name):
+                            hashes[f"{path}::{node.name}.{target.id}"] = _hash(ast.dump(child.value))
+                elif not isinstance(child, ast.Expr):
+                    # Anything else in a class body (nested classes, statements) counts as the class itself.
+                    hashes[f"{path}::{node.name}"] = _hash(hashes[f"{path}::{node.name}"] + ast.dump(child))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            hashes[f"{path}::{node.name}"] = _hash(ast.dump(node))
+        else:
+            module_rest.append(ast.dump(node))
+    hashes[f"{path}::<module>"] = _hash("\n".join(module_rest))
+    return hashes
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _git(root: str, *args) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=root, check=True, capture_output=True, text=True, timeout=60
+    ).stdout
+
+
+def _has_commit(root: str, revision: str) -> bool:
+    try:
+        _git(root, "cat-file", "-e", f"{revision}^{{commit}}")
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return True
+
+
+def changes_since(root: str, revision: str):
+    """
+    Return (changed page-object symbols, changed test files), or None when the change
+    cannot be mapped to symbols and everything has to run.
+    """
+    try:
+        files = _git(root, "diff", "--name-only", revision, "--").split()
+        untracked = _git(root, "ls-files", "--others", "--exclude-standard").split()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # Untracked files are often run outputs (histories, reports); only new code counts.
+    files += [path for path in untracked if path.startswith((f"{PAGES_DIR}/", f"{TESTS_DIR}/")) or path.endswith(".py")]
+    symbols, test_files = set(), set()
+    for path in files:
+        if path.startswith(f"{TESTS_DIR}/") and path.endswith(".py") and os.path.basename(path) != "conftest.py":
+            test_files.add(path)
+        elif path.startswith(f"{PAGES_DIR}/") and path.endswith(".py"):
+            try:
+                old = _git(root, "show", f"{revision}:{path}")
+            except subprocess.CalledProcessError:
+                old = ""
+            try:
+                with open(os.path.join(root, path)) as f:
+                    new = f.read()
+            except OSError:
+                new = ""
+            try:
+                before, after = symbol_hashes(old, path), symbol_hashes(new, path)
+            except SyntaxError:
+                return None
+            symbols.update(name for name in set(before) | set(after) if before.get(name) != after.get(name))
+        elif path.endswith(IGNORED_SUFFIXES) or path.startswith(f"{TESTS_DIR}/") and not path.endswith(".py"):
+            continue
+        else:
+            return None
+    return symbols, test_files
+
+
+def affected(recorded: dict, nodeids, symbols: set, test_files: set) -> set:
+    """Node ids that touched a changed symbol, live in a changed test file, or have no record yet."""
+    # A changed module body (imports, constants) or class header affects everything defined under it.
+    # So does a changed class member no test recorded: a script, timeout or URL attribute is read
+    # by the class's methods without showing up in the map itself.
+    touched_anywhere = set().union(*recorded.values())
+    prefixes = []
+    for name in symbols:
+        member = name.split("::", 1)[1]
+        if name.endswith("::<module>"):
+            prefixes.append(name[:-len("<module>")])
+        elif "." not in member:
+            prefixes.append(name + ".")
+        elif name not in touched_anywhere:
+            prefixes.append(name.rsplit(".", 1)[0] + ".")
+    prefixes = tuple(prefixes)
+    selected = set()
+    for nodeid in nodeids:
+        touched = recorded.get(nodeid)
+        if touched is None or nodeid.split("::")[0] in test_files:
+            selected.add(nodeid)
+        elif symbols.intersection(touched) or any(name.startswith(prefixes) for name in touched if prefixes):
+            selected.add(nodeid)
+    return selected
+
+
+def merge_failed(previous, ran, failed) -> list:
+    """Failures of earlier runs stay until their test runs again; add the failures of this run."""
+    return sorted(set(previous).difference(ran) | set(failed))
+
+
+def safety_sample(nodeids, fraction: float, seed: str) -> set:
+    """Deterministic sample: the same revision picks the same tests on every worker and shard."""
+    if fraction <= 0:
+        return set()
+    ranked = sorted(nodeids, key=lambda n: hashlib.sha1(f"{seed}:{n}".encode("utf-8")).hexdigest())
+    count = min(len(ranked), max(1, round(len(ranked) * fraction)))
+    return set(ranked[:count])
+
+
+# -- hooks ----------------------------------------------------------------------------
+
+
+def pytest_configure(config):
+    global _config
+    _config = config
+    config._impact_recorded = {}
+    config._impact_failed = set()
+    config._impact_summary = None
+    root = str(config.rootpath)
+    _state["root"] = root
+    _state["pages"] = os.path.join(root, PAGES_DIR) + os.sep
+    if config.getoption("--impact-record"):
+        instrumentation.set_observer(_observe)
+
+
+def pytest_unconfigure(config):
+    instrumentation.set_observer(None)
+
+
+def pytest_collection_modifyitems(config, items):
+    revision = config.getoption("--impact-since")
+    if not revision:
+        return
+    root = str(config.rootpath)
+    impact_map = load_map(map_path(config))
+    recorded = impact_map.get("tests", {})
+    if revision == RECORDED_REVISION:
+        revision = impact_map.get("commit")
+        if not revision or not _has_commit(root, revision):
+            config._impact_summary = f"impact: full run (the commit the map was recorded at is not available: {revision})"
+            return
+    changes = changes_since(root, revision) if recorded else None
+    if changes is None:
+        config._impact_summary = f"impact: full run (no map, git failed, or non page-object changes since {revision})"
+        return
+    symbols, test_files = changes
+    nodeids = [item.nodeid for item in items]
+    selected = affected(recorded, nodeids, symbols, test_files)
+    # The map moves on with every recorded run, red or green: keep rerunning a failure until it passes.
+    failed = set(impact_map.get("failed", ())).intersection(nodeids) - selected
+    selected |= failed
+    try:
+        seed = _git(root, "rev-parse", revision).strip()
+    except (OSError, subprocess.SubprocessError):
+        seed = revision
+    sample = safety_sample([n for n in nodeids if n not in selected], config.getoption("--impact-sample"), seed)
+    config._impact_summary = (
+        f"impact: {len(selected) - len(failed)} affected by {len(symbols)} changed symbols and {len(test_files)} test files, "
+        f"{len(failed)} failed last time, {len(sample)} sampled, {len(nodeids) - len(selected) - len(sample)} skipped"
+    )
+    keep = selected | sample
+    deselected = [item for item in items if item.nodeid not in keep]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in keep]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    if _config is not None and _config.getoption("--impact-record"):
+        _state["symbols"] = set()
+    yield
+    _state["symbols"] = None
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_makereport(item, call):
+    # The teardown report is created last, so it carries the symbols of the whole test.
+    if call.when == "teardown" and _state["symbols"] is not None:
+        item.user_properties.append(("impact_symbols", sorted(_state["symbols"])))
+
+
+def pytest_runtest_logreport(report):
+    if _config is None:
+        return
+    if report.failed:
+        _config._impact_failed.add(report.nodeid)
+    report_properties.collect(report, "impact_symbols", _config._impact_recorded)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, "workerinput") or not config._impact_recorded:
+        return
+    path = map_path(config)
+    try:
+        commit = _git(str(config.rootpath), "rev-parse", "HEAD").strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    with FileLock(path + ".lock"):
+        impact_map = load_map(path)
+        impact_map.setdefault("tests", {}).update(config._impact_recorded)
+        impact_map["failed"] = merge_failed(impact_map.get("failed", ()), config._impact_recorded, config._impact_failed)
+        if commit:
+            impact_map["commit"] = commit
+        write_json_atomic(path, impact_map)
+    shard_path = config.getoption("--impact-shard-map")
+    if shard_path:
+        # Only this run's entries: the full map also holds stale entries of other shards' tests.
+        shard_map = {"tests": config._impact_recorded, "failed": sorted(config._impact_failed)}
+        if commit:
+            shard_map["commit"] = commit
+        write_json_atomic(shard_path, shard_map)
+
+
+def pytest_report_collectionfinish(config):
+    return config._impact_summary
@@ -0,0 +1,324 @@
+import time
+import weakref
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    UnknownMethodException,
+    WebDriverException,
+)
+from selenium.webdriver.support import expected_conditions as EC
+
+from utils import js_locators
+from utils.instrumentation import waiting
+
+# Counts fetch/XHR requests in flight. Installed once per document; requests started
+# before installation are still covered by the resource timing check.
+REQUEST_TRACKER_JS = """
+function __installRequestTracker() {
+    if (window.__pendingRequests !== undefined) { return; }
+    window.__pendingRequests = 0;
+    if (performance.setResourceTimingBufferSize) { performance.setResourceTimingBufferSize(100000); }
+    function settle() { window.__pendingRequests = Math.max(0, window.__pendingRequests - 1); }
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            window.__pendingRequests++;
+            return originalFetch.apply(this, arguments).then(
+                function (r) { settle(); return r; },
+                function (e) { settle(); throw e; });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__pendingRequests++;
+        this.addEventListener('loadend', settle);
+        return originalSend.apply(this, arguments);
+    };
+}
+function __networkSnapshot() {
+    __installRequestTracker();
+    return [performance.getEntriesByType('resource').length, window.__pendingRequests, document.readyState];
+}
+"""
+
+DOM_SIGNATURE_JS = """
+    return document.getElementsByTagName('*').length + ':' + (document.body ? document.body.innerHTML.length : 0);
+"""
+
+
+class PollingWaitEngine:
+    """
+    Waits by polling a condition over WebDriver.
+    Unlike WebDriverWait's fixed 500 ms interval, the interval starts small and backs off,
+    so fast pages are detected almost immediately and slow ones do not flood the driver.
+    """
+
+    MIN_INTERVAL = 0.05
+    MAX_INTERVAL = 0.5
+    BACKOFF = 1.5
+    IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+    def __init__(self, driver, timeout: float = 15):
+        self.driver = driver
+        self.timeout = timeout
+
+    @waiting
+    def until(self, condition, message: str = "", timeout: float = None):
+        """Call condition(driver) until it returns a truthy value, then return that value."""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        interval = self.MIN_INTERVAL
+        while True:
+            try:
+                value = condition(self.driver)
+                if value:
+                    return value
+            except self.IGNORED_EXCEPTIONS:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.BACKOFF, self.MAX_INTERVAL)
+
+    @waiting
+    def until_visible(self, locator: tuple, timeout: float = None):
+        """Wait for the element to be visible and return it."""
+        return self.until(EC.visibility_of_element_located(locator), f"Element not visible: {locator}", timeout)
+
+    @waiting
+    def until_clickable(self, locator: tuple, timeout: float = None):
+        """Wait for the element to be visible and enabled and return it."""
+        return self.until(EC.element_to_be_clickable(locator), f"Element not clickable: {locator}", timeout)
+
+    @waiting
+    def until_invisible(self, locator: tuple, timeout: float = None):
+        """Wait until the element is hidden or gone from the DOM."""
+        return self.until(EC.invisibility_of_element_located(locator), f"Element still visible: {locator}", timeout)
+
+    @waiting
+    def until_dom_stable(self, quiet_ms: int = 300, timeout: float = None):
+        """Wait until the DOM has not changed for quiet_ms milliseconds."""
+        state = {"signature": None, "since": time.monotonic()}
+
+        def dom_is_stable(driver):
+            signature = driver.execute_script(DOM_SIGNATURE_JS)
+            now = time.monotonic()
+            if signature != state["signature"]:
+                state["signature"], state["since"] = signature, now
+                return False
+            return (now - state["since"]) * 1000 >= quiet_ms
+
+        return self.until(dom_is_stable, f"DOM did not settle for {quiet_ms} ms", timeout)
+
+    @waiting
+    def until_network_idle(self, idle_ms: int = 500, timeout: float = None):
+        """Wait until the page has loaded and no request has started or finished for idle_ms milliseconds."""
+        state = {"snapshot": None, "since": time.monotonic()}
+
+        def network_is_idle(driver):
+            snapshot = driver.execute_script(REQUEST_TRACKER_JS + "return __networkSnapshot();")
+            now = time.monotonic()
+            count, pending, ready_state = snapshot
+            if snapshot != state["snapshot"] or pending or ready_state != "complete":
+                state["snapshot"], state["since"] = snapshot, now
+                return False
+            return (now - state["since"]) * 1000 >= idle_ms
+
+        return self.until(network_is_idle, f"Network not idle for {idle_ms} ms", timeout)
+
+
+class ObserverWaitEngine(PollingWaitEngine):
+    """
+    Waits inside the browser.
+
+    A single execute_async_script call installs a MutationObserver and resolves on the
+    next animation frame in which the condition holds, so there is no polling latency
+    and only one WebDriver round trip per wait. If the page navigates while waiting the
+    script is re-issued for the remaining time. Drivers that cannot run async scripts
+    fall back to adaptive polling.
+    """
+
+    ELEMENT_SCRIPT = js_locators.script("""
+        var by = arguments[0], value = arguments[1], condition = arguments[2], timeoutMs = arguments[3];
+        var done = arguments[arguments.length - 1];
+        function check() {
+            var el = __findAll(by, value)[0];
+            if (condition === 'invisible') { return !el || !__isVisible(el); }
+            var test = condition === 'clickable' ? __isClickable : __isVisible;
+            return el && test(el) ? el : null;
+        }
+        var found = check();
+        if (found) { return done(found); }
+        var finished = false, scheduled = false, observer, interval, timer;
+        function finish(result) {
+            if (finished) { return; }
+            finished = true;
+            observer.disconnect();
+            clearInterval(interval);
+            clearTimeout(timer);
+            done(result);
+        }
+        function schedule() {
+            if (scheduled) { return; }
+            scheduled = true;
+            requestAnimationFrame(function () {
+                scheduled = false;
+                var result = check();
+                if (result) { finish(result); }
+            });
+        }
+        observer = new MutationObserver(schedule);
+        observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+        // Style changes from CSS transitions do not mutate the DOM, and animation frames
+        // are throttled in background tabs, so keep a coarse safety check as well.
+        interval = setInterval(function () { var result = check(); if (result) { finish(result); } }, 100);
+        timer = setTimeout(function () { finish(null); }, timeoutMs);
+    """)
+
+    DOM_STABLE_SCRIPT = """
+        var quietMs = arguments[0], timeoutMs = arguments[1];
+        var done = arguments[arguments.length - 1];
+        var quietTimer, timer, observer;
+        function finish(result) {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(timer);
+            done(result);
+        }
+        function arm() {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(function () { finish(true); }, quietMs);
+        }
+        observer = new MutationObserver(arm);
+        observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+        arm();
+        timer = setTimeout(function () { finish(null); }, timeoutMs);
+    """
+
+    NETWORK_IDLE_SCRIPT = REQUEST_TRACKER_JS + """
+        var idleMs = arguments[0], timeoutMs = arguments[1];
+        var done = arguments[arguments.length - 1];
+        var last = null, since = Date.now(), interval, timer;
+        function finish(result) {
+            clearInterval(interval);
+            clearTimeout(timer);
+            done(result);
+        }
+        function check() {
+            var snapshot = __networkSnapshot();
+            var key = snapshot.join('|');
+            if (key !== last || snapshot[1] > 0 || snapshot[2] !== 'complete') {
+                last = key;
+                since = Date.now();
+            } else if (Date.now() - since >= idleMs) {
+                finish(true);
+            }
+        }
+        interval = setInterval(check, 50);
+        check();
+        timer = setTimeout(function () { finish(null); }, timeoutMs);
+    """
+
+    # Keep each async script well below the driver's default 30 s script timeout.
+    MAX_SCRIPT_WAIT = 10
+    # Drivers that rejected execute_async_script; they use polling from then on.
+    _unsupported = weakref.WeakSet()
+
+    @waiting
+    def until_visible(self, locator: tuple, timeout: float = None):
+        by, value = locator
+        deadline = self._deadline(timeout)
+        return (self._in_browser(self.ELEMENT_SCRIPT, (by, value, "visible"), deadline, f"Element not visible: {locator}")
+                or super().until_visible(locator, self._remaining(deadline)))
+
+    @waiting
+    def until_clickable(self, locator: tuple, timeout: float = None):
+        by, value = locator
+        deadline = self._deadline(timeout)
+        return (self._in_browser(self.ELEMENT_SCRIPT, (by, value, "clickable"), deadline, f"Element not clickable: {locator}")
+                or super().until_clickable(locator, self._remaining(deadline)))
+
+    @waiting
+    def until_invisible(self, locator: tuple, timeout: float = None):
+        by, value = locator
+        deadline = self._deadline(timeout)
+        return (self._in_browser(self.ELEMENT_SCRIPT, (by, value, "invisible"), deadline, f"Element still visible: {locator}")
+                or super().until_invisible(locator, self._remaining(deadline)))
+
+    @waiting
+    def until_dom_stable(self, quiet_ms: int = 300, timeout: float = None):
+        deadline = self._deadline(timeout)
+        return (self._in_browser(self.DOM_STABLE_SCRIPT, (quiet_ms,), deadline, f"DOM did not settle for {quiet_ms} ms")
+                or super().until_dom_stable(quiet_ms, self._remaining(deadline)))
+
+    @waiting
+    def until_network_idle(self, idle_ms: int = 500, timeout: float = None):
+        deadline = self._deadline(timeout)
+        return (self._in_browser(self.NETWORK_IDLE_SCRIPT, (idle_ms,), deadline, f"Network not idle for {idle_ms} ms")
+                or super().until_network_idle(idle_ms, self._remaining(deadline)))
+
+    def _deadline(self, timeout: float) -> float:
+        return time.monotonic() + (self.timeout if timeout is None else timeout)
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        """Timeout left for the polling fallback, so a wait never outlasts its own deadline."""
+        return max(0.0, deadline - time.monotonic())
+
+    def _in_browser(self, wait_script: str, args: tuple, deadline: float, message: str):
+        """
+        Run an async wait script that receives (*args, timeout_ms) and resolves with a
+        truthy result or null on timeout, until the monotonic deadline. Returns the result,
+        raises TimeoutException, or returns None to request the polling fallback.
+        """
+        if self.driver in self._unsupported:
+            return None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            chunk_ms = int(min(remaining, self.MAX_SCRIPT_WAIT) * 1000)
+            try:
+                result = self.driver.execute_async_script(wait_script, *args, chunk_ms)
+            except JavascriptException as e:
+                if "unload" in str(e).lower():
+                    # The page navigated away mid-wait; wait again on the new document.
+                    continue
+                # E.g. a locator the helpers cannot evaluate; let the polling engine handle it.
+                return None
+            except (TimeoutException, StaleElementReferenceException):
+                # Script timeouts surface as TimeoutException; retry with the remaining time.
+                continue
+            except UnknownMethodException:
+                self._unsupported.add(self.driver)
+                return None
+            except WebDriverException as e:
+                if "unknown command" in str(e).lower() or "not supported" in str(e).lower():
+                    self._unsupported.add(self.driver)
+                return None
+            if result:
+                return result
+
+
+ENGINES = {
+    "observer": ObserverWaitEngine,
+    "polling": PollingWaitEngine,
+}
+
+_default_engine = "observer"
+
+
+def configure(name: str):
+    """Select the wait engine used by page objects created from now on."""
+    global _default_engine
+    if name not in ENGINES:
+        raise ValueError(f"Unknown wait engine: {name}. Choose from: {', '.join(ENGINES)}")
+    _default_engine = name
+
+
+def create_engine(driver, timeout: float = 15, name: str = None):
+    """Create a wait engine for the driver, using the configured default when no name is given."""
+    return ENGINES[name or _default_engine](driver, timeout)